@@ -2,13 +2,20 @@
 
 ## Reception System Core
 ```python
+from gate_pipeline import GatePipeline  # production/gate_pipeline.py
+
 class AssemblyLineReception:
-    def __init__(self):
+    def __init__(self, fail_fast=False):
         self.validation_gates = {
             'schema': SchemaValidation(),
             'security': SecurityValidation(),
             'order036': Order036Validation()
         }
+        # Shared gate runner: per-gate timing counters, optional cost-ordered fail-fast
+        self.gate_pipeline = GatePipeline(
+            {name: gate.validate for name, gate in self.validation_gates.items()},
+            fail_fast=fail_fast
+        )
         self.enhancement_queue = []
         self.audit_log = AuditLog()
 
@@ -40,12 +47,10 @@ class AssemblyLineReception:
 
     def _validate_enhancement(self, enhancement_data):
         """
-        Run enhancement through all validation gates
+        Run enhancement through the validation gate pipeline
         """
-        for gate in self.validation_gates.values():
-            if not gate.validate(enhancement_data):
-                return False
-        return True
+        results = self.gate_pipeline.run(enhancement_data)
+        return all(results.values())
 
     def _queue_enhancement(self, enhancement_data):
         """
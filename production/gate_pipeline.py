@@ -0,0 +1,159 @@
+"""
+Validation Gate Pipeline
+Shared gate runner for labscape manufacturing, quality control reception and
+assembly line reception
+
+Every gate is a callable returning True (pass) or False (reject); a gate that
+raises counts as a rejection. Per-gate timing and rejection counters are kept
+for telemetry. With fail_fast the pipeline stops at the first rejection and,
+when adaptive, periodically reorders gates so cheap, selective gates run first.
+"""
+
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Runs between adaptive reorders, and runs a gate needs before it is reordered
+REORDER_EVERY = 64
+MIN_SAMPLES = 16
+
+class GateStats:
+    """Timing and outcome counters for one gate"""
+
+    __slots__ = ('calls', 'failures', 'errors', 'total_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0      # rejections, including errors
+        self.errors = 0        # rejections caused by an exception
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float, passed: bool) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        if not passed:
+            self.failures += 1
+
+    def merge(self, other: 'GateStats') -> None:
+        self.calls += other.calls
+        self.failures += other.failures
+        self.errors += other.errors
+        self.total_seconds += other.total_seconds
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.failures / self.calls if self.calls else 0.0
+
+    def rank(self) -> float:
+        """Expected cost per rejection; lower runs earlier under fail-fast"""
+        return self.mean_seconds / self.rejection_rate if self.failures else float('inf')
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'errors': self.errors,
+            'total_ms': self.total_seconds * 1000.0,
+            'mean_ms': self.mean_seconds * 1000.0,
+            'rejection_rate': self.rejection_rate
+        }
+
+class GatePipeline:
+    """
+    Ordered set of named validation gates
+    run() returns {gate name: passed} in declaration order; under fail_fast,
+    gates skipped after a rejection are absent from the result
+    """
+
+    def __init__(self, gates: Dict[str, Callable[..., bool]], fail_fast: bool = False,
+                 adaptive: bool = True, reorder_every: int = REORDER_EVERY,
+                 log: Optional[logging.Logger] = None):
+        self.gates = dict(gates)
+        self.fail_fast = fail_fast
+        self.adaptive = adaptive
+        self.reorder_every = reorder_every
+        self.logger = log or logger
+        self.order: List[str] = list(self.gates)
+        self.stats: Dict[str, GateStats] = {name: GateStats() for name in self.gates}
+        self.runs = 0
+
+    def run(self, *args: Any) -> Dict[str, bool]:
+        """Run the gates against args, returning per-gate outcomes"""
+        results: Dict[str, bool] = {}
+        for name in self.order:
+            stats = self.stats[name]
+            start = perf_counter()
+            try:
+                passed = bool(self.gates[name](*args))
+            except Exception as e:
+                self.logger.error(f"Error in validation gate {name}: {str(e)}")
+                stats.errors += 1
+                passed = False
+            stats.record(perf_counter() - start, passed)
+            results[name] = passed
+            if not passed and self.fail_fast:
+                break
+
+        self.runs += 1
+        if self.adaptive and self.fail_fast and self.runs % self.reorder_every == 0:
+            self.reorder()
+        return {name: results[name] for name in self.gates if name in results}
+
+    def reorder(self) -> List[str]:
+        """
+        Sort gates by expected cost per rejection (cheapest, most selective first)
+        Gates with fewer than MIN_SAMPLES runs keep their declared position ahead of ranked ones
+        """
+        declared = {name: index for index, name in enumerate(self.gates)}
+
+        def key(name: str):
+            stats = self.stats[name]
+            if stats.calls < MIN_SAMPLES:
+                return (0, 0.0, declared[name])
+            return (1, stats.rank(), declared[name])
+
+        self.order = sorted(self.gates, key=key)
+        return self.order
+
+    def merge(self, stats: Dict[str, GateStats], runs: int = 0) -> None:
+        """Fold counters collected elsewhere (e.g. in worker processes) into this pipeline"""
+        self.runs += runs
+        for name, other in stats.items():
+            self.stats[name].merge(other)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-gate counters and the current execution order"""
+        return {
+            'runs': self.runs,
+            'fail_fast': self.fail_fast,
+            'order': list(self.order),
+            'gates': {name: self.stats[name].as_dict() for name in self.gates}
+        }
+
+    def telemetry_points(self, labscape_id: str, source: str, timestamp: str,
+                         sequence_start: int = 0) -> List[Dict[str, Any]]:
+        """
+        Per-gate mean latency as Order-036 telemetry data points
+        (accepted by LabscapeMonitor.collect_telemetry / collect_batch)
+        """
+        points = []
+        for sequence, (name, stats) in enumerate(self.stats.items(), start=sequence_start):
+            points.append({
+                'headers': {
+                    'timestamp': timestamp,
+                    'source': source,
+                    'sequence': sequence,
+                    'labscape_id': labscape_id
+                },
+                'metric_type': 'performance',
+                'value': stats.mean_seconds * 1000.0,
+                'unit': 'ms',
+                'context': {'gate': name, **stats.as_dict()}
+            })
+        return points
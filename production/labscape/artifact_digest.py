@@ -0,0 +1,46 @@
+"""
+Labscape Artifact Digests
+Canonical serialisation and cryptographic checksums shared by labscape
+reception and manufacturing
+Part of Phase 1 Foundation (1/256 scale implementation)
+"""
+
+from typing import Any, Callable, Dict, Tuple
+import hashlib
+import hmac
+import json
+
+DEFAULT_ALGORITHM = 'sha256'
+
+DIGEST_ALGORITHMS: Dict[str, Callable[[bytes], Any]] = {
+    'sha256': hashlib.sha256,
+    'blake2b': lambda data: hashlib.blake2b(data, digest_size=32)
+}
+
+def canonical_bytes(value: Any) -> bytes:
+    """
+    Serialise a JSON-compatible value to canonical UTF-8 bytes
+    Sorted keys and fixed separators make the encoding identical on every node
+    """
+    return json.dumps(value, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False, default=str).encode('utf-8')
+
+def digest_bytes(data: bytes, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Hex digest of already-canonical bytes"""
+    try:
+        hasher = DIGEST_ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported digest algorithm: {algorithm}") from None
+    return hasher(data).hexdigest()
+
+def canonical_digest(value: Any, algorithm: str = DEFAULT_ALGORITHM) -> Tuple[bytes, str]:
+    """
+    Canonicalise a value once and hash it
+    Returns the canonical bytes (keep them to verify later) and the hex digest
+    """
+    data = canonical_bytes(value)
+    return data, digest_bytes(data, algorithm)
+
+def verify_digest(data: bytes, expected: str, algorithm: str = DEFAULT_ALGORITHM) -> bool:
+    """Check cached canonical bytes against a digest without re-serialising"""
+    return hmac.compare_digest(digest_bytes(data, algorithm), expected)
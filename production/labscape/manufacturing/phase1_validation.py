@@ -10,6 +10,7 @@ from pipeline import (
 )
 import logging
 import json
+import os
 from datetime import datetime
 
 logging.basicConfig(
@@ -18,7 +19,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def validate_phase1_artifacts():
+def validate_phase1_artifacts(workers=None):
     """Run Phase 1 validation for single AI lab/Alfa unit"""
     
     # Initialize manufacturing pipeline
@@ -108,10 +109,9 @@ def validate_phase1_artifacts():
         }
     )
 
-    artifacts = []
     validation_results = {}
     
-    # Generate and validate each artifact in sequence
+    # Generate and validate the artifacts as one batch (spec order is kept)
     specs = [
         ("AI Lab/Alfa Unit Component", alfa_component_spec),
         ("Assembly Template", assembly_spec),
@@ -120,29 +120,33 @@ def validate_phase1_artifacts():
     
     print("\n=== Phase 1 Validation - Single AI Lab/Alfa Unit ===")
     
-    for name, spec in specs:
-        print(f"\nGenerating {name}...")
-        try:
-            artifact = manufacturing.generate_artifact(spec)
-            artifacts.append(artifact)
-            validation_results[name] = artifact.validation_results
+    # Three specs sit below pipeline.PARALLEL_THRESHOLD, so this batch runs
+    # in-process whatever ``workers`` is; the pool only engages for larger runs
+    try:
+        artifacts = manufacturing.generate_batch(
+            [spec for _, spec in specs],
+            workers=workers or os.cpu_count() or 1
+        )
+    except Exception as e:
+        logger.error(f"Error generating Phase 1 artifacts: {str(e)}")
+        print("ERROR: Failed to generate Phase 1 artifacts")
+        raise
+    
+    for (name, _), artifact in zip(specs, artifacts):
+        print(f"\nGenerated {name}")
+        validation_results[name] = artifact.validation_results
+        
+        print(f"Artifact ID: {artifact.artifact_id}")
+        print("Order-036 Headers:")
+        for key, value in artifact.headers.items():
+            print(f"  {key}: {value}")
             
-            print(f"Artifact ID: {artifact.artifact_id}")
-            print("Order-036 Headers:")
-            for key, value in artifact.headers.items():
-                print(f"  {key}: {value}")
-                
-            print("Validation Results:")
-            for gate, result in artifact.validation_results.items():
-                status = "PASS" if result else "FAIL"
-                print(f"  {gate}: {status}")
-                
-            print(f"Checksum: {artifact.checksum}")
+        print("Validation Results:")
+        for gate, result in artifact.validation_results.items():
+            status = "PASS" if result else "FAIL"
+            print(f"  {gate}: {status}")
             
-        except Exception as e:
-            logger.error(f"Error generating {name}: {str(e)}")
-            print(f"ERROR: Failed to generate {name}")
-            raise
+        print(f"Checksum: {artifact.checksum}")
 
     # Generate production report
     report = {
@@ -153,7 +157,8 @@ def validate_phase1_artifacts():
             name: all(results.values())
             for name, results in validation_results.items()
         },
-        'production_log': manufacturing.production_log
+        'production_log': manufacturing.production_log,
+        'gate_stats': manufacturing.gate_pipeline.snapshot()
     }
     
     # Save production report
@@ -4,16 +4,34 @@ Handles artifact generation and validation for a single AI Labscape
 Phase 1 Foundation - Manufacturing Focus
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from itertools import repeat
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime
+from pathlib import Path
 import logging
-import hashlib
+import sys
 from enum import Enum
 
+try:
+    from artifact_digest import canonical_bytes, digest_bytes, verify_digest
+except ModuleNotFoundError:  # script execution from manufacturing/
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from artifact_digest import canonical_bytes, digest_bytes, verify_digest
+try:
+    from gate_pipeline import GatePipeline, GateStats
+except ModuleNotFoundError:  # script execution below production/
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from gate_pipeline import GatePipeline, GateStats
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# generate_batch stays in-process below this many specs
+PARALLEL_THRESHOLD = 64
+CHUNK_SIZE = 16
+
 class ArtifactType(Enum):
     """Supported artifact types in manufacturing pipeline"""
     COMPONENT = "component"
@@ -51,7 +69,7 @@ class LabscapeManufacturing:
     Focuses on reliable artifact production and validation
     """
     
-    def __init__(self, labscape_id: str):
+    def __init__(self, labscape_id: str, fail_fast: bool = False):
         self.labscape_id = labscape_id
         self.artifact_counter = 0
         self.production_log: List[Dict[str, Any]] = []
@@ -61,6 +79,11 @@ class LabscapeManufacturing:
             ValidationGate.CONTENT: self._validate_content,
             ValidationGate.INTEGRITY: self._validate_integrity
         }
+        self.gate_pipeline = GatePipeline(
+            {gate.value: validator for gate, validator in self.validation_gates.items()},
+            fail_fast=fail_fast,
+            log=logger
+        )
 
     def generate_artifact(self, spec: ArtifactSpec) -> ManufacturedArtifact:
         """
@@ -68,32 +91,11 @@ class LabscapeManufacturing:
         Includes full validation pipeline
         """
         try:
-            # Generate artifact ID
             self.artifact_counter += 1
-            artifact_id = f"ART-{self.labscape_id}-{self.artifact_counter:06d}"
-
-            # Create Order-036 compliant headers
-            headers = self._create_headers(artifact_id, spec.type)
-
-            # Generate artifact content
-            content = self._generate_content(spec)
-
-            # Create initial artifact
-            artifact = ManufacturedArtifact(
-                artifact_id=artifact_id,
-                type=spec.type,
-                content=content,
-                headers=headers,
-                checksum=self._generate_checksum(content),
-                validation_results={}
-            )
-
-            # Run validation pipeline
-            validation_results = self._run_validation_pipeline(artifact, spec)
-            artifact.validation_results = validation_results
+            artifact = self._manufacture(self.artifact_counter, spec)
 
             # Log production
-            self._log_production(artifact, validation_results)
+            self._log_production(artifact, artifact.validation_results)
 
             return artifact
 
@@ -101,12 +103,95 @@ class LabscapeManufacturing:
             logger.error(f"Error in artifact generation: {str(e)}")
             raise
 
-    def _create_headers(self, artifact_id: str, artifact_type: ArtifactType) -> Dict[str, Any]:
+    def generate_batch(self, specs: Sequence[ArtifactSpec], workers: int = 1) -> List[ManufacturedArtifact]:
+        """
+        Generate artifacts for many specifications, in a process pool when
+        workers > 1 and the batch reaches PARALLEL_THRESHOLD
+        The pool is only used when workers can rebuild this instance's gate
+        set (see _pool_settings); otherwise the batch runs in-process.
+        Artifact IDs are allocated as one block up front (a failed batch leaves
+        its block unused); results and production_log entries keep spec order
+        """
+        first = self.artifact_counter + 1
+        self.artifact_counter += len(specs)
+        jobs = list(enumerate(specs, start=first))
+        
+        try:
+            settings = self._pool_settings() if workers >= 2 and len(jobs) >= PARALLEL_THRESHOLD else None
+            if settings is None:
+                artifacts = [self._manufacture(sequence, spec) for sequence, spec in jobs]
+            else:
+                chunks = [jobs[i:i + CHUNK_SIZE] for i in range(0, len(jobs), CHUNK_SIZE)]
+                artifacts = []
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for chunk, gate_stats, runs in pool.map(_manufacture_chunk, repeat(type(self)), repeat(settings), chunks):
+                        artifacts.extend(chunk)
+                        self.gate_pipeline.merge(gate_stats, runs)
+        except Exception as e:
+            logger.error(f"Error in batch artifact generation: {str(e)}")
+            raise
+        
+        for artifact in artifacts:
+            self._log_production(artifact, artifact.validation_results)
+        return artifacts
+
+    def _pool_settings(self) -> Optional[Dict[str, Any]]:
+        """
+        Settings a pool worker needs to rebuild this instance's gate pipeline,
+        or None when it cannot: a gate that is not a method of this class, or
+        a method overridden on the instance, would not survive the rebuild
+        """
+        if any(callable(value) for value in vars(self).values()):
+            logger.info("Instance-level overrides present; generating batch in-process")
+            return None
+        pipeline = self.gate_pipeline
+        gate_methods = {}
+        for name, gate in pipeline.gates.items():
+            func = getattr(gate, '__func__', None)
+            if getattr(gate, '__self__', None) is not self or getattr(type(self), func.__name__, None) is not func:
+                logger.info(f"Gate {name} cannot be rebuilt in a worker; generating batch in-process")
+                return None
+            gate_methods[name] = func.__name__
+        return {
+            'labscape_id': self.labscape_id,
+            'gate_methods': gate_methods,
+            'fail_fast': pipeline.fail_fast,
+            'adaptive': pipeline.adaptive,
+            'reorder_every': pipeline.reorder_every,
+            'order': list(pipeline.order)
+        }
+
+    def _manufacture(self, sequence: int, spec: ArtifactSpec) -> ManufacturedArtifact:
+        """Build and validate one artifact for an already allocated sequence number"""
+        # Generate artifact ID
+        artifact_id = f"ART-{self.labscape_id}-{sequence:06d}"
+
+        # Create Order-036 compliant headers
+        headers = self._create_headers(artifact_id, spec.type, sequence)
+
+        # Generate artifact content
+        content = self._generate_content(spec)
+
+        # Create initial artifact
+        artifact = ManufacturedArtifact(
+            artifact_id=artifact_id,
+            type=spec.type,
+            content=content,
+            headers=headers,
+            checksum=self._generate_checksum(content),
+            validation_results={}
+        )
+
+        # Run validation pipeline
+        artifact.validation_results = self._run_validation_pipeline(artifact, spec)
+        return artifact
+
+    def _create_headers(self, artifact_id: str, artifact_type: ArtifactType, sequence: int) -> Dict[str, Any]:
         """Create Order-036 compliant headers"""
         return {
             'timestamp': datetime.now().isoformat(),
             'source': f"MANUFACTURING-{self.labscape_id}",
-            'sequence': self.artifact_counter,
+            'sequence': sequence,
             'labscape_id': self.labscape_id,
             'artifact_id': artifact_id,
             'artifact_type': artifact_type.value,
@@ -141,22 +226,16 @@ class LabscapeManufacturing:
 
     def _generate_checksum(self, content: Dict[str, Any]) -> str:
         """Generate secure checksum for artifact content"""
-        content_str = str(sorted(content.items()))
-        return hashlib.sha256(content_str.encode()).hexdigest()
+        return digest_bytes(canonical_bytes(content))
 
     def _run_validation_pipeline(self, artifact: ManufacturedArtifact, 
                                spec: ArtifactSpec) -> Dict[str, bool]:
-        """Run artifact through all validation gates"""
-        results = {}
+        """Run artifact through the validation gates (stopping at the first failure when fail-fast)"""
+        results = self.gate_pipeline.run(artifact, spec)
         
-        for gate, validator in self.validation_gates.items():
-            try:
-                results[gate.value] = validator(artifact, spec)
-                if not results[gate.value]:
-                    logger.error(f"Validation failed at gate {gate.value}")
-            except Exception as e:
-                logger.error(f"Error in validation gate {gate.value}: {str(e)}")
-                results[gate.value] = False
+        for gate, passed in results.items():
+            if not passed:
+                logger.error(f"Validation failed at gate {gate}")
                 
         return results
 
@@ -185,8 +264,8 @@ class LabscapeManufacturing:
 
     def _validate_integrity(self, artifact: ManufacturedArtifact, 
                           spec: ArtifactSpec) -> bool:
-        """Validate artifact integrity via checksum"""
-        return artifact.checksum == self._generate_checksum(artifact.content)
+        """Validate artifact integrity by re-serialising the live content against its checksum"""
+        return verify_digest(canonical_bytes(artifact.content), artifact.checksum)
 
     def _log_production(self, artifact: ManufacturedArtifact, 
                        validation_results: Dict[str, bool]) -> None:
@@ -229,4 +308,20 @@ class LabscapeManufacturing:
             'template_type': spec.parameters.get('template_type', 'generic'),
             'structure': spec.parameters.get('structure', {}),
             'parameters': spec.parameters.get('parameters', {})
-        }
\ No newline at end of file
+        }
+
+def _manufacture_chunk(factory: type, settings: Dict[str, Any],
+                       jobs: Sequence[Tuple[int, ArtifactSpec]]
+                       ) -> Tuple[List[ManufacturedArtifact], Dict[str, GateStats], int]:
+    """Process-pool entry point for generate_batch; also returns the chunk's gate counters"""
+    manufacturing = factory(settings['labscape_id'])
+    manufacturing.gate_pipeline = GatePipeline(
+        {name: getattr(manufacturing, method) for name, method in settings['gate_methods'].items()},
+        fail_fast=settings['fail_fast'],
+        adaptive=settings['adaptive'],
+        reorder_every=settings['reorder_every'],
+        log=logger
+    )
+    manufacturing.gate_pipeline.order = list(settings['order'])
+    artifacts = [manufacturing._manufacture(sequence, spec) for sequence, spec in jobs]
+    return artifacts, manufacturing.gate_pipeline.stats, manufacturing.gate_pipeline.runs
@@ -0,0 +1,118 @@
+"""
+Tests for Labscape Manufacturing Pipeline
+"""
+
+import unittest
+import pipeline
+from gate_pipeline import GatePipeline
+from pipeline import ArtifactSpec, ArtifactType, LabscapeManufacturing
+
+def _spec(index):
+    return ArtifactSpec(
+        type=list(ArtifactType)[index % len(ArtifactType)],
+        parameters={'component_type': f"unit_{index}", 'fields': {'index': index}},
+        requirements={'schema_compliance': {'format': 'field-report@1.0'}}
+    )
+
+class PolicyManufacturing(LabscapeManufacturing):
+    """Subclass adding a method gate, which pool workers can rebuild"""
+
+    def __init__(self, labscape_id, fail_fast=False):
+        super().__init__(labscape_id, fail_fast=fail_fast)
+        self.gate_pipeline = GatePipeline({**self.gate_pipeline.gates, 'policy': self._validate_policy})
+
+    def _validate_policy(self, artifact, spec):
+        return artifact.type != ArtifactType.TEMPLATE
+
+class _NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("process pool should not be used")
+
+class TestLabscapeManufacturing(unittest.TestCase):
+    def setUp(self):
+        self.manufacturing = LabscapeManufacturing('LABSCAPE_001')
+
+    def test_batch_allocates_id_block_after_single_generation(self):
+        self.manufacturing.generate_artifact(_spec(0))
+        artifacts = self.manufacturing.generate_batch([_spec(i) for i in range(1, 4)])
+
+        self.assertEqual([a.artifact_id for a in artifacts],
+                         [f"ART-LABSCAPE_001-{n:06d}" for n in (2, 3, 4)])
+        self.assertEqual([a.headers['sequence'] for a in artifacts], [2, 3, 4])
+        self.assertEqual([entry['artifact_id'] for entry in self.manufacturing.production_log],
+                         [f"ART-LABSCAPE_001-{n:06d}" for n in (1, 2, 3, 4)])
+        self.assertTrue(all(entry['success'] for entry in self.manufacturing.production_log))
+        self.assertEqual(self.manufacturing.artifact_counter, 4)
+
+    def test_integrity_gate_detects_tampered_content(self):
+        artifact = self.manufacturing.generate_artifact(_spec(0))
+        self.assertTrue(self.manufacturing._validate_integrity(artifact, _spec(0)))
+
+        artifact.content['content']['index'] = 99
+        self.assertFalse(self.manufacturing._validate_integrity(artifact, _spec(0)))
+
+    def test_process_pool_matches_inline_generation(self):
+        specs = [_spec(i) for i in range(10)]
+        threshold, chunk_size = pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE
+        pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE = 0, 3
+        try:
+            pooled = self.manufacturing.generate_batch(specs, workers=2)
+        finally:
+            pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE = threshold, chunk_size
+        inline = LabscapeManufacturing('LABSCAPE_001').generate_batch(specs)
+
+        self.assertEqual([a.artifact_id for a in pooled], [a.artifact_id for a in inline])
+        self.assertEqual([a.content['content'] for a in pooled], [a.content['content'] for a in inline])
+        self.assertEqual([a.validation_results for a in pooled], [a.validation_results for a in inline])
+        self.assertEqual([entry['artifact_id'] for entry in self.manufacturing.production_log],
+                         [a.artifact_id for a in inline])
+
+    def _pooled(self, manufacturing, specs, workers, pool=None):
+        saved = pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE, pipeline.ProcessPoolExecutor
+        pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE = 0, 3
+        if pool is not None:
+            pipeline.ProcessPoolExecutor = pool
+        try:
+            return manufacturing.generate_batch(specs, workers=workers)
+        finally:
+            pipeline.PARALLEL_THRESHOLD, pipeline.CHUNK_SIZE, pipeline.ProcessPoolExecutor = saved
+
+    def test_pool_rebuilds_subclass_gate_set(self):
+        specs = [_spec(i) for i in range(8)]
+        serial = PolicyManufacturing('LABSCAPE_001', fail_fast=True).generate_batch(specs)
+        manufacturing = PolicyManufacturing('LABSCAPE_001', fail_fast=True)
+        pooled = self._pooled(manufacturing, specs, workers=2)
+
+        self.assertEqual([a.validation_results for a in pooled], [a.validation_results for a in serial])
+        self.assertEqual([a.validation_results.get('policy') for a in pooled[:4]], [True, True, True, False])
+        self.assertEqual(manufacturing.gate_pipeline.snapshot()['gates']['policy']['calls'], 8)
+
+    def test_unpicklable_gates_fall_back_to_serial(self):
+        manufacturing = LabscapeManufacturing('LABSCAPE_001')
+        manufacturing.gate_pipeline = GatePipeline({
+            **manufacturing.gate_pipeline.gates,
+            'policy': lambda artifact, spec: artifact.type != ArtifactType.TEMPLATE
+        })
+        specs = [_spec(i) for i in range(8)]
+
+        pooled = self._pooled(manufacturing, specs, workers=2, pool=_NoPool)
+        self.assertEqual([a.validation_results['policy'] for a in pooled[:4]], [True, True, True, False])
+
+        manufacturing = LabscapeManufacturing('LABSCAPE_001')
+        manufacturing._generate_content = lambda spec: {'type': 'schema', 'requirements': {}}
+        pooled = self._pooled(manufacturing, specs[:3], workers=2, pool=_NoPool)
+        self.assertFalse(pooled[0].validation_results['schema_validation'])
+
+    def test_fail_fast_stops_at_first_failed_gate(self):
+        manufacturing = LabscapeManufacturing('LABSCAPE_001', fail_fast=True)
+        spec = ArtifactSpec(type=ArtifactType.SCHEMA, parameters={}, requirements={'missing': True})
+        manufacturing._generate_content = lambda spec: {'type': 'schema', 'requirements': {}}
+
+        artifact = manufacturing.generate_artifact(spec)
+        self.assertEqual(artifact.validation_results, {'schema_validation': False})
+        self.assertFalse(manufacturing.production_log[-1]['success'])
+        gates = manufacturing.gate_pipeline.snapshot()['gates']
+        self.assertEqual([gates[name]['calls'] for name in gates], [1, 0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
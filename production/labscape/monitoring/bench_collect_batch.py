@@ -0,0 +1,64 @@
+"""
+Benchmark for labscape telemetry ingestion
+Compares per-point collect_telemetry against collect_batch on synthetic telemetry
+
+Run from this directory:
+    python bench_collect_batch.py --points 200000 --batch-size 1000
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from monitor import LabscapeMonitor, MetricType
+
+LABSCAPE_ID = 'LABSCAPE_BENCH'
+METRIC_CYCLE = [MetricType.PERFORMANCE, MetricType.RESOURCE, MetricType.ARTIFACT, MetricType.INTERACTION]
+
+def build_points(count: int) -> List[Dict[str, Any]]:
+    start = datetime(2025, 1, 1)
+    points = []
+    for sequence in range(count):
+        points.append({
+            'headers': {
+                'timestamp': (start + timedelta(milliseconds=sequence)).isoformat(),
+                'source': f"ai_unit_{sequence % 8:03d}",
+                'sequence': sequence,
+                'labscape_id': LABSCAPE_ID
+            },
+            'metric_type': METRIC_CYCLE[sequence % len(METRIC_CYCLE)].value,
+            'value': float(sequence % 1200),
+            'unit': 'ms',
+            'context': {'operation': 'artifact_generation'} if sequence % 10 == 0 else {}
+        })
+    return points
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=200000, help="Number of telemetry points")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Points per collect_batch call")
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    points = build_points(args.points)
+
+    monitor = LabscapeMonitor(LABSCAPE_ID)
+    start = time.perf_counter()
+    for point in points:
+        monitor.collect_telemetry(point)
+    single = time.perf_counter() - start
+
+    monitor = LabscapeMonitor(LABSCAPE_ID)
+    start = time.perf_counter()
+    for offset in range(0, len(points), args.batch_size):
+        monitor.collect_batch(points[offset:offset + args.batch_size])
+    batch = time.perf_counter() - start
+
+    print(f"points: {args.points}  batch size: {args.batch_size}")
+    print(f"collect_telemetry: {single:8.3f}s  {args.points / single:>12,.0f} points/s")
+    print(f"collect_batch:     {batch:8.3f}s  {args.points / batch:>12,.0f} points/s  ({single / batch:.1f}x)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -4,13 +4,18 @@ Handles telemetry collection and performance monitoring for a single AI Labscape
 Part of Phase 1 Foundation (1/256 scale implementation)
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import logging
 import json
+import math
+import time
 from enum import Enum
 
+from telemetry_store import TelemetryStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -22,9 +27,20 @@ class MetricType(Enum):
     ARTIFACT = "artifact"
     INTERACTION = "interaction"
 
+# Compact codes for the telemetry store's metric column
+METRIC_TYPES: List[MetricType] = list(MetricType)
+METRIC_CODES: Dict[MetricType, int] = {metric_type: code for code, metric_type in enumerate(METRIC_TYPES)}
+METRIC_LOOKUP: Dict[str, MetricType] = {metric_type.value: metric_type for metric_type in MetricType}
+
+# Order-036 telemetry headers
+REQUIRED_HEADERS = ('timestamp', 'source', 'sequence', 'labscape_id')
+
+# Rejections listed individually in a collect_batch summary
+MAX_BATCH_ERRORS = 10
+
 @dataclass
 class TelemetryPoint:
-    """Individual telemetry data point"""
+    """Individual telemetry data point (materialised from the telemetry store on demand)"""
     timestamp: str
     metric_type: MetricType
     value: float
@@ -41,22 +57,146 @@ class PerformanceMetrics:
     error_rate: float             # errors per 1000 operations
     resource_utilization: float   # percentage
 
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error
+    Supports removal so it can track a sliding window; memory and query
+    cost depend on the value range, not on the number of points
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float) -> None:
+        """Record a value"""
+        self.count += 1
+        if value <= 0:
+            self._zero_count += 1
+            return
+        key = self._key(value)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def remove(self, value: float) -> None:
+        """Forget a value previously passed to add()"""
+        self.count -= 1
+        if value <= 0:
+            self._zero_count -= 1
+            return
+        key = self._key(value)
+        remaining = self._buckets[key] - 1
+        if remaining:
+            self._buckets[key] = remaining
+        else:
+            del self._buckets[key]
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); 0.0 when empty"""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer of (epoch seconds, value) samples
+    Keeps a running sum and, optionally, a quantile sketch of the window
+    """
+    
+    def __init__(self, size: int, sketch: bool = False):
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=size)
+        self.total = 0.0
+        self.sketch = QuantileSketch() if sketch else None
+        
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, at: float, value: float) -> None:
+        """Append a finite sample, evicting the oldest once the window is full"""
+        if not math.isfinite(value):
+            raise ValueError(f"Telemetry value must be finite, got {value}")
+        full = len(self.samples) == self.samples.maxlen
+        if self.sketch is not None:
+            self.sketch.add(value)
+            if full:
+                self.sketch.remove(self.samples[0][1])
+        if full:
+            self.total -= self.samples[0][1]
+        self.samples.append((at, value))
+        self.total += value
+
+    def mean(self) -> float:
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def rate_per_minute(self) -> float:
+        """Sum of values per minute over the window's time span"""
+        if len(self.samples) < 2:
+            return 0.0
+        (first_at, first_value), (last_at, _) = self.samples[0], self.samples[-1]
+        span = last_at - first_at
+        if span <= 0:
+            return 0.0
+        # The oldest sample only marks the start of the span
+        return (self.total - first_value) * 60.0 / span
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q) if self.sketch is not None else 0.0
+
+def _finite_value(value: Any) -> float:
+    """Telemetry value as a float, rejecting NaN and infinities"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Telemetry value must be finite, got {value!r}")
+    return number
+
+def _parse_timestamp(value: Any) -> float:
+    """Epoch seconds for an ISO-8601 header timestamp, falling back to now"""
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return time.time()
+
 class LabscapeMonitor:
     """
     Monitoring and telemetry system for a single AI Labscape
     Focuses on comprehensive data collection and analysis
     """
     
-    def __init__(self, labscape_id: str):
+    def __init__(self, labscape_id: str, window_size: int = 1024,
+                 store: Optional[TelemetryStore] = None):
         self.labscape_id = labscape_id
-        self.telemetry_data: List[TelemetryPoint] = []
-        self.performance_history: List[PerformanceMetrics] = []
+        self.telemetry_data = store if store is not None else TelemetryStore()
+        self.performance_history: Deque[PerformanceMetrics] = deque(maxlen=1000)
         self.alert_thresholds: Dict[str, float] = {
             'error_rate': 5.0,        # errors per 1000 ops
             'latency': 1000.0,        # ms
             'utilization': 90.0       # percent
         }
         
+        # Rolling windows per metric type, updated as points arrive so the
+        # report never rescans stored telemetry
+        self.windows: Dict[MetricType, RollingWindow] = {
+            metric_type: RollingWindow(window_size, sketch=metric_type == MetricType.PERFORMANCE)
+            for metric_type in MetricType
+        }
+        self.error_window = RollingWindow(window_size)   # 1.0 per failed operation
+        self.alert_window = RollingWindow(100)           # 1.0 per point that raised an alert
+        self.queue_depth = 0
+        
     def collect_telemetry(self, data_point: Dict[str, Any]) -> Dict[str, Any]:
         """
         Collect and store a single telemetry data point
@@ -67,21 +207,19 @@ class LabscapeMonitor:
             if not self._validate_telemetry_headers(data_point):
                 raise ValueError("Invalid telemetry headers")
 
-            # Create telemetry point
-            point = TelemetryPoint(
-                timestamp=data_point['headers']['timestamp'],
-                metric_type=MetricType(data_point['metric_type']),
-                value=data_point['value'],
-                unit=data_point['unit'],
-                source=data_point['headers']['source'],
-                context=data_point.get('context', {})
-            )
+            headers = data_point['headers']
+            metric_type = MetricType(data_point['metric_type'])
+            value = _finite_value(data_point['value'])
+            at = _parse_timestamp(headers['timestamp'])
+            context = data_point.get('context') or {}
             
-            # Store telemetry
-            self.telemetry_data.append(point)
+            # Store telemetry as one columnar row
+            self.telemetry_data.append(at, METRIC_CODES[metric_type], value,
+                                       data_point['unit'], headers['source'], context)
             
             # Check for alerts
-            alerts = self._check_alerts(point)
+            alerts = self._check_alerts(metric_type, value)
+            self._record_point(metric_type, value, at, context, bool(alerts))
             
             return {
                 'status': 'collected',
@@ -97,6 +235,88 @@ class LabscapeMonitor:
                 'message': str(e)
             }
 
+    def collect_batch(self, points: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Collect many telemetry data points in one pass
+        Valid points are stored in bulk and alert thresholds are evaluated once;
+        returns a summary with accepted/rejected counts instead of a status per point
+        """
+        labscape_id = self.labscape_id
+        latency_threshold = self.alert_thresholds['latency']
+        metric_types: List[MetricType] = []
+        codes: List[int] = []
+        values: List[float] = []
+        timestamps: List[float] = []
+        units: List[str] = []
+        sources: List[str] = []
+        contexts: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        rejected = 0
+        
+        for index, data_point in enumerate(points):
+            try:
+                headers = data_point['headers']
+                if not all(field in headers for field in REQUIRED_HEADERS) or headers['labscape_id'] != labscape_id:
+                    raise ValueError("Invalid telemetry headers")
+                metric_type = METRIC_LOOKUP.get(data_point['metric_type'])
+                if metric_type is None:
+                    raise ValueError(f"{data_point['metric_type']!r} is not a valid MetricType")
+                value = _finite_value(data_point['value'])
+                unit = data_point['unit']
+                timestamp = _parse_timestamp(headers['timestamp'])
+                context = data_point.get('context') or {}
+                if 'queue_depth' in context:
+                    int(context['queue_depth'])
+            except KeyError as e:
+                error = "Invalid telemetry headers" if 'headers' not in data_point else f"Missing telemetry field {e}"
+            except Exception as e:
+                error = str(e)
+            else:
+                metric_types.append(metric_type)
+                codes.append(METRIC_CODES[metric_type])
+                values.append(value)
+                timestamps.append(timestamp)
+                units.append(unit)
+                sources.append(headers['source'])
+                contexts.append(context)
+                continue
+            rejected += 1
+            if len(errors) < MAX_BATCH_ERRORS:
+                errors.append({'index': index, 'message': error})
+        
+        # Store telemetry column-wise, then fold into the rolling windows
+        self.telemetry_data.extend(timestamps, codes, values, units, sources, contexts)
+        breaches = 0
+        peak = 0.0
+        for metric_type, value, at, context in zip(metric_types, values, timestamps, contexts):
+            alerted = metric_type is MetricType.PERFORMANCE and value > latency_threshold
+            if alerted:
+                breaches += 1
+                peak = max(peak, value)
+            self._record_point(metric_type, value, at, context, alerted)
+        
+        now = datetime.now().isoformat()
+        alerts = []
+        if breaches:
+            alerts.append({
+                'type': 'latency_alert',
+                'threshold': latency_threshold,
+                'count': breaches,
+                'value': peak,
+                'timestamp': now
+            })
+        if rejected:
+            logger.error(f"Rejected {rejected} telemetry point(s) in batch")
+        
+        return {
+            'status': 'error' if not values and rejected else 'partial' if rejected else 'collected',
+            'timestamp': now,
+            'accepted': len(values),
+            'rejected': rejected,
+            'errors': errors,
+            'alerts': alerts
+        }
+
     def update_performance_metrics(self) -> PerformanceMetrics:
         """
         Calculate and store current performance metrics
@@ -105,12 +325,8 @@ class LabscapeMonitor:
         # Calculate metrics from recent telemetry
         recent_metrics = self._calculate_recent_metrics()
         
-        # Store in history
+        # Store in history (bounded to the last 1000 metric points)
         self.performance_history.append(recent_metrics)
-        
-        # Trim history if needed
-        if len(self.performance_history) > 1000:  # Keep last 1000 metric points
-            self.performance_history = self.performance_history[-1000:]
             
         return recent_metrics
 
@@ -130,25 +346,20 @@ class LabscapeMonitor:
                 'error_rate': current_metrics.error_rate,
                 'resource_utilization': current_metrics.resource_utilization
             },
-            'telemetry_points_collected': len(self.telemetry_data),
+            'latency_percentiles': self.get_latency_percentiles(),
+            'telemetry_points_collected': self.telemetry_points_collected,
+            'telemetry_points_resident': len(self.telemetry_data),
             'performance_history_length': len(self.performance_history),
             'alert_status': self._get_alert_status()
         }
 
     def _validate_telemetry_headers(self, data_point: Dict[str, Any]) -> bool:
         """Validate Order-036 compliant headers for telemetry"""
-        required_fields = {
-            'timestamp',
-            'source',
-            'sequence',
-            'labscape_id'
-        }
-        
         if 'headers' not in data_point:
             return False
             
         headers = data_point['headers']
-        if not all(field in headers for field in required_fields):
+        if not all(field in headers for field in REQUIRED_HEADERS):
             return False
             
         if headers['labscape_id'] != self.labscape_id:
@@ -156,29 +367,63 @@ class LabscapeMonitor:
             
         return True
 
+    @property
+    def telemetry_points_collected(self) -> int:
+        return self.telemetry_data.total_rows
+
+    def iter_telemetry(self, include_spilled: bool = False) -> Iterator[TelemetryPoint]:
+        """Yield stored telemetry as TelemetryPoint objects, oldest first"""
+        for at, code, value, unit, source, context in self.telemetry_data.iter_rows(include_spilled):
+            yield TelemetryPoint(
+                timestamp=datetime.fromtimestamp(at).isoformat(),
+                metric_type=METRIC_TYPES[code],
+                value=value,
+                unit=unit,
+                source=source,
+                context=context
+            )
+
+    def get_latency_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 processing latency (ms) over the rolling window"""
+        window = self.windows[MetricType.PERFORMANCE]
+        return {
+            'p50': window.quantile(0.50),
+            'p95': window.quantile(0.95),
+            'p99': window.quantile(0.99)
+        }
+
+    def _record_point(self, metric_type: MetricType, value: float, at: float,
+                      context: Dict[str, Any], alerted: bool) -> None:
+        """Fold a collected point into the rolling windows"""
+        queue_depth = int(context['queue_depth']) if 'queue_depth' in context else None
+        self.windows[metric_type].add(at, value)
+        failed = context.get('error') or context.get('status') == 'error'
+        self.error_window.add(at, 1.0 if failed else 0.0)
+        self.alert_window.add(at, 1.0 if alerted else 0.0)
+        if queue_depth is not None:
+            self.queue_depth = queue_depth
+
     def _calculate_recent_metrics(self) -> PerformanceMetrics:
-        """Calculate metrics from recent telemetry data"""
-        # In real implementation, this would analyze recent telemetry
-        # For now, return placeholder metrics
+        """Calculate metrics from the rolling telemetry windows"""
         return PerformanceMetrics(
-            artifact_generation_rate=0.0,
-            processing_latency=0.0,
-            queue_depth=0,
-            error_rate=0.0,
-            resource_utilization=0.0
+            artifact_generation_rate=self.windows[MetricType.ARTIFACT].rate_per_minute(),
+            processing_latency=self.windows[MetricType.PERFORMANCE].quantile(0.50),
+            queue_depth=self.queue_depth,
+            error_rate=self.error_window.mean() * 1000.0,
+            resource_utilization=self.windows[MetricType.RESOURCE].mean()
         )
 
-    def _check_alerts(self, point: TelemetryPoint) -> List[Dict[str, Any]]:
-        """Check telemetry point against alert thresholds"""
+    def _check_alerts(self, metric_type: MetricType, value: float) -> List[Dict[str, Any]]:
+        """Check a telemetry value against alert thresholds"""
         alerts = []
         
         # Example alert checks
-        if point.metric_type == MetricType.PERFORMANCE:
-            if point.value > self.alert_thresholds['latency']:
+        if metric_type == MetricType.PERFORMANCE:
+            if value > self.alert_thresholds['latency']:
                 alerts.append({
                     'type': 'latency_alert',
                     'threshold': self.alert_thresholds['latency'],
-                    'value': point.value,
+                    'value': value,
                     'timestamp': datetime.now().isoformat()
                 })
         
@@ -186,8 +431,16 @@ class LabscapeMonitor:
 
     def _get_alert_status(self) -> Dict[str, Any]:
         """Get current alert status"""
+        metrics = self.performance_history[-1] if self.performance_history else self._calculate_recent_metrics()
+        breaches = []
+        if metrics.error_rate > self.alert_thresholds['error_rate']:
+            breaches.append('error_rate')
+        if metrics.processing_latency > self.alert_thresholds['latency']:
+            breaches.append('latency')
+        if metrics.resource_utilization > self.alert_thresholds['utilization']:
+            breaches.append('utilization')
         return {
-            'active_alerts': len([p for p in self.telemetry_data[-100:] 
-                                if self._check_alerts(p)]),
+            'active_alerts': int(self.alert_window.total),
+            'threshold_breaches': breaches,
             'thresholds': self.alert_thresholds
         }
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+Labscape Telemetry Store
+Compact columnar storage for labscape telemetry points
+Part of Phase 1 Foundation (1/256 scale implementation)
+"""
+
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SCHEMA = "labscape-telemetry-segment@1.0"
+
+# (column name, array typecode)
+COLUMNS = (
+    ('timestamp', 'd'),   # epoch seconds
+    ('value', 'd'),
+    ('metric', 'B'),      # metric type code
+    ('source', 'I'),      # interned string id
+    ('unit', 'I')         # interned string id
+)
+
+# (timestamp, metric code, value, unit, source, context)
+StoredPoint = Tuple[float, int, float, str, str, Dict[str, Any]]
+
+class TelemetrySegment:
+    """
+    Fixed-capacity block of telemetry rows held as typed arrays
+    Contexts live in a side table keyed by row offset and only for rows that have one
+    """
+
+    __slots__ = ('first_row', 'timestamp', 'value', 'metric', 'source', 'unit', 'contexts')
+
+    def __init__(self, first_row: int):
+        self.first_row = first_row
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.contexts: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def last_timestamp(self) -> float:
+        return self.timestamp[-1]
+
+    def nbytes(self) -> int:
+        """Approximate column memory, excluding the context side table"""
+        return sum(getattr(self, name).itemsize * len(self) for name, _ in COLUMNS)
+
+    def rows(self, strings: List[str]) -> Iterator[StoredPoint]:
+        contexts = self.contexts
+        for offset, row in enumerate(zip(self.timestamp, self.metric, self.value, self.unit, self.source)):
+            timestamp, metric, value, unit, source = row
+            yield timestamp, metric, value, strings[unit], strings[source], contexts.get(offset, {})
+
+    def spill(self, path: Path, strings: List[str]) -> None:
+        """
+        Write the segment to ``path`` as a JSON header line followed by raw column bytes
+        The header carries only the strings this segment references, renumbered from 0
+        """
+        used = sorted(set(self.source).union(self.unit))
+        local = {string_id: index for index, string_id in enumerate(used)}
+        header = {
+            'schema': SEGMENT_SCHEMA,
+            'first_row': self.first_row,
+            'rows': len(self),
+            'byteorder': sys.byteorder,
+            'columns': [[name, typecode] for name, typecode in COLUMNS],
+            'strings': [strings[string_id] for string_id in used],
+            'contexts': {str(offset): context for offset, context in self.contexts.items()}
+        }
+        tmp = path.with_name(f".{path.name}.tmp")
+        with tmp.open('wb') as handle:
+            handle.write(json.dumps(header, separators=(',', ':'), default=str).encode('utf-8') + b'\n')
+            for name, typecode in COLUMNS:
+                column = getattr(self, name)
+                if name in ('source', 'unit'):
+                    column = array(typecode, [local[string_id] for string_id in column])
+                column.tofile(handle)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple['TelemetrySegment', List[str]]:
+        """Read a spilled segment back; returns it with the string table it references"""
+        with path.open('rb') as handle:
+            header = json.loads(handle.readline())
+            if header.get('schema') != SEGMENT_SCHEMA:
+                raise ValueError(f"{path} is not a telemetry segment")
+            segment = cls(header['first_row'])
+            for name, typecode in header['columns']:
+                column = array(typecode)
+                column.fromfile(handle, header['rows'])
+                if header['byteorder'] != sys.byteorder:
+                    column.byteswap()
+                setattr(segment, name, column)
+        segment.contexts = {int(offset): context for offset, context in header['contexts'].items()}
+        return segment, header['strings']
+
+class TelemetryStore:
+    """
+    Append-only columnar telemetry store with bounded residency
+
+    Rows are appended to an active segment; full segments are sealed and kept
+    in memory until they fall outside ``retention_seconds`` of the newest row
+    or push resident rows past ``max_rows``. Evicted segments are written to
+    ``spill_dir`` when one is configured, otherwise dropped. At most
+    ``max_spill_files`` spilled segments are kept; the oldest file is deleted
+    (and its rows counted as dropped) when a new one would exceed the cap.
+    """
+
+    __slots__ = ('segment_size', 'max_rows', 'retention_seconds', 'spill_dir', 'max_spill_files',
+                 'keep_context', 'strings', '_string_ids', 'segments', 'active', 'total_rows',
+                 'spilled', 'dropped_rows')
+
+    def __init__(self, segment_size: int = 4096, max_rows: int = 65536,
+                 retention_seconds: Optional[float] = None, spill_dir: Optional[Path] = None,
+                 keep_context: bool = True, max_spill_files: int = 64):
+        if segment_size < 1 or max_rows < segment_size:
+            raise ValueError("max_rows must be at least segment_size (>= 1)")
+        if max_spill_files < 1:
+            raise ValueError("max_spill_files must be at least 1")
+        self.segment_size = segment_size
+        self.max_rows = max_rows
+        self.retention_seconds = retention_seconds
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.max_spill_files = max_spill_files
+        self.keep_context = keep_context
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.segments: Deque[TelemetrySegment] = deque()
+        self.active = TelemetrySegment(0)
+        self.total_rows = 0
+        self.spilled: Deque[Path] = deque()
+        self.dropped_rows = 0
+
+    def __len__(self) -> int:
+        """Rows currently resident in memory"""
+        return len(self.active) + sum(len(segment) for segment in self.segments)
+
+    def intern(self, value: str) -> int:
+        """Stable id for a source/unit string"""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def append(self, timestamp: float, metric: int, value: float, unit: str, source: str,
+               context: Optional[Dict[str, Any]] = None) -> None:
+        """Append one row"""
+        active = self.active
+        if context and self.keep_context:
+            active.contexts[len(active)] = context
+        active.timestamp.append(timestamp)
+        active.value.append(value)
+        active.metric.append(metric)
+        active.source.append(self.intern(source))
+        active.unit.append(self.intern(unit))
+        self.total_rows += 1
+        if len(active) >= self.segment_size:
+            self._seal()
+
+    def extend(self, timestamps: Sequence[float], metrics: Sequence[int], values: Sequence[float],
+               units: Sequence[str], sources: Sequence[str],
+               contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> None:
+        """Append many rows column-wise, sealing segments as they fill"""
+        intern = self.intern
+        unit_ids = [intern(unit) for unit in units]
+        source_ids = [intern(source) for source in sources]
+        keep_context = contexts is not None and self.keep_context
+        start, total = 0, len(timestamps)
+        while start < total:
+            active = self.active
+            base = len(active)
+            end = min(start + self.segment_size - base, total)
+            if keep_context:
+                for row in range(start, end):
+                    if contexts[row]:
+                        active.contexts[base + row - start] = contexts[row]
+            active.timestamp.extend(timestamps[start:end])
+            active.value.extend(values[start:end])
+            active.metric.extend(metrics[start:end])
+            active.source.extend(source_ids[start:end])
+            active.unit.extend(unit_ids[start:end])
+            self.total_rows += end - start
+            start = end
+            if len(active) >= self.segment_size:
+                self._seal()
+
+    def _seal(self) -> None:
+        self.segments.append(self.active)
+        self.active = TelemetrySegment(self.total_rows)
+        newest = self.segments[-1].last_timestamp
+        resident = len(self)
+        while self.segments:
+            oldest = self.segments[0]
+            expired = self.retention_seconds is not None and oldest.last_timestamp < newest - self.retention_seconds
+            if not expired and resident <= self.max_rows:
+                break
+            self.segments.popleft()
+            resident -= len(oldest)
+            self._evict(oldest)
+
+    def _evict(self, segment: TelemetrySegment) -> None:
+        if self.spill_dir is None:
+            self.dropped_rows += len(segment)
+            return
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"segment-{segment.first_row:012d}.tlm"
+        try:
+            segment.spill(path, self.strings)
+        except OSError as e:
+            logger.error(f"Error spilling telemetry segment {path}: {str(e)}")
+            self.dropped_rows += len(segment)
+            return
+        self.spilled.append(path)
+        while len(self.spilled) > self.max_spill_files:
+            oldest = self.spilled.popleft()
+            try:
+                oldest.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Error removing telemetry segment {oldest}: {str(e)}")
+            # Sealed segments are always full
+            self.dropped_rows += self.segment_size
+
+    def nbytes(self) -> int:
+        """Approximate resident column memory"""
+        return self.active.nbytes() + sum(segment.nbytes() for segment in self.segments)
+
+    def iter_rows(self, include_spilled: bool = False) -> Iterator[StoredPoint]:
+        """Yield stored rows oldest first, optionally starting with spilled segments"""
+        if include_spilled:
+            for path in self.spilled:
+                segment, strings = TelemetrySegment.load(path)
+                yield from segment.rows(strings)
+        for segment in self.segments:
+            yield from segment.rows(self.strings)
+        yield from self.active.rows(self.strings)
@@ -0,0 +1,139 @@
+"""
+Tests for Labscape Monitoring System
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from monitor import LabscapeMonitor, MetricType, QuantileSketch
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+class TestLabscapeMonitor(unittest.TestCase):
+    def setUp(self):
+        self.monitor = LabscapeMonitor('LABSCAPE_001', window_size=200)
+        self.sequence = 0
+
+    def _point(self, metric_type, value, seconds=0, **context):
+        self.sequence += 1
+        return {
+            'headers': {
+                'timestamp': (START + timedelta(seconds=seconds)).isoformat(),
+                'source': 'ai_unit_001',
+                'sequence': self.sequence,
+                'labscape_id': 'LABSCAPE_001'
+            },
+            'metric_type': metric_type.value,
+            'value': value,
+            'unit': 'ms',
+            'context': context
+        }
+
+    def test_rolling_metrics(self):
+        for second in range(0, 61, 6):  # 11 artifacts over one minute
+            self.monitor.collect_telemetry(self._point(MetricType.ARTIFACT, 1.0, second))
+        for utilization in (40.0, 60.0):
+            self.monitor.collect_telemetry(self._point(MetricType.RESOURCE, utilization, queue_depth=7))
+        self.monitor.collect_telemetry(self._point(MetricType.SAFETY, 1.0, status='error'))
+
+        report = self.monitor.get_monitoring_report()
+        metrics = report['current_metrics']
+        self.assertAlmostEqual(metrics['artifact_generation_rate'], 10.0)
+        self.assertAlmostEqual(metrics['resource_utilization'], 50.0)
+        self.assertEqual(metrics['queue_depth'], 7)
+        self.assertAlmostEqual(metrics['error_rate'], 1000.0 / 14)
+        self.assertEqual(report['telemetry_points_collected'], 14)
+        self.assertEqual(report['alert_status']['threshold_breaches'], ['error_rate'])
+
+    def test_latency_percentiles_track_window(self):
+        for latency in range(1, 1001):
+            self.monitor.collect_telemetry(self._point(MetricType.PERFORMANCE, float(latency)))
+
+        # Only the last 200 points (801..1000 ms) remain in the window
+        percentiles = self.monitor.get_latency_percentiles()
+        self.assertAlmostEqual(percentiles['p50'], 900.0, delta=900.0 * 0.02)
+        self.assertAlmostEqual(percentiles['p99'], 998.0, delta=998.0 * 0.02)
+        self.assertEqual(self.monitor.telemetry_points_collected, 1000)
+        self.assertEqual(self.monitor.get_monitoring_report()['alert_status']['active_alerts'], 0)
+
+        self.monitor.collect_telemetry(self._point(MetricType.PERFORMANCE, 1500.0))
+        self.assertEqual(self.monitor.get_monitoring_report()['alert_status']['active_alerts'], 1)
+
+    def test_points_materialise_from_store(self):
+        self.monitor.collect_telemetry(self._point(MetricType.RESOURCE, 75.5, 30, resource_type='cpu'))
+
+        (point,) = self.monitor.iter_telemetry()
+        self.assertEqual(point.timestamp, (START + timedelta(seconds=30)).isoformat())
+        self.assertEqual(point.metric_type, MetricType.RESOURCE)
+        self.assertEqual((point.value, point.unit, point.source), (75.5, 'ms', 'ai_unit_001'))
+        self.assertEqual(point.context, {'resource_type': 'cpu'})
+
+    def test_collect_batch_matches_per_point_collection(self):
+        points = [self._point(MetricType.PERFORMANCE, float(latency), latency) for latency in (200, 1200, 1500)]
+        points.append(self._point(MetricType.RESOURCE, 80.0, 4, status='error'))
+        bad_headers = self._point(MetricType.RESOURCE, 1.0)
+        del bad_headers['headers']['sequence']
+        bad_type = self._point(MetricType.RESOURCE, 1.0)
+        bad_type['metric_type'] = 'PERFORMANCE'
+
+        summary = self.monitor.collect_batch(points + [bad_headers, bad_type])
+        self.assertEqual(summary['status'], 'partial')
+        self.assertEqual((summary['accepted'], summary['rejected']), (4, 2))
+        self.assertEqual(summary['errors'], [
+            {'index': 4, 'message': 'Invalid telemetry headers'},
+            {'index': 5, 'message': "'PERFORMANCE' is not a valid MetricType"}
+        ])
+        (alert,) = summary['alerts']
+        self.assertEqual((alert['count'], alert['value']), (2, 1500.0))
+
+        single = LabscapeMonitor('LABSCAPE_001', window_size=200)
+        for point in points:
+            single.collect_telemetry(point)
+        batch_report = self.monitor.get_monitoring_report()
+        single_report = single.get_monitoring_report()
+        for key in ('current_metrics', 'latency_percentiles', 'telemetry_points_collected'):
+            self.assertEqual(batch_report[key], single_report[key])
+        self.assertEqual(batch_report['alert_status']['active_alerts'], 2)
+        self.assertEqual(list(self.monitor.iter_telemetry()), list(single.iter_telemetry()))
+        self.assertEqual(self.monitor.collect_batch([bad_type])['status'], 'error')
+
+    def test_non_finite_values_are_rejected_before_storage(self):
+        monitor = LabscapeMonitor('LABSCAPE_001', window_size=4)
+        for value in ('nan', 'inf', '-inf'):
+            result = monitor.collect_telemetry(self._point(MetricType.PERFORMANCE, value))
+            self.assertEqual(result['status'], 'error')
+        self.assertEqual(monitor.telemetry_points_collected, 0)
+
+        for latency in range(1, 7):
+            result = monitor.collect_telemetry(self._point(MetricType.PERFORMANCE, float(latency) * 100))
+            self.assertEqual(result['status'], 'collected')
+        window = monitor.windows[MetricType.PERFORMANCE]
+        self.assertEqual(window.total, 1800.0)
+        self.assertEqual(window.sketch.count, 4)
+        self.assertAlmostEqual(window.quantile(1.0), 600.0, delta=12.0)
+        self.assertRaises(ValueError, window.add, 0.0, float('nan'))
+        self.assertEqual((len(window), window.total, window.sketch.count), (4, 1800.0, 4))
+
+    def test_collect_batch_rejects_non_finite_values(self):
+        points = [self._point(MetricType.PERFORMANCE, value) for value in (1.0, 'inf', 2.0, 'nan')]
+        points.append(self._point(MetricType.RESOURCE, 5.0, queue_depth='deep'))
+
+        summary = self.monitor.collect_batch(points)
+        self.assertEqual((summary['status'], summary['accepted'], summary['rejected']), ('partial', 2, 3))
+        self.assertEqual([error['index'] for error in summary['errors']], [1, 3, 4])
+        self.assertIn('finite', summary['errors'][0]['message'])
+        self.assertEqual(self.monitor.telemetry_points_collected, 2)
+        window = self.monitor.windows[MetricType.PERFORMANCE]
+        self.assertEqual((len(window), window.total), (2, 3.0))
+
+    def test_sketch_removal(self):
+        sketch = QuantileSketch()
+        for value in (0.0, 5.0, 10.0, 10.0):
+            sketch.add(value)
+        sketch.remove(10.0)
+        sketch.remove(0.0)
+        self.assertEqual(sketch.count, 2)
+        self.assertAlmostEqual(sketch.quantile(1.0), 10.0, delta=0.1)
+        self.assertAlmostEqual(sketch.quantile(0.0), 5.0, delta=0.05)
+
+if __name__ == '__main__':
+    unittest.main()
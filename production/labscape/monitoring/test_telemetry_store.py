@@ -0,0 +1,83 @@
+"""
+Tests for Labscape Telemetry Store
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from telemetry_store import TelemetrySegment, TelemetryStore
+
+class TestTelemetryStore(unittest.TestCase):
+    def _fill(self, store, count, step=1.0):
+        for row in range(count):
+            context = {'row': row} if row % 3 == 0 else None
+            store.append(row * step, row % 5, float(row), 'ms', f"unit_{row % 2}", context)
+
+    def test_rows_round_trip_with_interned_strings(self):
+        store = TelemetryStore(segment_size=4, max_rows=100)
+        self._fill(store, 10)
+
+        rows = list(store.iter_rows())
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[3], (3.0, 3, 3.0, 'ms', 'unit_1', {'row': 3}))
+        self.assertEqual(rows[4][5], {})
+        self.assertEqual(store.strings, ['unit_0', 'ms', 'unit_1'])
+        self.assertEqual(store.nbytes(), 10 * (8 + 8 + 1 + 4 + 4))
+
+    def test_extend_matches_append_across_segments(self):
+        rows = [(float(row), row % 5, float(row), 'ms', f"unit_{row % 2}", {'row': row} if row % 2 else {})
+                for row in range(11)]
+        appended = TelemetryStore(segment_size=3, max_rows=6)
+        for row in rows:
+            appended.append(*row)
+        extended = TelemetryStore(segment_size=3, max_rows=6)
+        for chunk in (rows[:4], rows[4:]):
+            extended.extend(*[list(column) for column in zip(*chunk)])
+
+        self.assertEqual(list(extended.iter_rows()), list(appended.iter_rows()))
+        self.assertEqual((extended.total_rows, extended.dropped_rows), (11, 3))
+
+    def test_evicts_by_row_cap_and_retention(self):
+        store = TelemetryStore(segment_size=4, max_rows=8)
+        self._fill(store, 20)
+        self.assertEqual(store.total_rows, 20)
+        self.assertLessEqual(len(store), 8)
+        self.assertEqual(store.dropped_rows, 20 - len(store))
+
+        store = TelemetryStore(segment_size=4, max_rows=1000, retention_seconds=10.0)
+        self._fill(store, 40)
+        self.assertEqual([row[0] for row in store.iter_rows()][0], 28.0)
+
+    def test_spilled_segments_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TelemetryStore(segment_size=4, max_rows=4, spill_dir=Path(tmp))
+            self._fill(store, 13)
+
+            self.assertEqual(len(store.spilled), 2)
+            segment, strings = TelemetrySegment.load(store.spilled[1])
+            self.assertEqual(segment.first_row, 4)
+            self.assertEqual(list(segment.value), [4.0, 5.0, 6.0, 7.0])
+            self.assertEqual(segment.contexts, {2: {'row': 6}})
+            self.assertEqual(strings, store.strings)
+            self.assertEqual([row[2] for row in store.iter_rows(include_spilled=True)],
+                             [float(row) for row in range(13)])
+
+    def test_spill_files_are_capped_and_carry_only_referenced_strings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TelemetryStore(segment_size=2, max_rows=2, spill_dir=Path(tmp), max_spill_files=2)
+            for row in range(10):
+                store.append(float(row), 0, float(row), 'ms', f"unit_{row // 2}")
+
+            self.assertEqual([path.name for path in store.spilled],
+                             ['segment-000000000004.tlm', 'segment-000000000006.tlm'])
+            self.assertEqual(sorted(path.name for path in Path(tmp).iterdir()),
+                             [path.name for path in store.spilled])
+            self.assertEqual(store.dropped_rows, 4)
+            segment, strings = TelemetrySegment.load(store.spilled[1])
+            self.assertEqual(strings, ['ms', 'unit_3'])
+            self.assertEqual([row[3:5] for row in segment.rows(strings)], [('ms', 'unit_3')] * 2)
+            self.assertEqual([row[2] for row in store.iter_rows(include_spilled=True)],
+                             [float(row) for row in range(4, 10)])
+
+if __name__ == '__main__':
+    unittest.main()
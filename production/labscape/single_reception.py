@@ -4,11 +4,13 @@ Handles artifact reception and validation for a single AI Labscape
 Part of Phase 1 Foundation (1/256 scale implementation)
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List, Set
 from datetime import datetime
 import logging
-import json
+
+from artifact_digest import canonical_bytes, canonical_digest, verify_digest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,6 +32,7 @@ class LabscapeStatus:
     artifact_count: int = 0
     last_artifact_timestamp: Optional[str] = None
     status: str = "active"
+    artifacts_rejected: int = 0   # refused by back-pressure
 
 class SingleLabscapeReception:
     """
@@ -37,11 +40,12 @@ class SingleLabscapeReception:
     Focuses on artifact reception and Order-036 compliance
     """
     
-    def __init__(self, labscape_id: str):
+    def __init__(self, labscape_id: str, max_queue_size: int = 500000):
         self.labscape_id = labscape_id
         self.status = LabscapeStatus(labscape_id=labscape_id)
-        self.artifact_queue = []
-        self.processed_artifacts: List[str] = []  # Store processed artifact IDs
+        self.max_queue_size = max_queue_size
+        self.artifact_queue: Deque[Dict[str, Any]] = deque()
+        self.processed_artifacts: Set[str] = set()  # Processed artifact IDs
         
     def validate_artifact_headers(self, headers: Dict[str, Any]) -> bool:
         """
@@ -71,6 +75,16 @@ class SingleLabscapeReception:
         Receive and validate a single artifact from the labscape
         """
         try:
+            # Back-pressure: refuse new work until the queue drains
+            if len(self.artifact_queue) >= self.max_queue_size:
+                self.status.artifacts_rejected += 1
+                return {
+                    'status': 'backpressure',
+                    'timestamp': datetime.now().isoformat(),
+                    'message': f"Reception queue full ({self.max_queue_size} artifacts)",
+                    'queue_size': len(self.artifact_queue)
+                }
+
             # Header validation
             if 'headers' not in artifact:
                 raise ValueError("Missing Order-036 headers")
@@ -78,6 +92,9 @@ class SingleLabscapeReception:
             if not self.validate_artifact_headers(artifact['headers']):
                 raise ValueError("Invalid Order-036 headers")
 
+            # Checksum recorded at reception; processing re-serialises the live artifact against it
+            checksum = canonical_digest(artifact)[1]
+
             # Create artifact metadata
             metadata = ArtifactMetadata(
                 artifact_id=artifact['headers'].get('artifact_id', f"ART-{datetime.now().timestamp()}"),
@@ -85,26 +102,27 @@ class SingleLabscapeReception:
                 generation_timestamp=artifact['headers']['timestamp'],
                 type=artifact['headers']['artifact_type'],
                 version=artifact.get('version', '1.0'),
-                checksum=self._generate_checksum(artifact)
+                checksum=checksum
             )
 
             # Queue artifact with metadata
+            received_at = datetime.now().isoformat()
             queued_item = {
                 'artifact': artifact,
                 'metadata': metadata,
-                'received_at': datetime.now().isoformat(),
+                'received_at': received_at,
                 'status': 'queued'
             }
             self.artifact_queue.append(queued_item)
             
             # Update labscape status
             self.status.artifact_count += 1
-            self.status.last_artifact_timestamp = datetime.now().isoformat()
+            self.status.last_artifact_timestamp = received_at
 
             return {
                 'status': 'received',
                 'artifact_id': metadata.artifact_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': received_at,
                 'queue_position': len(self.artifact_queue)
             }
 
@@ -117,34 +135,33 @@ class SingleLabscapeReception:
             }
 
     def _generate_checksum(self, artifact: Dict[str, Any]) -> str:
-        """Generate a simple checksum for artifact validation"""
-        # Basic implementation - would be replaced with proper cryptographic hash
-        return str(hash(json.dumps(artifact, sort_keys=True)))
+        """SHA-256 of the artifact's canonical serialisation, stable across nodes"""
+        return canonical_digest(artifact)[1]
 
     def process_queue(self, batch_size: int = 1) -> List[Dict[str, Any]]:
         """
-        Process queued artifacts
+        Process up to batch_size queued artifacts in arrival order
         Returns list of processed artifacts
         """
-        processed = []
-        for _ in range(min(batch_size, len(self.artifact_queue))):
-            if not self.artifact_queue:
-                break
-                
-            item = self.artifact_queue.pop(0)
+        popleft = self.artifact_queue.popleft
+        batch = [popleft() for _ in range(min(batch_size, len(self.artifact_queue)))]
+        processed_ids = self.processed_artifacts
+        
+        for item in batch:
+            artifact_id = item['metadata'].artifact_id
             
-            # Basic processing - verify checksum and store artifact ID
-            current_checksum = self._generate_checksum(item['artifact'])
-            if current_checksum != item['metadata'].checksum:
-                logger.error(f"Checksum mismatch for artifact {item['metadata'].artifact_id}")
+            # Basic processing - skip replays, verify checksum and store artifact ID
+            if artifact_id in processed_ids:
+                logger.warning(f"Artifact {artifact_id} already processed")
+                item['status'] = 'duplicate'
+            elif not verify_digest(canonical_bytes(item['artifact']), item['metadata'].checksum):
+                logger.error(f"Checksum mismatch for artifact {artifact_id}")
                 item['status'] = 'error'
             else:
                 item['status'] = 'processed'
-                self.processed_artifacts.append(item['metadata'].artifact_id)
-            
-            processed.append(item)
+                processed_ids.add(artifact_id)
             
-        return processed
+        return batch
 
     def get_status(self) -> Dict[str, Any]:
         """Get current labscape status"""
@@ -153,6 +170,8 @@ class SingleLabscapeReception:
             'artifacts_received': self.status.artifact_count,
             'artifacts_processed': len(self.processed_artifacts),
             'queue_size': len(self.artifact_queue),
+            'queue_capacity': self.max_queue_size,
+            'artifacts_rejected': self.status.artifacts_rejected,
             'last_activity': self.status.last_artifact_timestamp,
             'status': self.status.status
         }
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Tests for Single Labscape Reception System
+"""
+
+import hashlib
+import json
+import unittest
+from datetime import datetime
+from single_reception import SingleLabscapeReception
+
+class TestSingleLabscapeReception(unittest.TestCase):
+    def setUp(self):
+        self.reception = SingleLabscapeReception('LABSCAPE_001', max_queue_size=5)
+
+    def _artifact(self, artifact_id):
+        return {
+            'headers': {
+                'timestamp': datetime.now().isoformat(),
+                'source': 'ai_unit_001',
+                'sequence': 1,
+                'labscape_id': 'LABSCAPE_001',
+                'artifact_type': 'concept_model',
+                'artifact_id': artifact_id
+            },
+            'payload': {'complexity': 0.7}
+        }
+
+    def test_batches_drain_in_arrival_order(self):
+        for index in range(4):
+            self.reception.receive_artifact(self._artifact(f"ART{index}"))
+
+        first = self.reception.process_queue(batch_size=3)
+        rest = self.reception.process_queue(batch_size=3)
+        self.assertEqual([item['metadata'].artifact_id for item in first + rest], ['ART0', 'ART1', 'ART2', 'ART3'])
+        self.assertEqual({item['status'] for item in first + rest}, {'processed'})
+        self.assertEqual(self.reception.process_queue(batch_size=3), [])
+
+    def test_replayed_and_tampered_artifacts(self):
+        self.reception.receive_artifact(self._artifact('ART1'))
+        self.reception.receive_artifact(self._artifact('ART1'))
+        self.reception.receive_artifact(self._artifact('ART2'))
+        self.reception.artifact_queue[2]['artifact']['payload']['complexity'] = 0.9
+
+        statuses = [item['status'] for item in self.reception.process_queue(batch_size=10)]
+        self.assertEqual(statuses, ['processed', 'duplicate', 'error'])
+        self.assertEqual(self.reception.processed_artifacts, {'ART1'})
+
+    def test_checksum_is_canonical_sha256(self):
+        artifact = self._artifact('ART1')
+        reordered = dict(reversed(list(artifact.items())))
+        expected = hashlib.sha256(json.dumps(artifact, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+        result = self.reception.receive_artifact(reordered)
+        self.assertEqual(result['status'], 'received')
+        self.assertEqual(self.reception.artifact_queue[0]['metadata'].checksum, expected)
+        self.assertEqual(self.reception._generate_checksum(artifact), expected)
+
+    def test_backpressure_when_queue_is_full(self):
+        results = [self.reception.receive_artifact(self._artifact(f"ART{index}")) for index in range(7)]
+
+        self.assertEqual([result['status'] for result in results], ['received'] * 5 + ['backpressure'] * 2)
+        status = self.reception.get_status()
+        self.assertEqual((status['queue_size'], status['artifacts_rejected']), (5, 2))
+
+        self.reception.process_queue(batch_size=1)
+        self.assertEqual(self.reception.receive_artifact(self._artifact('ART9'))['status'], 'received')
+
+if __name__ == '__main__':
+    unittest.main()
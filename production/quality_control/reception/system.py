@@ -3,11 +3,19 @@ Quality Control Reception System
 Implements Order-036 compliant reception for AI quality insights
 """
 
+import sys
 import time
 import logging
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    from gate_pipeline import GatePipeline
+except ModuleNotFoundError:  # script execution below production/
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from gate_pipeline import GatePipeline
+
 @dataclass
 class QualityEnhancement:
     type: str
@@ -18,12 +26,12 @@ class QualityEnhancement:
     validation_rules: List[Dict]
 
 class QualityControlReception:
-    def __init__(self):
+    def __init__(self, fail_fast: bool = False):
         self.logger = logging.getLogger('quality_control_reception')
         self.enhancement_queue = []
-        self._init_validation_system()
+        self._init_validation_system(fail_fast)
         
-    def _init_validation_system(self):
+    def _init_validation_system(self, fail_fast: bool = False):
         """Initialize validation components"""
         self.validators = {
             'schema': self._validate_schema,
@@ -31,6 +39,8 @@ class QualityControlReception:
             'security': self._validate_security,
             'domain': self._validate_domain_rules
         }
+        # Every failed gate is reported by default; fail_fast stops at the first rejection
+        self.gate_pipeline = GatePipeline(self.validators, fail_fast=fail_fast, log=self.logger)
 
     def receive_enhancement(self, enhancement_data: Dict) -> Dict:
         """
@@ -71,15 +81,8 @@ class QualityControlReception:
             raise
 
     def _run_validations(self, data: Dict) -> Dict:
-        """Run all validation checks"""
-        results = {}
-        for name, validator in self.validators.items():
-            try:
-                results[name] = validator(data)
-            except Exception as e:
-                self.logger.error(f"Validation {name} failed: {str(e)}")
-                results[name] = False
-        return results
+        """Run validation checks through the gate pipeline"""
+        return self.gate_pipeline.run(data)
 
     def _validate_schema(self, data: Dict) -> bool:
         """Validate enhancement schema"""
@@ -33,6 +33,19 @@ class TestQualityControlReception(unittest.TestCase):
             }
         }
 
+    def test_every_failed_gate_is_reported_unless_fail_fast(self):
+        """Test that all failed validations are listed by default"""
+        enhancement = dict(self.base_enhancement, protocol_version='Order-035')
+        del enhancement['security']
+        with self.assertRaises(ValidationError) as raised:
+            self.reception.receive_enhancement(enhancement)
+        self.assertIn("'order036'", str(raised.exception))
+        self.assertIn("'security'", str(raised.exception))
+
+        with self.assertRaises(ValidationError) as raised:
+            QualityControlReception(fail_fast=True).receive_enhancement(enhancement)
+        self.assertEqual(str(raised.exception).count("'"), 2)
+
     def test_valid_enhancement(self):
         """Test reception of valid enhancement"""
         result = self.reception.receive_enhancement(self.base_enhancement)
@@ -0,0 +1,70 @@
+"""
+Tests for Validation Gate Pipeline
+"""
+
+import unittest
+import gate_pipeline
+from gate_pipeline import GatePipeline
+
+class TestGatePipeline(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _gate(self, name, passes):
+        def gate(value):
+            self.calls.append(name)
+            if passes == 'raise':
+                raise ValueError(name)
+            return passes(value)
+        return gate
+
+    def test_runs_every_gate_unless_fail_fast(self):
+        gates = {
+            'schema': self._gate('schema', lambda value: value > 0),
+            'broken': self._gate('broken', 'raise'),
+            'domain': self._gate('domain', lambda value: True)
+        }
+        pipeline = GatePipeline(gates)
+        self.assertEqual(pipeline.run(1), {'schema': True, 'broken': False, 'domain': True})
+        self.assertEqual(self.calls, ['schema', 'broken', 'domain'])
+
+        self.calls.clear()
+        pipeline = GatePipeline(gates, fail_fast=True)
+        self.assertEqual(pipeline.run(-1), {'schema': False})
+        self.assertEqual(self.calls, ['schema'])
+        snapshot = pipeline.snapshot()
+        self.assertEqual(snapshot['gates']['schema']['failures'], 1)
+        self.assertEqual(snapshot['gates']['broken']['calls'], 0)
+
+    def test_adaptive_order_puts_selective_gates_first(self):
+        gates = {
+            'lenient': self._gate('lenient', lambda value: True),
+            'strict': self._gate('strict', lambda value: value % 4 == 0),
+            'rare': self._gate('rare', lambda value: value != 3)
+        }
+        pipeline = GatePipeline(gates, fail_fast=True, reorder_every=gate_pipeline.MIN_SAMPLES)
+        for value in range(gate_pipeline.MIN_SAMPLES):
+            pipeline.run(value)
+
+        # 'rare' only ran after 'strict' passed, so it is still under-sampled and is tried first
+        self.assertEqual(pipeline.order, ['rare', 'strict', 'lenient'])
+        self.calls.clear()
+        self.assertEqual(pipeline.run(8), {'lenient': True, 'strict': True, 'rare': True})
+        self.assertEqual(self.calls, pipeline.order)
+
+    def test_merge_and_telemetry_points(self):
+        pipeline = GatePipeline({'schema': lambda value: value})
+        worker = GatePipeline({'schema': lambda value: value})
+        pipeline.run(True)
+        worker.run(False)
+        worker.run(True)
+        pipeline.merge(worker.stats, worker.runs)
+
+        self.assertEqual(pipeline.runs, 3)
+        (point,) = pipeline.telemetry_points('LABSCAPE_001', 'qc', '2025-01-01T00:00:00')
+        self.assertEqual(point['metric_type'], 'performance')
+        self.assertEqual((point['context']['gate'], point['context']['calls'], point['context']['failures']),
+                         ('schema', 3, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Tests for the Alfa Two monitor's append-only sinks."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import alfa_two_monitor
+from tools.alfa_two_monitor import (
+    AppendLog,
+    MonitoringConfig,
+    ProcessedIndex,
+    export_metrics,
+    iter_jsonl,
+    process_orders,
+)
+
+STUB = {"batch_id": "b1", "ritual": "forge", "units_processed": 3, "status": "success", "duration_ms": 1200}
+
+
+def _order(order_id: str, line: str) -> dict:
+    return {
+        "schema": "factory-order@1.0",
+        "order_id": order_id,
+        "target": "toyfoundry_ai_0",
+        "timestamp_issued": "2025-01-01T00:00:00Z",
+        "summary": "Forge crafts the ally.",
+        "glyph_chain": ["a", "b"],
+        "telemetry_stub": STUB,
+        "narration": {"line": line, "beats": ["Forge"]},
+    }
+
+
+def _config(tmp_path: Path) -> MonitoringConfig:
+    return MonitoringConfig(
+        orders_dir=tmp_path / "orders",
+        telemetry_dir=tmp_path / "telemetry",
+        narrator_metrics=tmp_path / "logs" / "narrator_metrics.jsonl",
+        glyph_log=tmp_path / "logs" / "glyph_vo_discrepancies.log",
+        once=True,
+        interval=0,
+    )
+
+
+def test_process_orders_appends_lines_and_migrates_legacy_array(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    config.orders_dir.mkdir()
+    legacy = config.narrator_metrics.with_suffix(".json")
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps([{"order_id": "OLD-1"}], indent=2) + "\n", encoding="utf-8")
+    for order_id, line in [("TF-1", "Forge crafts the ally."), ("TF-2", "Something else.")]:
+        (config.orders_dir / f"{order_id}.json").write_text(json.dumps(_order(order_id, line)), encoding="utf-8")
+
+    assert process_orders(config)
+    (config.orders_dir / "TF-3.json").write_text(json.dumps(_order("TF-3", "Nope.")), encoding="utf-8")
+    assert process_orders(config)
+    assert not process_orders(config)
+
+    assert [entry["order_id"] for entry in iter_jsonl(config.narrator_metrics)] == ["OLD-1", "TF-1", "TF-2", "TF-3"]
+    assert len(config.narrator_metrics.read_text(encoding="utf-8").splitlines()) == 4
+    log_lines = config.glyph_log.read_text(encoding="utf-8").splitlines()
+    assert [line.split("order_id=")[1].split()[0] for line in log_lines] == ["TF-2", "TF-3"]
+
+
+def test_export_matches_legacy_array_format(tmp_path: Path) -> None:
+    log_path = tmp_path / "metrics.jsonl"
+    entries = [{"order_id": f"TF-{n}", "beats": ["Forge", "crafts"], "glyph_count": n} for n in range(3)]
+    with AppendLog(log_path, flush_every=2) as log:
+        for entry in entries:
+            log.write_json(entry)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"order_id": "torn')
+
+    with AppendLog(log_path) as log:
+        log.write_json({"order_id": "TF-after-crash"})
+    entries.append({"order_id": "TF-after-crash"})
+
+    destination = tmp_path / "narrator_metrics.json"
+    assert export_metrics(log_path, destination) == 4
+    assert destination.read_text(encoding="utf-8") == json.dumps(entries, indent=2) + "\n"
+
+    assert export_metrics(tmp_path / "missing.jsonl", destination) == 0
+    assert destination.read_text(encoding="utf-8") == "[]\n"
+
+
+def test_fingerprint_index_skips_processed_files_without_opening(tmp_path: Path, monkeypatch, capsys) -> None:
+    config = _config(tmp_path)
+    config.orders_dir.mkdir()
+    config.telemetry_dir.mkdir()
+    (config.telemetry_dir / "_processed.json").write_text(json.dumps({"order_ids": ["TF-OLD"]}), encoding="utf-8")
+    for order_id in ["TF-OLD", "TF-1"]:
+        (config.orders_dir / f"{order_id}.json").write_text(json.dumps(_order(order_id, "x")), encoding="utf-8")
+    (config.orders_dir / "broken.json").write_text("{", encoding="utf-8")
+
+    opened = []
+    real_load = alfa_two_monitor.load_payload
+    monkeypatch.setattr(alfa_two_monitor, "load_payload", lambda path: opened.append(path.name) or real_load(path))
+    index = ProcessedIndex.load(config.telemetry_dir)
+
+    assert process_orders(config, index)
+    assert sorted(opened) == ["TF-1.json", "TF-OLD.json", "broken.json"]
+    assert capsys.readouterr().out.count("Skipping") == 1
+
+    opened.clear()
+    assert not process_orders(config, index)
+    assert opened == []
+
+    touched = config.orders_dir / "TF-1.json"
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10**9))
+    assert not process_orders(config, index)
+    assert opened == ["TF-1.json"]
+    index.close()
+
+    reloaded = ProcessedIndex.load(config.telemetry_dir)
+    assert reloaded.order_ids == {"TF-OLD", "TF-1"}
+    assert set(reloaded.fingerprints) == {"TF-OLD.json", "TF-1.json"}
+    state_lines = (config.telemetry_dir / "_processed.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["order_id"] for line in state_lines] == ["TF-OLD", "TF-1", "TF-OLD", "TF-1"]
+    assert [entry["order_id"] for entry in iter_jsonl(config.narrator_metrics)] == ["TF-1"]
+
+
+def test_pool_pipeline_writes_in_file_order(tmp_path: Path, monkeypatch, capsys) -> None:
+    monkeypatch.setattr(alfa_two_monitor, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(alfa_two_monitor, "CHUNK_SIZE", 3)
+    config = _config(tmp_path)
+    config.workers = 2
+    config.orders_dir.mkdir()
+    names = [f"TF-{n:02d}" for n in range(12)]
+    for order_id in names:
+        (config.orders_dir / f"{order_id}.json").write_text(json.dumps(_order(order_id, "x")), encoding="utf-8")
+    (config.orders_dir / "TF-05.json").write_text(json.dumps({"schema": "factory-order@1.0"}), encoding="utf-8")
+
+    assert process_orders(config)
+
+    expected = [order_id for order_id in names if order_id != "TF-05"]
+    assert [entry["order_id"] for entry in iter_jsonl(config.narrator_metrics)] == expected
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[5].startswith("Skipping") and "TF-05.json" in lines[5]
+    assert [line.split()[-1] for line in lines if line.startswith("Processed")] == expected
+    snapshot = json.loads((config.telemetry_dir / "TF-07.json").read_text(encoding="utf-8"))
+    assert snapshot["checksum_sha256"] == alfa_two_monitor.hash_payload(_order("TF-07", "x"))
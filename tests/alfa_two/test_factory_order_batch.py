@@ -0,0 +1,110 @@
+"""Tests for the batch factory-order emission engine."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import alfa_two_emit, factory_order_batch
+from tools.factory_order_batch import EmissionSettings, emit_batch
+
+FIXTURES_DIR = Path(__file__).parent
+VALID = [FIXTURES_DIR / "sample_translator_payload.json", FIXTURES_DIR / "sample_translator_payload_scout.json"]
+
+
+def _copies(tmp_path: Path, count: int) -> list:
+    template = json.loads(VALID[0].read_text(encoding="utf-8"))
+    paths = []
+    for index in range(count):
+        path = tmp_path / "payloads" / f"p{index:03d}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stub = {**template["telemetry_stub"], "batch_id": f"b{index}"}
+        path.write_text(json.dumps({**template, "telemetry_stub": stub}), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_emit_batch_writes_orders_and_manifest(tmp_path: Path) -> None:
+    settings = EmissionSettings(run_id="TF-BATCH", timestamp_issued="2025-10-29T00:00:00+00:00", narrator="war-office")
+    manifest_path = tmp_path / "manifest.json"
+
+    result = emit_batch(VALID, settings, tmp_path / "out", manifest_path=manifest_path, report=lambda _m: None)
+
+    assert result.ok and result.manifest_path == manifest_path
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert manifest["count"] == 2
+    assert [entry["order_id"] for entry in manifest["orders"]] == ["TF-BATCH-01", "TF-BATCH-02"]
+    generated = set()
+    for entry in manifest["orders"]:
+        data = Path(entry["path"]).read_bytes()
+        assert hashlib.sha256(data).hexdigest() == entry["sha256"]
+        order = json.loads(data)
+        assert order["timestamp_issued"] == "2025-10-29T00:00:00+00:00"
+        assert order["metadata"]["narrator_profile"] == "war-office"
+        generated.add(order["metadata"]["generated_at"])
+    assert generated == {manifest["generated_at"]}
+    assert not list((tmp_path / "out").glob(".*"))
+
+
+def test_rejected_payload_blocks_the_whole_batch(tmp_path: Path) -> None:
+    paths = VALID + [FIXTURES_DIR / "sample_translator_payload_missing_units.json", tmp_path / "absent.json"]
+
+    result = emit_batch(paths, EmissionSettings(run_id="TF-BAD"), tmp_path / "out", manifest_path=tmp_path / "m.json")
+
+    assert [(path.name, problem.split(":")[0]) for path, problem in result.failures] == [
+        ("sample_translator_payload_missing_units.json", "telemetry_stub missing 'units_processed'"),
+        ("absent.json", "Unreadable payload"),
+    ]
+    assert not (tmp_path / "out").exists() and not (tmp_path / "m.json").exists()
+
+
+def test_process_pool_path_preserves_order(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(factory_order_batch, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(factory_order_batch, "CHUNK_SIZE", 3)
+    paths = _copies(tmp_path, 10)
+
+    result = emit_batch(paths, EmissionSettings(run_id="TF-POOL"), tmp_path / "out", dry_run=True, workers=2)
+
+    assert result.ok and result.manifest_path is None
+    assert [order.payload()["telemetry_stub"]["batch_id"] for order in result.orders] == [f"b{i}" for i in range(10)]
+    assert not (tmp_path / "out").exists()
+
+
+def test_small_batches_run_inline_and_leave_settings_untouched(tmp_path: Path, monkeypatch) -> None:
+    def _no_pool(*_args, **_kwargs):
+        raise AssertionError("small batches must not start a pool")
+
+    monkeypatch.setattr(factory_order_batch, "ThreadPoolExecutor", _no_pool)
+    monkeypatch.setattr(factory_order_batch, "ProcessPoolExecutor", _no_pool)
+    monkeypatch.setattr(factory_order_batch, "TransferEngine", _no_pool)
+    settings = EmissionSettings(run_id="TF-INLINE")
+
+    result = emit_batch(_copies(tmp_path, 3), settings, tmp_path / "out", manifest_path=tmp_path / "m.json", workers=4)
+
+    assert result.ok and settings.timestamp_issued is None
+    manifest = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert manifest["timestamp_issued"] is not None
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [f"TF-INLINE-0{i}.json" for i in (1, 2, 3)]
+
+
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_alfa_two_emit_cli(tmp_path: Path, capsys, dry_run: bool) -> None:
+    argv = [*map(str, VALID), "--output-dir", str(tmp_path / "out"), "--run-id", "TF-CLI"]
+    argv += ["--manifest", str(tmp_path / "manifest.json")] + (["--dry-run"] if dry_run else [])
+
+    assert alfa_two_emit.main(argv) == 0
+
+    out = capsys.readouterr().out
+    if dry_run:
+        assert "[dry-run]" in out and '"order_id": "TF-CLI-01"' in out
+        assert not (tmp_path / "manifest.json").exists()
+    else:
+        assert f"Emitted {tmp_path / 'out' / 'TF-CLI-02.json'}" in out
+        assert "[OK] Emission manifest written" in out
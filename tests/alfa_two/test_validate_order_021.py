@@ -0,0 +1,124 @@
+"""Tests for the streaming Order 021 export validator."""
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import validate_order_021
+from tools.validate_order_021 import (
+    REQUIRED_FIELDS,
+    ValidationIssue,
+    check_parity,
+    iter_json_records,
+    row_digest,
+    run_validation,
+)
+
+RECORD = {
+    "schema_version": "1.0",
+    "batch_id": "alfa-1",
+    "ritual": "forge",
+    "units_processed": 1234567,
+    "status": "success",
+    "duration_ms": 250,
+}
+
+
+def _records(count: int, **overrides) -> list:
+    return [{**RECORD, "batch_id": f"alfa-{index}", **overrides} for index in range(count)]
+
+
+def _write_csv(path: Path, records: list) -> Path:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(REQUIRED_FIELDS))
+        writer.writeheader()
+        writer.writerows(records)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_streams_json_array_across_chunk_boundaries(tmp_path: Path, chunk_size: int) -> None:
+    records = _records(20) + [[1, 2], 3.5]
+    path = tmp_path / "composite_export.json"
+    path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    assert list(iter_json_records(path, chunk_size=chunk_size)) == records
+
+
+def test_streams_ndjson_and_rejects_malformed_exports(tmp_path: Path) -> None:
+    ndjson = tmp_path / "composite_export.ndjson"
+    ndjson.write_text("\n".join(json.dumps(r) for r in _records(3)) + "\n\n", encoding="utf-8")
+    assert [r["batch_id"] for r in iter_json_records(ndjson)] == ["alfa-0", "alfa-1", "alfa-2"]
+
+    for text, message in [("  ", "empty"), ("[]", "empty"), ("[{}, {}", "unterminated"), ("[{} {}]", "expected ','")]:
+        path = tmp_path / "bad.json"
+        path.write_text(text, encoding="utf-8")
+        with pytest.raises(ValidationIssue, match=message):
+            list(iter_json_records(path, chunk_size=2))
+
+
+def test_validates_json_and_csv_rows(tmp_path: Path) -> None:
+    json_path = tmp_path / "composite_export.json"
+    json_path.write_text(json.dumps(_records(5)), encoding="utf-8")
+    csv_path = _write_csv(tmp_path / "composite_export.csv", _records(4))
+
+    summary = run_validation(json_path, csv_path)
+    assert (summary.records, summary.csv_rows, summary.failure_count) == (5, 4, 0)
+
+    _write_csv(csv_path, _records(2) + _records(1, units_processed="many"))
+    with pytest.raises(ValidationIssue, match="CSV row 2: field 'units_processed' must be an integer"):
+        run_validation(json_path, csv_path)
+
+
+def test_reports_failures_early_and_fails_fast(tmp_path: Path, capsys) -> None:
+    json_path = tmp_path / "composite_export.json"
+    json_path.write_text(json.dumps(_records(3) + _records(50, ritual="dance")), encoding="utf-8")
+    seen = []
+
+    with pytest.raises(ValidationIssue) as excinfo:
+        run_validation(json_path, None, max_failures=5, on_failure=seen.append, report_limit=2)
+
+    assert seen == [
+        "Record 3: ritual 'dance' not in ['forge', 'parade', 'promote', 'purge']",
+        "Record 4: ritual 'dance' not in ['forge', 'parade', 'promote', 'purge']",
+    ]
+    assert str(excinfo.value) == "Validation failed: 5 failure(s), 3/8 records passed."
+
+    assert validate_order_021.main([str(json_path), "--max-failures", "1"]) == 1
+    err = capsys.readouterr().err
+    assert "  - Record 3: ritual 'dance'" in err
+    assert "1 failure(s), 3/4 records passed" in err
+
+
+def test_parity_is_order_independent_and_reports_unmatched_rows(tmp_path: Path) -> None:
+    records = _records(6)
+    json_path = tmp_path / "composite_export.json"
+    json_path.write_text(json.dumps(records, indent=2, sort_keys=True), encoding="utf-8")
+    csv_path = _write_csv(tmp_path / "composite_export.csv", list(reversed(records)))
+
+    assert row_digest(records[0]) == row_digest(dict(reversed(list(records[0].items()))))
+    report = check_parity(json_path, csv_path)
+    assert report.ok and (report.json_rows, report.csv_rows) == (6, 6)
+    assert report.json_aggregate == report.csv_aggregate
+
+    _write_csv(csv_path, records[:4] + [{**records[4], "duration_ms": 251}])
+    report = check_parity(json_path, csv_path)
+    assert report.json_aggregate != report.csv_aggregate
+    assert report.mismatch_count == 3
+    assert sorted(report.mismatches) == [
+        "CSV row 4 (batch_id alfa-4) has no matching JSON record",
+        "Record 4 (batch_id alfa-4) has no matching CSV row",
+        "Record 5 (batch_id alfa-5) has no matching CSV row",
+    ]
+
+    with pytest.raises(ValidationIssue, match="3 failure"):
+        run_validation(json_path, csv_path, parity=True)
+    assert validate_order_021.main([str(json_path), "--csv", str(csv_path), "--parity"]) == 1
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import shutil
 import sys
 from pathlib import Path
 
@@ -11,10 +12,12 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from tools import emoji_runtime_promoter
 from tools.emoji_runtime_promoter import (
     EmojiRuntimeValidationError,
     build_factory_order_from_emoji,
     load_emoji_runtime_payload,
+    promote_many,
 )
 from tools.factory_order_emitter import PayloadValidationError, write_factory_order
 
@@ -94,3 +97,59 @@ def test_summary_alignment_mismatch_raises() -> None:
             timestamp_issued="2025-11-01T10:30:00Z",
             summary_override="Different lore line",
         )
+
+
+def test_checksum_is_computed_once(monkeypatch) -> None:
+    payload = load_emoji_runtime_payload(fixture_path("sample_forge_payload.json"))
+    first = payload.checksum
+    monkeypatch.setattr(emoji_runtime_promoter.json, "dumps", lambda *a, **k: pytest.fail("re-serialised raw"))
+    assert payload.checksum == first
+
+
+def _bulk_inputs(tmp_path: Path) -> Path:
+    source = tmp_path / "payloads"
+    source.mkdir()
+    shutil.copy(fixture_path("sample_forge_payload.json"), source / "a_forge.json")
+    shutil.copy(fixture_path("sample_conditional_repeat_payload.json"), source / "b_scout.json")
+    shutil.copy(fixture_path("sample_forge_payload.json"), source / "c_forge_again.json")
+    return source
+
+
+def test_promote_many_dedupes_and_writes_index(tmp_path: Path) -> None:
+    source = _bulk_inputs(tmp_path)
+    output = tmp_path / "out"
+
+    result = promote_many(
+        emoji_runtime_promoter.discover_emoji_payloads(source),
+        run_id="TF-EMOJI-BULK",
+        output_dir=output,
+        issued_by="toyfoundry_ai_0",
+        target="toyfoundry_ai_0",
+        priority="standard",
+        timestamp_issued="2025-11-01T10:15:00Z",
+    )
+
+    assert not result.failures
+    assert sorted(path.name for path in output.glob("TF-*.json")) == ["TF-EMOJI-BULK-01.json", "TF-EMOJI-BULK-02.json"]
+    index = json.loads(result.index_path.read_text(encoding="utf-8"))
+    assert (index["payloads"], index["promoted"], index["duplicates"]) == (3, 2, 1)
+    assert index["entries"][2]["duplicate_of"] == "TF-EMOJI-BULK-01"
+    assert index["entries"][2]["checksum_sha256"] == index["entries"][0]["checksum_sha256"]
+    order = json.loads((output / "TF-EMOJI-BULK-01.json").read_text(encoding="utf-8"))
+    assert order["metadata"]["emoji_runtime_checksum_sha256"] == index["entries"][0]["checksum_sha256"]
+
+
+def test_bulk_cli_glob_aborts_without_writing_on_invalid_payload(tmp_path: Path, capsys) -> None:
+    source = _bulk_inputs(tmp_path)
+    (source / "d_broken.json").write_text(json.dumps({"schema": "emoji-runtime@1.0"}), encoding="utf-8")
+    output = tmp_path / "out"
+
+    assert emoji_runtime_promoter.main([str(source / "*.json"), str(output), "--run-id", "TF-GLOB"]) == 1
+    assert "Promotion aborted for" in capsys.readouterr().out
+    assert not output.exists()
+
+    (source / "d_broken.json").unlink()
+    assert emoji_runtime_promoter.main([str(source / "*_forge*.json"), str(output), "--run-id", "TF-GLOB"]) == 0
+    out = capsys.readouterr().out
+    assert "[skip]" in out and "1 order(s) from 2 payload(s)" in out
+    assert emoji_runtime_promoter.main([str(fixture_path("sample_forge_payload.json")), "--dry-run"]) == 1
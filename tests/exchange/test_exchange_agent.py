@@ -0,0 +1,84 @@
+"""Tests for the long-lived exchange agent."""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import exchange_agent
+from tools.exchange_agent import AgentConfig, ExchangeAgent, ExchangeModel, query_agent
+from tools.offline_bridge import BridgeConfig
+
+
+def _write(path: Path, payload: dict) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_model_rereads_only_changed_files(tmp_path: Path) -> None:
+    exchange = tmp_path / "exchange"
+    _write(exchange / "orders" / "pending" / "a.json", {"order_id": "A", "target": "toyfoundry_ai_0", "summary": "a"})
+    changed = _write(exchange / "orders" / "pending" / "b.json", {"order_id": "B", "target": "other"})
+    model = ExchangeModel(exchange)
+
+    assert model.refresh()["orders_pending"]["added"] == ["A", "B"]
+    assert model.header_reads == 2
+    assert model.refresh()["orders_pending"] == {"added": [], "removed": []}
+    assert model.header_reads == 2
+
+    _write(changed, {"order_id": "B", "target": "toyfoundry_ai_0", "summary": "now ours"})
+    model.refresh()
+    assert model.header_reads == 3
+    assert model.for_target("toyfoundry_ai_0")["orders_pending"] == ["A", "B"]
+
+    changed.unlink()
+    assert model.refresh()["orders_pending"]["removed"] == ["B"]
+
+
+def test_ledger_refresh_only_when_sources_change(tmp_path: Path) -> None:
+    model = ExchangeModel(tmp_path / "exchange")
+    assert model.ledger_changed()
+    assert not model.ledger_changed()
+    _write(tmp_path / "exchange" / "reports" / "inbox" / "order-2025-01-01-001-report.json", {})
+    assert model.ledger_changed()
+
+
+def test_agent_serves_status_over_local_socket(tmp_path: Path) -> None:
+    repo_root = tmp_path / "ws"
+    _write(repo_root / "exchange" / "reports" / "inbox" / "order-2025-01-01-001-report.json", {"report_id": "R1"})
+    bridge = BridgeConfig(hub=tmp_path / "missing_hub", front="ws", repo_root=repo_root)
+    config = AgentConfig(bridge=bridge, heartbeat_interval=60, scan_interval=60, sync=False)
+    messages = []
+    agent = ExchangeAgent(config, report=messages.append)
+
+    async def _scenario():
+        task = asyncio.create_task(agent.run())
+        while not config.state_file.exists():
+            await asyncio.sleep(0.01)
+        status = await asyncio.to_thread(query_agent, repo_root, "scan")
+        stopped = await asyncio.to_thread(query_agent, repo_root, "stop")
+        assert await asyncio.wait_for(task, timeout=5) == 0
+        return status, stopped
+
+    status, stopped = asyncio.run(_scenario())
+
+    assert status["hub_online"] is False
+    assert status["last_scan"]["counts"]["reports_inbox"] == 1
+    ledger = json.loads((repo_root / "exchange" / "ledger" / "index.json").read_text(encoding="utf-8"))
+    assert ledger["reports"] == {"order-2025-01-01-001-report": "reports/inbox/order-2025-01-01-001-report.json"}
+    assert stopped["pid"] == status["pid"]
+    assert not config.state_file.exists()
+    assert any(m.startswith("[exchange] New inbox reports detected: R1") for m in messages)
+
+
+def test_cli_reports_missing_agent(tmp_path: Path, monkeypatch, capsys) -> None:
+    bridge = BridgeConfig(hub=tmp_path / "hub", front="ws", repo_root=tmp_path)
+    monkeypatch.setattr(exchange_agent, "resolve_config", lambda: bridge)
+    assert exchange_agent.main(["status"]) == 1
+    assert "No running exchange agent" in capsys.readouterr().err
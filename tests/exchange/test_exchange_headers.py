@@ -0,0 +1,70 @@
+"""Tests for bounded-prefix header extraction and the scanners that use it."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.exchange_headers import read_header_fields
+from tools.manufacturing_order_watcher import discover_pending_acks, filter_orders
+
+
+def _write(path: Path, payload: object, **dump_kwargs: object) -> Path:
+    path.write_text(json.dumps(payload, **dump_kwargs), encoding="utf-8")
+    return path
+
+
+def test_reads_only_requested_fields(tmp_path: Path) -> None:
+    doc = _write(
+        tmp_path / "order.json",
+        {"order_id": "order-1", "target": "toyfoundry_ai_0", "attachments": list(range(50_000))},
+        indent=2,
+    )
+    assert read_header_fields(doc, ["order_id", "target"], prefix_bytes=64) == {
+        "order_id": "order-1",
+        "target": "toyfoundry_ai_0",
+    }
+
+
+def test_matches_full_parse_when_keys_trail_large_values(tmp_path: Path) -> None:
+    payload = {
+        "directives": [{"action": "mint", "details": "é" * 10} for _ in range(500)],
+        "count": 12345,
+        "summary": "Trailing summary ✨",
+    }
+    doc = _write(tmp_path / "order.json", payload, ensure_ascii=False)
+    result = read_header_fields(doc, ["count", "summary", "missing"], prefix_bytes=7)
+    assert result == {"count": 12345, "summary": "Trailing summary ✨"}
+
+
+def test_malformed_document_raises_decode_error(tmp_path: Path) -> None:
+    doc = tmp_path / "broken.json"
+    doc.write_text('{"order_id": "order-1", "target": ', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        read_header_fields(doc, ["target"])
+
+
+def test_non_object_document_yields_no_fields(tmp_path: Path) -> None:
+    doc = _write(tmp_path / "list.json", [{"target": "toyfoundry_ai_0"}])
+    assert read_header_fields(doc, ["target"]) == {}
+
+
+def test_watcher_scanners_filter_on_headers(tmp_path: Path) -> None:
+    pending = tmp_path / "orders" / "pending"
+    pending.mkdir(parents=True)
+    ours = _write(pending / "a.json", {"target": "toyfoundry_ai_0", "directives": [{"action": "mint"}]})
+    _write(pending / "b.json", {"target": "someone_else"})
+    acks = tmp_path / "acknowledgements" / "pending"
+    acks.mkdir(parents=True)
+    ack = _write(acks / "ack.json", {"sender": "toyfoundry_ai_0"})
+
+    orders = filter_orders(sorted(pending.glob("*.json")), "toyfoundry_ai_0")
+    assert [path for path, _ in orders] == [ours]
+    assert orders[0][1]["directives"] == [{"action": "mint"}]
+    assert discover_pending_acks(tmp_path, "toyfoundry_ai_0") == [ack]
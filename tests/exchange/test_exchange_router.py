@@ -0,0 +1,66 @@
+"""Tests for the compiled offline exchange router."""
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.exchange_router import ExchangeRouter, get_router
+
+RULES = [
+    {"glob": "unit-*.json", "dest": "exchange/units"},
+    {"glob": "*.log", "dest": "exchange/logs"},
+    {"glob": "unit-[0-9]*.json", "dest": "exchange/never"},
+    {"glob": "*", "dest": "exchange/catch_all"},
+]
+
+
+def _legacy(root: Path, name: str) -> Path:
+    for rule in RULES:
+        if fnmatch.fnmatch(name, rule["glob"]):
+            return root / rule["dest"] / name
+    raise AssertionError("catch-all rule should always match")
+
+
+def test_builtin_rules_take_precedence(tmp_path: Path) -> None:
+    router = ExchangeRouter(tmp_path, RULES)
+    assert router.route_inbox("order-2025-11-19-060-ack.json") == (
+        tmp_path / "exchange" / "acknowledgements" / "logged" / "order-2025-11-19-060-ack.json"
+    )
+    assert router.route_inbox("Order-report.JSON") == tmp_path / "exchange" / "reports" / "inbox" / "Order-report.JSON"
+    assert router.route_inbox("tf-emoji-dryrun-01.json").parent == tmp_path / "telemetry" / "emoji_runtime" / "promoted_samples"
+
+
+def test_first_matching_glob_wins_like_fnmatch(tmp_path: Path) -> None:
+    router = ExchangeRouter(tmp_path, RULES)
+    for name in ["unit-7.json", "unit-x.log", "trace.log", "readme.md", "u"]:
+        assert router.route_inbox(name) == _legacy(tmp_path, name)
+
+
+def test_no_rules_leaves_unknown_files(tmp_path: Path) -> None:
+    router = ExchangeRouter(tmp_path)
+    assert router.route_inbox("notes.txt") is None
+    assert router.route_pull(Path("orders/Pending/o.json")) == (
+        tmp_path / "exchange" / "orders" / "pending" / "o.json",
+        "orders/pending",
+    )
+
+
+def test_get_router_reloads_when_rules_change(tmp_path: Path) -> None:
+    rules_file = tmp_path / "exchange" / "router_rules.json"
+    rules_file.parent.mkdir(parents=True)
+    rules_file.write_text(json.dumps([{"glob": "*.txt", "dest": "a"}]), encoding="utf-8")
+    first = get_router(tmp_path)
+    assert get_router(tmp_path) is first
+    assert first.route_inbox("n.txt") == tmp_path / "a" / "n.txt"
+
+    rules_file.write_text(json.dumps([{"glob": "*.txt", "dest": "b"}]), encoding="utf-8")
+    stat = rules_file.stat()
+    os.utime(rules_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert get_router(tmp_path).route_inbox("n.txt") == tmp_path / "b" / "n.txt"
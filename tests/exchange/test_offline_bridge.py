@@ -0,0 +1,333 @@
+"""Tests for the offline exchange bridge."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.hub_store import HubStore
+from tools.offline_bridge import PUSH_MANIFEST_NAME, BridgeConfig, gc, pull, push, reconcile, sort_inbox
+from tools.transfer_engine import TransferEngine, round_robin
+
+
+def _bridge(tmp_path: Path, front: str = "toyfoundry_ai_0") -> BridgeConfig:
+    repo_root = tmp_path / front
+    (repo_root / "exchange" / "outbox").mkdir(parents=True)
+    return BridgeConfig(hub=tmp_path / "hub", front=front, repo_root=repo_root)
+
+
+def _outbox_file(cfg: BridgeConfig, rel: str, content: str) -> Path:
+    path = cfg.repo_root / "exchange" / "outbox" / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_push_skips_unchanged_files(tmp_path: Path, capsys) -> None:
+    cfg = _bridge(tmp_path)
+    _outbox_file(cfg, "reports/a.json", '{"report_id": "a"}')
+    changed = _outbox_file(cfg, "reports/b.json", '{"report_id": "b"}')
+
+    assert push(cfg) == 2
+    manifest = json.loads((cfg.hub / cfg.front / PUSH_MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert set(manifest["files"]) == {"reports/a.json", "reports/b.json"}
+
+    changed.write_text('{"report_id": "b", "v": 2}', encoding="utf-8")
+    capsys.readouterr()
+    assert push(cfg) == 1
+    out = capsys.readouterr().out
+    assert "skipped 1 unchanged file(s) (18 bytes)" in out
+    assert (cfg.hub / cfg.front / "outbox" / "reports" / "b.json").read_text(encoding="utf-8").endswith("2}")
+    assert not list((cfg.hub / cfg.front / "outbox").rglob("*.bridge-tmp"))
+
+
+def test_push_manifest_drops_deleted_outbox_files(tmp_path: Path) -> None:
+    cfg = _bridge(tmp_path)
+    kept = _outbox_file(cfg, "reports/kept.json", "{}")
+    gone = _outbox_file(cfg, "reports/gone.json", "{}")
+    push(cfg)
+    push(cfg, bundle=True)
+    gone.unlink()
+
+    push(cfg)
+    push(cfg, bundle=True)
+    for name in (PUSH_MANIFEST_NAME, "bundle_manifest.json"):
+        manifest = json.loads((cfg.hub / cfg.front / name).read_text(encoding="utf-8"))
+        assert list(manifest["files"]) == ["reports/kept.json"]
+    assert kept.exists()
+
+
+def test_push_touch_without_content_change_is_skipped(tmp_path: Path) -> None:
+    cfg = _bridge(tmp_path)
+    src = _outbox_file(cfg, "orders/pending/o.json", "{}")
+    push(cfg)
+    os.utime(src, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns + 5_000_000_000))
+    assert push(cfg) == 0
+
+
+def test_push_recopies_when_hub_copy_removed(tmp_path: Path) -> None:
+    cfg = _bridge(tmp_path)
+    _outbox_file(cfg, "reports/a.json", "{}")
+    push(cfg)
+    (cfg.hub / cfg.front / "outbox" / "reports" / "a.json").unlink()
+    assert push(cfg) == 1
+    assert push(cfg, force=True) == 1
+
+
+def _peer_file(cfg: BridgeConfig, peer: str, rel: str, content: str) -> Path:
+    path = cfg.hub / peer / "outbox" / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_pull_routes_and_sorts_with_worker_pool(tmp_path: Path) -> None:
+    cfg = _bridge(tmp_path)
+    cfg.workers = 4
+    for n in range(20):
+        _peer_file(cfg, "high_command_ai_0", f"reports/r{n}.json", "{}")
+    _peer_file(cfg, "toysoldiers_ai_0", "misc/order-2025-11-19-060-ack.json", "{}")
+    moved = _peer_file(cfg, "toysoldiers_ai_0", "orders/pending/o.json", '{"v": 1}')
+
+    assert pull(cfg, move=True) == 22
+    root = cfg.repo_root
+    assert len(list((root / "exchange" / "reports" / "inbox").glob("*.json"))) == 20
+    assert (root / "exchange" / "orders" / "pending" / "o.json").exists()
+    assert (root / "exchange" / "acknowledgements" / "logged" / "order-2025-11-19-060-ack.json").exists()
+    assert not moved.exists()
+
+
+def test_sort_inbox_moves_every_same_named_file(tmp_path: Path) -> None:
+    cfg = _bridge(tmp_path)
+    inbox = cfg.repo_root / "exchange" / "inbox"
+    for folder in ("a", "b"):
+        (inbox / folder).mkdir(parents=True)
+        (inbox / folder / "order-2025-11-19-060-ack.json").write_text(folder, encoding="utf-8")
+
+    assert sort_inbox(cfg) == 2
+    assert not list(inbox.rglob("*.json"))
+    logged = cfg.repo_root / "exchange" / "acknowledgements" / "logged" / "order-2025-11-19-060-ack.json"
+    assert logged.read_text(encoding="utf-8") in {"a", "b"}
+    assert sort_inbox(cfg) == 0
+
+
+def test_pull_later_peer_wins_on_shared_destination(tmp_path: Path, capsys) -> None:
+    cfg = _bridge(tmp_path)
+    _peer_file(cfg, "alpha", "reports/same.json", "alpha")
+    _peer_file(cfg, "bravo", "reports/same.json", "bravo")
+    assert pull(cfg) == 1
+    assert (cfg.repo_root / "exchange" / "reports" / "inbox" / "same.json").read_text(encoding="utf-8") == "bravo"
+    out = capsys.readouterr().out
+    assert "[OK] Pulled 1 file(s)" in out and "skipped 1 shadowed file(s)" in out
+
+
+def test_round_robin_interleaves_groups() -> None:
+    items = [("a", 1), ("a", 2), ("a", 3), ("b", 10), ("c", 20), ("c", 21)]
+    assert list(round_robin(items)) == [1, 10, 20, 2, 21, 3]
+
+
+def test_engine_reports_failures_without_aborting() -> None:
+    messages = []
+    engine = TransferEngine(workers=1, progress_every=2, progress_seconds=3600, report=messages.append)
+
+    def _work(n: int) -> int:
+        if n == 3:
+            raise OSError("disk full")
+        return n * 2
+
+    summary = engine.run((("g", n) for n in range(6)), _work)
+    assert sorted(o.result for o in summary.succeeded) == [0, 2, 4, 8, 10]
+    assert [o.item for o in summary.failed] == [3]
+    assert messages and all(m.startswith("[transfer]") for m in messages)
+
+
+def test_pull_cursor_skips_ingested_files_and_reconciles(tmp_path: Path, capsys) -> None:
+    cfg = _bridge(tmp_path)
+    first = _peer_file(cfg, "high_command_ai_0", "reports/a.json", '{"a": 1}')
+    _peer_file(cfg, "high_command_ai_0", "reports/b.json", '{"b": 1}')
+    assert pull(cfg) == 2
+
+    # Locally consumed files are not re-pulled while the peer copy is unchanged.
+    inbox = cfg.repo_root / "exchange" / "reports" / "inbox"
+    (inbox / "a.json").unlink()
+    assert pull(cfg) == 0
+    assert not (inbox / "a.json").exists()
+
+    first.write_text('{"a": 2}', encoding="utf-8")
+    assert pull(cfg) == 1
+    assert (inbox / "a.json").read_text(encoding="utf-8") == '{"a": 2}'
+    assert pull(cfg, full=True) == 2
+
+    first.unlink()
+    capsys.readouterr()
+    assert reconcile(cfg) == {"high_command_ai_0": ["reports/a.json"]}
+    assert reconcile(cfg, prune=True) == {"high_command_ai_0": ["reports/a.json"]}
+    assert reconcile(cfg) == {}
+
+
+def test_cas_push_dedupes_and_pull_diffs_refs(tmp_path: Path) -> None:
+    alpha = _bridge(tmp_path, "alpha")
+    bravo = _bridge(tmp_path, "bravo")
+    sample = '{"order_id": "TF-EMOJI-DRYRUN-01"}'
+    _outbox_file(alpha, "telemetry/emoji_runtime/promoted_samples/TF-EMOJI-DRYRUN-01.json", sample)
+    _outbox_file(alpha, "reports/copy.json", sample)
+    _outbox_file(bravo, "reports/bravo.json", sample)
+
+    assert push(alpha, store="cas") == 1
+    assert push(bravo, store="cas") == 0
+    store = HubStore(alpha.hub)
+    assert len(list(store.objects_root.rglob("*"))) == 2  # one shard dir + one blob
+    assert not (alpha.hub / "alpha" / "outbox").exists()
+
+    charlie = _bridge(tmp_path, "charlie")
+    assert pull(charlie) == 3
+    samples = charlie.repo_root / "telemetry" / "emoji_runtime" / "promoted_samples"
+    assert (samples / "TF-EMOJI-DRYRUN-01.json").read_text(encoding="utf-8") == sample
+    assert pull(charlie) == 0
+
+    assert pull(charlie, move=True) == 3
+    assert store.load_refs("alpha") == {} and store.load_refs("bravo") == {}
+    assert gc(charlie, dry_run=True) == 1
+    assert gc(charlie) == 1
+    assert not [p for p in store.objects_root.rglob("*") if p.is_file()]
+
+
+def test_pull_skips_unsafe_ref_paths(tmp_path: Path, capsys) -> None:
+    alpha = _bridge(tmp_path, "alpha")
+    _outbox_file(alpha, "reports/ok.json", "{}")
+    push(alpha, store="cas")
+    store = HubStore(alpha.hub)
+    refs = store.load_refs("alpha")
+    entry = refs["reports/ok.json"]
+    for key in ("../escape.json", "reports/../../escape.json", "/tmp/escape.json", "C:/escape.json", "..\\escape.json"):
+        refs[key] = entry
+    refs["reports/bad-digest.json"] = {**entry, "sha256": "../../escape"}
+    store.save_refs("alpha", refs)
+
+    bravo = _bridge(tmp_path, "bravo")
+    assert pull(bravo) == 1
+    assert capsys.readouterr().out.count("[WARN] Skipping unsafe ref path from alpha") == 5
+    assert not list(tmp_path.glob("**/escape.json"))
+    assert (bravo.repo_root / "exchange" / "reports" / "inbox" / "ok.json").exists()
+
+
+def test_hub_store_put_retries_after_failed_copy(tmp_path: Path, monkeypatch) -> None:
+    from tools import hub_store
+
+    src = tmp_path / "payload.json"
+    src.write_text('{"order_id": "o"}', encoding="utf-8")
+    digest = hub_store.file_sha256(src)
+    store = HubStore(tmp_path / "hub")
+
+    def failing_copy(source: Path, destination: Path) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(hub_store, "atomic_copy", failing_copy)
+    with pytest.raises(OSError, match="disk full"):
+        store.put(src, digest)
+    monkeypatch.undo()
+
+    assert store.put(src, digest) is True
+    assert store.has(digest)
+    assert store.put(src, digest) is False
+
+
+def test_bundle_push_pull_and_resume(tmp_path: Path) -> None:
+    alpha = _bridge(tmp_path, "alpha")
+    for n in range(5):
+        _outbox_file(alpha, f"reports/r{n}.json", json.dumps({"report_id": n}))
+    assert push(alpha, bundle=True) == 5
+    assert push(alpha, bundle=True) == 0
+    changed = _outbox_file(alpha, "orders/pending/o.json", '{"order_id": "o"}')
+    assert push(alpha, bundle=True) == 1
+    bundles = sorted((alpha.hub / "alpha" / "bundles").glob("*.tfbundle.zip"))
+    assert len(bundles) == 2
+
+    bravo = _bridge(tmp_path, "bravo")
+    # Simulate an interrupted download of the first bundle.
+    partial = bravo.repo_root / ".toyfoundry" / "offline_bridge" / "incoming" / "alpha" / (bundles[0].name + ".part")
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(bundles[0].read_bytes()[:100])
+
+    assert pull(bravo) == 6
+    assert not partial.exists()
+    inbox = bravo.repo_root / "exchange" / "reports" / "inbox"
+    assert json.loads((inbox / "r3.json").read_text(encoding="utf-8")) == {"report_id": 3}
+    pending = bravo.repo_root / "exchange" / "orders" / "pending" / "o.json"
+    assert pending.read_text(encoding="utf-8") == changed.read_text(encoding="utf-8")
+    assert pull(bravo) == 0
+
+
+def test_bundles_are_pruned_once_every_peer_pulled_them(tmp_path: Path) -> None:
+    alpha, bravo, charlie = (_bridge(tmp_path, front) for front in ("alpha", "bravo", "charlie"))
+    _outbox_file(alpha, "reports/r.json", "{}")
+    push(alpha, bundle=True)
+    for peer in (bravo, charlie):
+        push(peer)  # publish a hub folder so alpha knows the peer exists
+    hub_bundles = alpha.hub / "alpha" / "bundles"
+    (bundle,) = hub_bundles.glob("*.tfbundle.zip")
+
+    assert pull(bravo) == 1
+    push(alpha, bundle=True)
+    assert bundle.exists()  # charlie has not pulled it yet
+
+    assert pull(charlie) == 1
+    push(alpha, bundle=True)
+    assert not list(hub_bundles.iterdir())
+
+    pull(bravo)
+    cursor = json.loads((bravo.repo_root / ".toyfoundry" / "offline_bridge" / "pull_cursors" / "alpha.json").read_text(encoding="utf-8"))
+    assert not [key for key in cursor["files"] if key.startswith(":bundle:")]
+
+
+def test_corrupt_bundle_does_not_abort_pull(tmp_path: Path, capsys) -> None:
+    from tools import bridge_bundle
+
+    alpha = _bridge(tmp_path, "alpha")
+    _outbox_file(alpha, "reports/a.json", "{}")
+    push(alpha, bundle=True)
+    _outbox_file(alpha, "reports/b.json", "{}")
+    push(alpha, bundle=True)
+    first = sorted((alpha.hub / "alpha" / "bundles").glob("*.tfbundle.zip"))[0]
+    first.write_bytes(b"not a zip archive")
+    bridge_bundle.write_checksum(first, bridge_bundle.file_sha256(first))
+
+    bravo = _bridge(tmp_path, "bravo")
+    assert pull(bravo) == 1
+    assert f"[WARN] Failed to pull bundle alpha:{first.name}" in capsys.readouterr().out
+    assert (bravo.repo_root / "exchange" / "reports" / "inbox" / "b.json").exists()
+
+
+def test_bundle_with_unsafe_member_path_is_rejected(tmp_path: Path, capsys) -> None:
+    from tools import bridge_bundle
+
+    alpha = _bridge(tmp_path, "alpha")
+    ok = _outbox_file(alpha, "reports/ok.json", "{}")
+    bundles = alpha.hub / "alpha" / "bundles"
+    bridge_bundle.build_bundle([("reports/ok.json", ok), ("../../escape.json", ok)], bundles / "alpha-0.tfbundle.zip")
+
+    bravo = _bridge(tmp_path, "bravo")
+    assert pull(bravo) == 0
+    assert "Unsafe member path '../../escape.json'" in capsys.readouterr().out
+    assert not list(tmp_path.glob("**/escape.json"))
+    assert not (bravo.repo_root / "exchange" / "reports" / "inbox" / "ok.json").exists()
+
+
+def test_bundle_push_resumes_staged_bundle(tmp_path: Path) -> None:
+    from tools import bridge_bundle
+
+    alpha = _bridge(tmp_path, "alpha")
+    src = _outbox_file(alpha, "reports/r.json", "{}")
+    staged = alpha.repo_root / ".toyfoundry" / "offline_bridge" / "outgoing" / "alpha" / "alpha-0.tfbundle.zip"
+    bridge_bundle.build_bundle([("reports/r.json", src)], staged)
+
+    assert push(alpha, bundle=True) == 0
+    assert not staged.exists()
+    assert (alpha.hub / "alpha" / "bundles" / staged.name).exists()
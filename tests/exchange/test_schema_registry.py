@@ -0,0 +1,88 @@
+"""Tests for the generated schema-registry validators."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import alfa_two_monitor
+from tools.schema_registry import REGISTRY, SCHEMAS, SchemaRegistry, UnknownSchemaError, get_validator
+
+STUB = {"batch_id": "b1", "ritual": "forge", "units_processed": 3, "status": "success", "duration_ms": 1200}
+
+
+def test_validators_are_cached_and_report_first_problem() -> None:
+    validator = get_validator("telemetry-stub@1.0")
+    assert validator is get_validator("telemetry-stub@1.0")
+    assert validator(STUB) is None
+    assert validator({k: v for k, v in STUB.items() if k != "ritual"}) == "telemetry_stub missing 'ritual'"
+    assert validator({**STUB, "duration_ms": "1s"}) == "telemetry_stub field 'duration_ms' must be int, found str"
+    assert validator({**STUB, "units_processed": True}) == "telemetry_stub field 'units_processed' must be int, found bool"
+    assert validator({**STUB, "units_processed": -1}) == "telemetry_stub field 'units_processed' must be non-negative"
+    assert validator([]) == "telemetry_stub must be dict, found list"
+
+
+def test_ref_schemas_keep_nested_labels() -> None:
+    validator = get_validator("emoji-runtime@1.0")
+    payload = {"summary": "Forge", "intent": {}, "glyph_chain": ["a", 2], "telemetry_stub": STUB}
+    assert validator(payload) == "glyph_chain[1] must be str, found int"
+    payload = {**payload, "glyph_chain": ["a"], "telemetry_stub": {**STUB, "status": None}}
+    assert validator(payload) == "telemetry_stub field 'status' must be str, found NoneType"
+    assert validator({**payload, "summary": "  "}) == "emoji-runtime payload field 'summary' cannot be empty"
+
+
+def test_register_recompiles_dependants() -> None:
+    registry = SchemaRegistry(SCHEMAS)
+    before = registry.validator("factory-order@1.0")
+    registry.register("telemetry-stub@1.0", {"type": "object", "properties": {"status": {"enum": ["success"]}}})
+    after = registry.validator("factory-order@1.0")
+
+    assert after is not before
+    order = {"order_id": "o", "target": "t", "directives": [], "timestamp_issued": "now", "telemetry_stub": {"status": "failed"}}
+    assert "must be one of ['success']" in after(order)
+    assert "telemetry_stub" in registry.source("factory-order@1.0")
+    assert REGISTRY.validator("factory-order@1.0")({**order, "telemetry_stub": STUB}) is None
+    with pytest.raises(UnknownSchemaError):
+        registry.validator("nope@0")
+
+
+def test_min_length_not_blank_and_unhashable_enums() -> None:
+    registry = SchemaRegistry({
+        "name@1": {"type": "string", "minLength": 3},
+        "label@1": {"type": "string", "notBlank": True},
+        "shape@1": {"enum": [[1, 2], {"kind": "square"}, "circle"]},
+        "status@1": {"enum": ["on", "off"]},
+    })
+    assert registry.validator("name@1")("   ") is None
+    assert registry.validator("name@1")("ab") == "document must have at least 3 character(s)"
+    assert registry.validator("label@1")(" \t") == "document cannot be empty"
+    assert registry.validator("shape@1")([1, 2]) is None
+    assert registry.validator("shape@1")("circle") is None
+    assert "must be one of" in registry.validator("shape@1")([2, 1])
+    assert "must be one of" in registry.validator("status@1")(["on"])
+
+
+def test_monitor_rejects_invalid_emissions(tmp_path: Path) -> None:
+    order = {
+        "schema": "factory-order@1.0",
+        "order_id": "TF-1",
+        "target": "toyfoundry_ai_0",
+        "timestamp_issued": "2025-01-01T00:00:00Z",
+        "summary": "Forge",
+        "glyph_chain": ["a"],
+        "telemetry_stub": STUB,
+        "narration": {"line": None, "beats": None},
+    }
+    path = tmp_path / "order.json"
+    path.write_text(json.dumps(order), encoding="utf-8")
+    assert alfa_two_monitor.load_payload(path)["order_id"] == "TF-1"
+
+    path.write_text(json.dumps({**order, "telemetry_stub": {**STUB, "duration_ms": "slow"}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="telemetry_stub field 'duration_ms' must be int"):
+        alfa_two_monitor.load_payload(path)
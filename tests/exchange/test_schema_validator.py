@@ -0,0 +1,72 @@
+"""Tests for the compiled exchange schema validator."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import schema_validator
+from tools.hc_alfa import exchange as hc_exchange
+from tools.schema_validator import ValidationError, compile_validator, validate_paths, validate_payload
+
+ORDER = {
+    "schema": "high-command-order@1.0",
+    "order_id": "order-1",
+    "target": "toyfoundry_ai_0",
+    "directives": [{"action": "forge"}],
+    "timestamp_issued": "2025-01-01T00:00:00Z",
+}
+
+
+def _write(path: Path, payload) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_compiled_validator_is_cached_and_checks_types() -> None:
+    assert compile_validator("high-command-order@1.0") is compile_validator("high-command-order@1.0")
+    validate_payload(ORDER)
+
+    with pytest.raises(ValidationError, match=r"missing required keys \['target'\]"):
+        validate_payload({k: v for k, v in ORDER.items() if k != "target"})
+    with pytest.raises(ValidationError, match="document field 'directives' must be list, found str"):
+        validate_payload({**ORDER, "directives": "forge"})
+    with pytest.raises(ValidationError, match=r"directives\[0\] must be dict, found str"):
+        validate_payload({**ORDER, "directives": ["forge"]})
+    with pytest.raises(ValidationError, match="document field 'order_id' must be str, found int"):
+        validate_payload({**ORDER, "order_id": 7})
+    with pytest.raises(ValidationError, match="unknown schema"):
+        validate_payload({**ORDER, "schema": "nope@0"})
+
+
+@pytest.mark.parametrize("threshold", [10_000, 0])
+def test_validate_paths_expands_trees_in_order(tmp_path: Path, monkeypatch, threshold: int) -> None:
+    monkeypatch.setattr(schema_validator, "PARALLEL_THRESHOLD", threshold)
+    monkeypatch.setattr(schema_validator, "CHUNK_SIZE", 2)
+    for index in range(5):
+        _write(tmp_path / "orders" / f"o{index}.json", {**ORDER, "order_id": f"order-{index}"})
+    _write(tmp_path / "orders" / "nested" / "bad.json", {**ORDER, "directives": {}})
+    (tmp_path / "orders" / "broken.json").write_text("{", encoding="utf-8")
+
+    results = validate_paths([tmp_path / "orders"], workers=2)
+
+    assert [r.path.name for r in results] == ["broken.json", "bad.json", "o0.json", "o1.json", "o2.json", "o3.json", "o4.json"]
+    assert [r.ok for r in results] == [False, False, True, True, True, True, True]
+    assert "document field 'directives' must be list" in results[1].error
+
+
+def test_hc_alfa_exchange_validates_in_process(tmp_path: Path, capsys) -> None:
+    good = _write(tmp_path / "good.json", ORDER)
+    bad = _write(tmp_path / "bad.json", {"schema": "signal-ack@1.0"})
+
+    assert hc_exchange.run_validator([good, bad]) == 1
+    captured = capsys.readouterr()
+    assert f"Validation passed: {good}" in captured.out
+    assert "missing required keys" in captured.err
@@ -0,0 +1,211 @@
+"""Tests for the shared exchange sync pipeline."""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import exchange_all, sync_engine
+from tools.offline_sync_exchange import sync_local
+from tools.sync_engine import SyncItem, SyncPipeline, iter_tree, require_json_fields, resolve_hub, write_item
+
+
+def _write(path: Path, payload) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(payload if isinstance(payload, str) else json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_resolve_hub_precedence(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("SHAGI_EXCHANGE_PATH", raising=False)
+    assert resolve_hub(tmp_path, default=None) is None
+    _write(tmp_path / "exchange" / "config.json", {"hub_path": "legacy", "upstream_root": "upstream"})
+    assert resolve_hub(tmp_path) == Path("upstream")
+    assert resolve_hub(tmp_path, config_keys=("hub_path",)) == Path("legacy")
+    assert resolve_hub(tmp_path, default=None, config_keys=()) is None
+    monkeypatch.setenv("SHAGI_EXCHANGE_PATH", str(tmp_path / "env_hub"))
+    assert resolve_hub(tmp_path) == tmp_path / "env_hub"
+
+
+def test_pipeline_reads_each_file_once(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "src"
+    _write(src / "a.json", {"id": "a"})
+    _write(src / "b.json", {"id": "b"})
+    reads = []
+    original = Path.read_bytes
+
+    def _counting_read(self: Path) -> bytes:
+        reads.append(self.name)
+        return original(self)
+
+    monkeypatch.setattr(Path, "read_bytes", _counting_read)
+    report = SyncPipeline(
+        discover=lambda: iter_tree(src, "*.json", kind="orders"),
+        validators=[require_json_fields({"orders": ["id"]})],
+        transfer=lambda item: write_item(item, tmp_path / "dst" / item.rel),
+        workers=2,
+        report=lambda _: None,
+    ).run()
+
+    assert report.ok
+    assert sorted(item.rel for item in report.transferred) == ["a.json", "b.json"]
+    assert sorted(reads) == ["a.json", "b.json"]
+    assert json.loads((tmp_path / "dst" / "b.json").read_text(encoding="utf-8")) == {"id": "b"}
+
+
+def test_all_or_nothing_blocks_transfer_and_post_stage_errors_are_reported(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    _write(src / "good.json", {"id": "good"})
+    _write(src / "bad.json", "{not json")
+    messages = []
+
+    def _broken(_report) -> None:
+        raise RuntimeError("boom")
+
+    report = SyncPipeline(
+        discover=lambda: iter_tree(src, "*.json", kind="orders"),
+        validators=[require_json_fields({"orders": ["id"]})],
+        transfer=lambda item: write_item(item, tmp_path / "dst" / item.rel),
+        post=[("ledger", _broken)],
+        all_or_nothing=True,
+        report=messages.append,
+    ).run()
+
+    assert [item.rel for item in report.invalid] == ["bad.json"]
+    assert report.invalid[0].errors == ["invalid_json"]
+    assert report.transferred == []
+    assert not (tmp_path / "dst").exists()
+    assert isinstance(report.results["ledger"], RuntimeError)
+    assert messages == ["[WARN] ledger stage failed: boom"]
+
+
+def test_iter_tree_walks_lazily_in_sorted_order(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "src"
+    for rel in ("b.json", "a/z.json", "a.json", "a/y.txt", "c/.x.json.tmp"):
+        _write(src / rel, {})
+    (src / "c" / ".x.json.tmp").rename(src / "c" / f"x.json{sync_engine.TEMP_SUFFIX}")
+    listed = []
+    original = sync_engine.os.scandir
+
+    def _tracking_scandir(path):
+        listed.append(Path(path).name)
+        return original(path)
+
+    monkeypatch.setattr(sync_engine.os, "scandir", _tracking_scandir)
+    walk = iter_tree(src)
+    assert next(walk).rel == "a/y.txt"
+    assert listed == ["src", "a"]
+    assert [item.rel for item in walk] == ["a/z.json", "a.json", "b.json"]
+    assert [item.rel for item in iter_tree(src, "*.json")] == ["a.json", "b.json"]
+    assert [item.rel for item in iter_tree(src, "**/*.json")] == ["a/z.json", "a.json", "b.json"]
+    assert list(iter_tree(tmp_path / "missing")) == []
+
+
+def test_pipeline_releases_bytes_and_rejects_files_changed_after_validation(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    _write(src / "a.json", {"id": "a"})
+    _write(src / "b.json", {"id": "b"})
+
+    def _validate(item: SyncItem):
+        if item.rel == "b.json":
+            _write(item.source, {"id": "b", "extra": "changed"})
+        return require_json_fields({"orders": ["id"]})(item)
+
+    report = SyncPipeline(
+        discover=lambda: iter_tree(src, "*.json", kind="orders"),
+        validators=[_validate],
+        transfer=lambda item: write_item(item, tmp_path / "dst" / item.rel),
+        all_or_nothing=True,
+        workers=1,
+        report=lambda _: None,
+    ).run()
+
+    assert [item.rel for item in report.transferred] == ["a.json"]
+    assert [item.rel for item in report.failed] == ["b.json"]
+    assert "changed after validation" in report.failed[0].errors[0]
+    assert not any(item.loaded for item in report.items)
+    assert json.loads((tmp_path / "dst" / "a.json").read_text(encoding="utf-8")) == {"id": "a"}
+
+
+def test_discovery_thread_stops_when_consumer_aborts(tmp_path: Path) -> None:
+    produced = []
+    finished = threading.Event()
+
+    def _discover():
+        try:
+            for index in range(1000):
+                produced.append(index)
+                yield SyncItem(source=tmp_path / f"{index}.json", rel=f"{index}.json")
+        finally:
+            finished.set()
+
+    def _abort(item: SyncItem, _result) -> None:
+        raise RuntimeError("consumer aborted")
+
+    pipeline = SyncPipeline(
+        discover=_discover,
+        transfer=lambda item: None,
+        on_transferred=_abort,
+        workers=1,
+        queue_size=2,
+        report=lambda _: None,
+    )
+    with pytest.raises(RuntimeError, match="consumer aborted"):
+        pipeline.run()
+    assert finished.wait(5)
+    assert len(produced) < 1000
+
+
+def test_discovery_errors_surface(tmp_path: Path) -> None:
+    def _discover():
+        yield SyncItem(source=tmp_path / "missing.json", rel="missing.json")
+        raise OSError("share went away")
+
+    with pytest.raises(OSError, match="share went away"):
+        SyncPipeline(discover=_discover, report=lambda _: None).run()
+
+
+def test_exchange_all_validates_then_copies(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(exchange_all, "ROOT", tmp_path)
+    monkeypatch.setattr(exchange_all, "LOGS", tmp_path / "logs")
+    monkeypatch.setenv("SHAGI_EXCHANGE_PATH", str(tmp_path / "hub"))
+    order = {"id": "o1", "workspace": "w", "title": "t", "status": "s", "created_at": "c", "attachments": []}
+    _write(tmp_path / "outbox" / "orders" / "o1.json", order)
+    _write(tmp_path / "outbox" / "acks" / "a1.json", {"order_id": "o1"})
+
+    with pytest.raises(SystemExit) as exc:
+        exchange_all.main()
+    assert exc.value.code == 1
+    summary = json.loads((tmp_path / "logs" / "exchange_all.json").read_text(encoding="utf-8"))
+    assert summary["validation_errors"] == [
+        {"kind": "acks", "file": "a1.json", "missing": ["ack_id", "workspace", "ack_timestamp", "notes"]}
+    ]
+    assert not (tmp_path / "hub").exists()
+
+    (tmp_path / "outbox" / "acks" / "a1.json").unlink()
+    with pytest.raises(SystemExit) as exc:
+        exchange_all.main()
+    assert exc.value.code == 0
+    summary = json.loads((tmp_path / "logs" / "exchange_all.json").read_text(encoding="utf-8"))
+    assert summary["copied"] == {"orders": ["o1.json"], "reports": [], "acks": []}
+    assert (tmp_path / "hub" / "exchange" / "orders" / "dispatched" / "o1.json").is_file()
+
+
+def test_offline_sync_copies_outbox_tree(tmp_path: Path, monkeypatch, capsys) -> None:
+    monkeypatch.setenv("SHAGI_EXCHANGE_PATH", str(tmp_path / "hub"))
+    ws = tmp_path / "ws"
+    _write(ws / "outbox" / "orders" / "nested" / "o1.json", {"id": "o1"})
+
+    sync_local(str(ws))
+
+    assert (tmp_path / "hub" / "orders" / "nested" / "o1.json").is_file()
+    out = capsys.readouterr().out
+    assert "[OK] Synced 1 orders file(s)" in out
+    assert "[WARN] No reports folder found" in out
@@ -1,4 +1,9 @@
-"""Emit factory orders for Toyfoundry Alfa Two translator payloads."""
+"""Emit factory orders for Toyfoundry Alfa Two translator payloads.
+
+Payloads are promoted as one batch through ``tools.factory_order_batch``:
+all are validated before any order is written, and the run ends with an
+emission manifest listing every order and its SHA-256.
+"""
 from __future__ import annotations
 
 import argparse
@@ -8,24 +13,14 @@ from pathlib import Path
 from typing import Iterable, List
 
 try:
-    from tools.factory_order_emitter import (
-        PayloadValidationError,
-        build_factory_order,
-        load_translator_payload,
-        write_factory_order,
-    )
+    from tools.factory_order_batch import EmissionSettings, emit_batch
 except ModuleNotFoundError:  # pragma: no cover - script execution fallback
     import sys
 
     REPO_ROOT = Path(__file__).resolve().parents[1]
     if str(REPO_ROOT) not in sys.path:
         sys.path.insert(0, str(REPO_ROOT))
-    from tools.factory_order_emitter import (
-    PayloadValidationError,
-    build_factory_order,
-    load_translator_payload,
-    write_factory_order,
-    )
+    from tools.factory_order_batch import EmissionSettings, emit_batch
 
 DEFAULT_INPUT_DIR = Path("tests/alfa_two")
 DEFAULT_OUTPUT_DIR = Path("exchange/orders/outbox/emoji_runtime")
@@ -90,6 +85,17 @@ def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
         "--summary-override",
         help="Override the lore-facing summary (must align with narrator output).",
     )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Emission manifest path (defaults to .toyfoundry/telemetry/alfa_two/emissions/<run-id>.json).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker count for validation processes and write threads (default: based on CPU count).",
+    )
     return parser.parse_args(argv)
 
 
@@ -112,40 +118,37 @@ def _discover_payloads(payloads: Iterable[Path], input_dir: Path) -> List[Path]:
 
 
 def emit_orders(args: argparse.Namespace) -> int:
-    run_id = args.run_id or _default_run_id()
-    timestamp = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-    output_dir = args.output_dir
-    output_dir.mkdir(parents=True, exist_ok=True)
-
+    settings = EmissionSettings(
+        run_id=args.run_id or _default_run_id(),
+        issued_by=args.issued_by,
+        target=args.target,
+        priority=args.priority,
+        summary_override=args.summary_override,
+        narrator=args.narrator,
+    )
     payload_paths = _discover_payloads(args.payloads, args.input_dir)
 
-    for index, payload_path in enumerate(payload_paths, start=1):
-        try:
-            translator = load_translator_payload(payload_path)
-            order_id = f"{run_id}-{index:02d}"
-            payload = build_factory_order(
-                translator,
-                order_id=order_id,
-                issued_by=args.issued_by,
-                target=args.target,
-                priority=args.priority,
-                timestamp_issued=timestamp,
-                summary_override=args.summary_override,
-                narrator=args.narrator,
-                extra_fields=None,
-            )
-
-            destination = output_dir / f"{order_id}.json"
-            if args.dry_run:
-                print(json.dumps(payload, indent=2))
-                print(f"[dry-run] {payload_path} -> {order_id}")
-            else:
-                write_factory_order(payload, destination)
-                print(f"Emitted {destination}")
-        except PayloadValidationError as exc:
-            print(f"Emission aborted for {payload_path}: {exc}")
-            return 1
+    result = emit_batch(
+        payload_paths,
+        settings,
+        args.output_dir,
+        manifest_path=args.manifest,
+        dry_run=args.dry_run,
+        workers=args.workers,
+    )
+    if not result.ok:
+        for payload_path, problem in result.failures:
+            print(f"Emission aborted for {payload_path}: {problem}")
+        return 1
 
+    for order in result.orders:
+        if args.dry_run:
+            print(order.data.decode("utf-8"), end="")
+            print(f"[dry-run] {order.source} -> {order.order_id}")
+        else:
+            print(f"Emitted {order.destination}")
+    if result.manifest_path is not None:
+        print(f"[OK] Emission manifest written to {result.manifest_path} ({len(result.orders)} order(s))")
     return 0
 
 
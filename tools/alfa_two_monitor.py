@@ -1,21 +1,59 @@
-"""Monitoring hooks for Toyfoundry Alfa Two factory-order emissions."""
+"""Monitoring hooks for Toyfoundry Alfa Two factory-order emissions.
+
+Narrator metrics and glyph/VO discrepancies are append-only logs: one JSON
+object per line in ``narrator_metrics.jsonl`` and one line per mismatch in
+``glyph_vo_discrepancies.log``, written through buffered ``AppendLog``
+handles. ``--export-metrics`` compacts the JSONL log into the legacy
+``narrator_metrics.json`` array on demand.
+
+Processed orders are tracked in ``<telemetry-dir>/_processed.jsonl``, an
+append-only log of ``(name, size, mtime_ns, order_id)`` fingerprints. A poll
+lists the orders directory with ``os.scandir`` and only opens files whose
+fingerprint is new or has changed.
+
+Those files are parsed, schema-checked and canonically hashed by a bounded
+process pool once the backlog reaches ``PARALLEL_THRESHOLD`` (inline below
+that). Results are consumed in file-name order by the calling thread, which
+is the only writer to the snapshot, metrics and discrepancy sinks.
+"""
 from __future__ import annotations
 
 import argparse
 import hashlib
 import json
+import os
+import textwrap
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Mapping, MutableSet, Sequence
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, MutableSet, Optional, Sequence, Tuple
+
+try:
+    from tools.schema_registry import get_validator
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    import sys
+
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools.schema_registry import get_validator
 
 FACTORY_SCHEMA = "factory-order@1.0"
+# Registry shape of factory-order@1.0 documents as the emitter and promoter write them.
+EMISSION_SCHEMA = "factory-order-emission@1.0"
 DEFAULT_ORDERS_DIR = Path("exchange/orders/outbox/emoji_runtime")
 DEFAULT_TELEMETRY_DIR = Path("telemetry/alfa_two/live")
-STATE_FILENAME = "_processed.json"
-NARRATOR_METRICS_PATH = Path("monitoring/logs/narrator_metrics.json")
+STATE_FILENAME = "_processed.json"  # legacy rewritten list, migrated into STATE_LOG_FILENAME
+STATE_LOG_FILENAME = "_processed.jsonl"
+NARRATOR_METRICS_PATH = Path("monitoring/logs/narrator_metrics.jsonl")
+LEGACY_NARRATOR_METRICS_PATH = Path("monitoring/logs/narrator_metrics.json")
 GLYPH_LOG_PATH = Path("monitoring/logs/glyph_vo_discrepancies.log")
+FLUSH_EVERY = 64
+PARALLEL_THRESHOLD = 64
+CHUNK_SIZE = 32
 
 
 @dataclass
@@ -26,6 +64,7 @@ class MonitoringConfig:
     glyph_log: Path
     once: bool
     interval: float
+    workers: int = 0  # 0 = os.cpu_count()
 
 
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
@@ -53,6 +92,20 @@ def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Process available orders one time and exit.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Parse/hash worker processes for large backlogs (default: CPU count; 1 disables the pool).",
+    )
+    parser.add_argument(
+        "--export-metrics",
+        type=Path,
+        nargs="?",
+        const=LEGACY_NARRATOR_METRICS_PATH,
+        metavar="PATH",
+        help=f"Compact the narrator metrics log into a JSON array (default {LEGACY_NARRATOR_METRICS_PATH}) and exit.",
+    )
     return parser.parse_args(argv)
 
 
@@ -69,18 +122,13 @@ def load_state(state_path: Path) -> MutableSet[str]:
     return {item for item in processed if isinstance(item, str)}
 
 
-def save_state(state_path: Path, order_ids: Sequence[str]) -> None:
-    payload = {
-        "order_ids": list(order_ids),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-    state_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
-
-
 def load_payload(path: Path) -> Mapping[str, object]:
     data = json.loads(path.read_text(encoding="utf-8"))
     if data.get("schema") != FACTORY_SCHEMA:
         raise ValueError(f"Unsupported schema in {path}: {data.get('schema')}")
+    problem = get_validator(EMISSION_SCHEMA)(data)
+    if problem is not None:
+        raise ValueError(f"Invalid factory-order in {path}: {problem}")
     return data
 
 
@@ -108,7 +156,226 @@ def write_telemetry_snapshot(telemetry_dir: Path, order_id: str, data: Mapping[s
     destination.write_text(json.dumps(snapshot, indent=2) + "\n", encoding="utf-8")
 
 
-def append_narrator_metrics(path: Path, order_id: str, data: Mapping[str, object], checksum: str) -> None:
+class AppendLog:
+    """Buffered append-only writer for one log file.
+
+    Lines go through a block-buffered handle opened in append mode and are
+    flushed every ``flush_every`` lines and on ``close``, so each entry costs
+    O(1) regardless of how large the log has grown.
+    """
+
+    def __init__(self, path: Path, *, flush_every: int = FLUSH_EVERY) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._handle: Optional[IO[str]] = None
+        self._pending = 0
+
+    def write_line(self, line: str) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+            if self._torn_tail():
+                # Never glue a new entry onto a line left half-written by a crash.
+                self._handle.write("\n")
+        self._handle.write(line if line.endswith("\n") else line + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def _torn_tail(self) -> bool:
+        try:
+            with self.path.open("rb") as handle:
+                handle.seek(-1, os.SEEK_END)
+                return handle.read(1) != b"\n"
+        except OSError:  # empty or missing file
+            return False
+
+    def write_json(self, entry: Mapping[str, Any]) -> None:
+        self.write_line(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._pending = 0
+
+    def __enter__(self) -> "AppendLog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_jsonl(path: Path) -> Iterator[Mapping[str, Any]]:
+    """Yield objects from a JSONL log (metrics or processed state), skipping torn or malformed lines."""
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict):
+                yield entry
+
+
+def migrate_legacy_metrics(log_path: Path, legacy_path: Path) -> int:
+    """Seed a missing JSONL log from an existing legacy JSON array (one-time)."""
+    if log_path.exists() or not legacy_path.exists():
+        return 0
+    try:
+        existing = json.loads(legacy_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return 0
+    entries = [entry for entry in existing if isinstance(entry, dict)] if isinstance(existing, list) else []
+    with AppendLog(log_path) as log:
+        for entry in entries:
+            log.write_json(entry)
+    log_path.touch(exist_ok=True)
+    return len(entries)
+
+
+def export_metrics(log_path: Path, destination: Path) -> int:
+    """Stream the JSONL log into ``destination`` as the legacy indented JSON array.
+
+    Output is byte-identical to ``json.dumps(entries, indent=2) + "\\n"`` and
+    is written to a temp file and renamed into place.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    count = 0
+    try:
+        with tmp.open("w", encoding="utf-8") as handle:
+            for entry in iter_jsonl(log_path):
+                handle.write("[\n" if count == 0 else ",\n")
+                handle.write(textwrap.indent(json.dumps(entry, indent=2), "  "))
+                count += 1
+            handle.write("\n]\n" if count else "[]\n")
+        os.replace(tmp, destination)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return count
+
+
+Fingerprint = Tuple[int, int]  # (size, mtime_ns)
+
+
+class ProcessedIndex:
+    """Which order files the monitor has handled, keyed by file fingerprint.
+
+    Loaded once from the append-only state log (seeded from the legacy
+    ``_processed.json`` list on first use) and extended one line per file.
+    Files rejected by ``load_payload`` are remembered for the life of the
+    index only, so they are reported once per change instead of every poll.
+    """
+
+    def __init__(self, log_path: Path) -> None:
+        self.log_path = log_path
+        self.fingerprints: Dict[str, Fingerprint] = {}
+        self.order_ids: MutableSet[str] = set()
+        self._rejected: Dict[str, Fingerprint] = {}
+        self._log = AppendLog(log_path)
+
+    @classmethod
+    def load(cls, telemetry_dir: Path) -> "ProcessedIndex":
+        index = cls(telemetry_dir / STATE_LOG_FILENAME)
+        if not index.log_path.exists():
+            for order_id in sorted(load_state(telemetry_dir / STATE_FILENAME)):
+                index.record(None, None, order_id)
+            index.flush()
+        for entry in iter_jsonl(index.log_path):
+            order_id = entry.get("order_id")
+            if isinstance(order_id, str):
+                index.order_ids.add(order_id)
+            name = entry.get("name")
+            if isinstance(name, str):
+                index.fingerprints[name] = (entry.get("size"), entry.get("mtime_ns"))
+        return index
+
+    def is_current(self, name: str, fingerprint: Fingerprint) -> bool:
+        return self.fingerprints.get(name) == fingerprint or self._rejected.get(name) == fingerprint
+
+    def record(self, name: Optional[str], fingerprint: Optional[Fingerprint], order_id: str) -> None:
+        self.order_ids.add(order_id)
+        entry: Dict[str, Any] = {"order_id": order_id}
+        if name is not None and fingerprint is not None:
+            self.fingerprints[name] = fingerprint
+            entry.update(name=name, size=fingerprint[0], mtime_ns=fingerprint[1])
+        self._log.write_json(entry)
+
+    def reject(self, name: str, fingerprint: Fingerprint) -> None:
+        self._rejected[name] = fingerprint
+
+    def flush(self) -> None:
+        self._log.flush()
+
+    def close(self) -> None:
+        self._log.close()
+
+
+def scan_orders(orders_dir: Path) -> List[Tuple[str, Fingerprint]]:
+    """``(name, (size, mtime_ns))`` for every ``*.json`` order file, sorted by name, without opening any."""
+    found: List[Tuple[str, Fingerprint]] = []
+    with os.scandir(orders_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            st = entry.stat()
+            found.append((entry.name, (st.st_size, st.st_mtime_ns)))
+    found.sort()
+    return found
+
+
+# (file name, payload, checksum, rejection message)
+Prepared = Tuple[str, Optional[Mapping[str, object]], Optional[str], Optional[str]]
+
+
+def _prepare_chunk(orders_dir: Path, names: Sequence[str]) -> List[Prepared]:
+    prepared: List[Prepared] = []
+    for name in names:
+        try:
+            payload = load_payload(orders_dir / name)
+        except (ValueError, OSError) as exc:
+            prepared.append((name, None, None, str(exc)))
+            continue
+        prepared.append((name, payload, hash_payload(payload), None))
+    return prepared
+
+
+def iter_prepared(orders_dir: Path, names: Sequence[str], *, workers: int = 0) -> Iterator[Prepared]:
+    """Parse, validate and hash ``names`` in order, in a process pool for large backlogs.
+
+    At most ``2 * workers`` chunks are in flight, so results waiting for the
+    ordered writer stay bounded however large the backlog is.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(names) < PARALLEL_THRESHOLD or workers < 2:
+        yield from _prepare_chunk(orders_dir, names)
+        return
+    chunks = iter([names[i : i + CHUNK_SIZE] for i in range(0, len(names), CHUNK_SIZE)])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window: "deque[Future]" = deque()
+        for chunk in chunks:
+            window.append(pool.submit(_prepare_chunk, orders_dir, chunk))
+            if len(window) >= workers * 2:
+                break
+        while window:
+            yield from window.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                window.append(pool.submit(_prepare_chunk, orders_dir, chunk))
+
+
+def append_narrator_metrics(log: AppendLog, order_id: str, data: Mapping[str, object], checksum: str) -> None:
     metrics_entry = {
         "order_id": order_id,
         "checksum_sha256": checksum,
@@ -119,74 +386,86 @@ def append_narrator_metrics(path: Path, order_id: str, data: Mapping[str, object
         "telemetry_status": (data.get("telemetry_stub") or {}).get("status"),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
-    if path.exists():
-        try:
-            existing = json.loads(path.read_text(encoding="utf-8"))
-            if not isinstance(existing, list):
-                existing = []
-        except json.JSONDecodeError:
-            existing = []
-    else:
-        existing = []
-    existing.append(metrics_entry)
-    path.write_text(json.dumps(existing, indent=2) + "\n", encoding="utf-8")
-
-
-def log_discrepancies(path: Path, order_id: str, data: Mapping[str, object]) -> None:
+    log.write_json(metrics_entry)
+
+
+def log_discrepancies(log: AppendLog, order_id: str, data: Mapping[str, object]) -> None:
     narration = data.get("narration") or {}
     summary = data.get("summary")
     line = narration.get("line") if isinstance(narration, Mapping) else None
     if line != summary:
-        message = (
+        log.write_line(
             f"[{datetime.now(timezone.utc).isoformat()}] order_id={order_id} "
-            f"summary/narration mismatch: summary={summary!r} narration_line={line!r}\n"
+            f"summary/narration mismatch: summary={summary!r} narration_line={line!r}"
         )
-        path.write_text((path.read_text(encoding="utf-8") if path.exists() else "") + message, encoding="utf-8")
 
 
-def process_orders(config: MonitoringConfig) -> bool:
+def process_orders(config: MonitoringConfig, index: Optional[ProcessedIndex] = None) -> bool:
+    """Handle new or changed order files; pass a long-lived ``index`` when polling."""
     ensure_dirs(config.telemetry_dir, config.narrator_metrics.parent, config.glyph_log.parent)
     config.glyph_log.touch(exist_ok=True)
-    state_path = config.telemetry_dir / STATE_FILENAME
-    processed = load_state(state_path)
+    migrate_legacy_metrics(config.narrator_metrics, config.narrator_metrics.with_suffix(".json"))
+    owned = index is None
+    if index is None:
+        index = ProcessedIndex.load(config.telemetry_dir)
     updated = False
 
-    order_files = sorted(config.orders_dir.glob("*.json"))
-    for order_path in order_files:
-        try:
-            payload = load_payload(order_path)
-        except ValueError as exc:
-            print(f"Skipping {order_path}: {exc}")
-            continue
-        order_id = str(payload.get("order_id"))
-        if not order_id or order_id in processed:
-            continue
-
-        checksum = hash_payload(payload)
-        write_telemetry_snapshot(config.telemetry_dir, order_id, payload, checksum)
-        append_narrator_metrics(config.narrator_metrics, order_id, payload, checksum)
-        log_discrepancies(config.glyph_log, order_id, payload)
-        processed.add(order_id)
-        updated = True
-        print(f"Processed {order_id}")
-
-    if updated:
-        save_state(state_path, sorted(processed))
+    try:
+        pending = {
+            name: fingerprint
+            for name, fingerprint in scan_orders(config.orders_dir)
+            if not index.is_current(name, fingerprint)
+        }
+        prepared = iter_prepared(config.orders_dir, list(pending), workers=config.workers)
+        with AppendLog(config.narrator_metrics) as metrics_log, AppendLog(config.glyph_log) as glyph_log:
+            for name, payload, checksum, problem in prepared:
+                fingerprint = pending[name]
+                if payload is None:
+                    print(f"Skipping {config.orders_dir / name}: {problem}")
+                    index.reject(name, fingerprint)
+                    continue
+                order_id = str(payload.get("order_id"))
+                if order_id in index.order_ids:
+                    # Known order in a new or touched file: remember the file, don't re-emit.
+                    index.record(name, fingerprint, order_id)
+                    continue
+
+                write_telemetry_snapshot(config.telemetry_dir, order_id, payload, checksum)
+                append_narrator_metrics(metrics_log, order_id, payload, checksum)
+                log_discrepancies(glyph_log, order_id, payload)
+                index.record(name, fingerprint, order_id)
+                updated = True
+                print(f"Processed {order_id}")
+    finally:
+        if owned:
+            index.close()
+        else:
+            index.flush()
     return updated
 
 
 def run(config: MonitoringConfig) -> None:
-    if config.once:
-        process_orders(config)
-        return
+    index = ProcessedIndex.load(config.telemetry_dir)
+    try:
+        if config.once:
+            process_orders(config, index)
+            return
 
-    while True:
-        process_orders(config)
-        time.sleep(config.interval)
+        while True:
+            process_orders(config, index)
+            time.sleep(config.interval)
+    finally:
+        index.close()
 
 
 def main(argv: Iterable[str] | None = None) -> int:
     args = parse_args(argv)
+    if args.export_metrics is not None:
+        migrate_legacy_metrics(NARRATOR_METRICS_PATH, LEGACY_NARRATOR_METRICS_PATH)
+        count = export_metrics(NARRATOR_METRICS_PATH, args.export_metrics)
+        print(f"[OK] Exported {count} narrator metrics entries to {args.export_metrics}")
+        return 0
+
     config = MonitoringConfig(
         orders_dir=args.orders_dir,
         telemetry_dir=args.telemetry_dir,
@@ -194,6 +473,7 @@ def main(argv: Iterable[str] | None = None) -> int:
         glyph_log=GLYPH_LOG_PATH,
         once=args.once,
         interval=args.interval,
+        workers=args.workers,
     )
 
     if not config.orders_dir.exists():
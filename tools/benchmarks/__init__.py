@@ -0,0 +1,8 @@
+"""Micro-benchmarks for Toyfoundry exchange and production tooling."""
+
+__all__ = [
+    "bench_exchange_headers",
+    "bench_exchange_router",
+    "bench_factory_order_batch",
+    "bench_schema_registry",
+]
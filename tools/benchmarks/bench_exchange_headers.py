@@ -0,0 +1,87 @@
+"""Benchmark header-only scanning against full ``json.loads`` for large orders.
+
+Generates synthetic factory orders whose header fields sit in front of large
+``attachments`` / ``directives`` arrays and times reading ``order_id``,
+``target`` and ``summary`` with ``read_header_fields`` versus a full parse.
+
+Run:
+    python -m tools.benchmarks.bench_exchange_headers --orders 200 --items 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from tools.exchange_headers import read_header_fields
+
+HEADER_FIELDS = ("order_id", "target", "summary")
+
+
+def build_order(index: int, items: int) -> dict:
+    return {
+        "order_id": f"order-bench-{index:05d}",
+        "target": "toyfoundry_ai_0",
+        "summary": f"Benchmark order {index}",
+        "timestamp_issued": "2025-11-23T08:00:00Z",
+        "directives": [
+            {"action": f"step-{n}", "details": "Mint and parade the Alfa batch " * 2}
+            for n in range(items)
+        ],
+        "attachments": [
+            {"path": f"telemetry/bench/{index}/{n}.json", "sha256": "0" * 64}
+            for n in range(items)
+        ],
+    }
+
+
+def write_orders(root: Path, orders: int, items: int) -> List[Path]:
+    paths: List[Path] = []
+    for index in range(orders):
+        path = root / f"order-bench-{index:05d}.json"
+        path.write_text(json.dumps(build_order(index, items), indent=2), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _time(label: str, paths: List[Path], reader: Callable[[Path], dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            reader(path)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<14} {best * 1000:9.1f} ms  ({len(paths) / best:,.0f} docs/s)")
+    return best
+
+
+def run(orders: int, items: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_orders(Path(tmp), orders, items)
+        size = sum(path.stat().st_size for path in paths)
+        print(f"[bench] {orders} orders, {items} directives/attachments each, {size / 1e6:.1f} MB total")
+        full = _time(
+            "json.loads",
+            paths,
+            lambda path: {k: v for k, v in json.loads(path.read_text(encoding="utf-8")).items() if k in HEADER_FIELDS},
+            repeat,
+        )
+        header = _time("header-only", paths, lambda path: read_header_fields(path, HEADER_FIELDS), repeat)
+        print(f"[bench] speed-up: {full / header:.1f}x")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark exchange header extraction")
+    parser.add_argument("--orders", type=int, default=200, help="Number of synthetic orders to scan")
+    parser.add_argument("--items", type=int, default=5000, help="Directives and attachments per order")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    run(args.orders, args.items, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
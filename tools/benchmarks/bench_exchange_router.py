@@ -0,0 +1,99 @@
+"""Benchmark inbox routing: compiled ``ExchangeRouter`` versus the legacy loop.
+
+The legacy sorter ran string checks plus a linear ``fnmatch`` over every
+``router_rules.json`` entry for each inbox file. This times routing decisions
+only (no file moves) for synthetic inbox names against synthetic rules.
+
+Run:
+    python -m tools.benchmarks.bench_exchange_router --files 100000 --rules 500
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import random
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from tools.exchange_router import ExchangeRouter
+
+REPO_ROOT = Path("/bench")
+
+
+def build_rules(count: int) -> List[Dict[str, str]]:
+    rules: List[Dict[str, str]] = []
+    for index in range(count):
+        if index % 10 == 0:
+            glob = f"*-lane{index:03d}.log"
+        else:
+            glob = f"unit{index:03d}-*.json"
+        rules.append({"glob": glob, "dest": f"exchange/routed/{index:03d}"})
+    return rules
+
+
+def build_names(count: int, rule_count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    names: List[str] = []
+    for n in range(count):
+        roll = rng.random()
+        rule = rng.randrange(max(1, rule_count))
+        if roll < 0.1:
+            names.append(f"order-2025-11-{n % 30:02d}-{n:06d}-report.json")
+        elif roll < 0.2:
+            names.append(f"TF-EMOJI-DRYRUN-{n:06d}.json")
+        elif roll < 0.7:
+            names.append(f"unit{rule:03d}-{n:06d}.json")
+        elif roll < 0.8:
+            names.append(f"trace-{n:06d}-lane{rule - rule % 10:03d}.log")
+        else:
+            names.append(f"misc-{n:06d}.bin")
+    return names
+
+
+def legacy_route(repo_root: Path, name: str, rules: List[Dict[str, str]]) -> Optional[Path]:
+    low = name.lower()
+    if low.startswith("order-") and low.endswith("-report.json"):
+        return repo_root / "exchange" / "reports" / "inbox" / name
+    if low.startswith("order-") and low.endswith("-ack.json"):
+        return repo_root / "exchange" / "acknowledgements" / "logged" / name
+    if name.upper().startswith("TF-EMOJI-DRYRUN") and low.endswith(".json"):
+        return repo_root / "telemetry" / "emoji_runtime" / "promoted_samples" / name
+    for r in rules:
+        if fnmatch.fnmatch(name, r["glob"]):
+            return repo_root / Path(r["dest"]) / name
+    return None
+
+
+def run(files: int, rule_count: int) -> None:
+    rules = build_rules(rule_count)
+    names = build_names(files, rule_count)
+    print(f"[bench] routing {files:,} inbox names against {rule_count} rules")
+
+    start = time.perf_counter()
+    legacy = [legacy_route(REPO_ROOT, name, rules) for name in names]
+    legacy_s = time.perf_counter() - start
+    print(f"  legacy fnmatch   {legacy_s:8.2f} s  ({files / legacy_s:,.0f} names/s)")
+
+    start = time.perf_counter()
+    router = ExchangeRouter(REPO_ROOT, rules)
+    compiled = [router.route_inbox(name) for name in names]
+    compiled_s = time.perf_counter() - start
+    print(f"  compiled router  {compiled_s:8.2f} s  ({files / compiled_s:,.0f} names/s, incl. compile)")
+
+    if legacy != compiled:
+        raise SystemExit("[bench] routing mismatch between legacy and compiled router")
+    print(f"[bench] speed-up: {legacy_s / compiled_s:.1f}x, identical routing for all names")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled inbox routing")
+    parser.add_argument("--files", type=int, default=100_000, help="Number of inbox names to route")
+    parser.add_argument("--rules", type=int, default=500, help="Number of router_rules.json globs")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    run(args.files, args.rules)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Benchmark batch factory-order emission against the serial emit loop.
+
+The legacy ``alfa_two_emit`` loop ran ``load_translator_payload`` →
+``build_factory_order`` → ``write_factory_order`` once per payload. This
+writes ``--orders`` synthetic translator payloads to a temporary directory
+and times both paths end to end (read, validate, build, write; the batch
+path also writes its manifest). The batch engine targets 10K orders in a
+few seconds.
+
+Run:
+    python -m tools.benchmarks.bench_factory_order_batch --orders 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from tools.factory_order_batch import EmissionSettings, emit_batch
+from tools.factory_order_emitter import build_factory_order, load_translator_payload, write_factory_order
+
+SAMPLE = Path(__file__).resolve().parents[2] / "tests" / "alfa_two" / "sample_translator_payload.json"
+
+
+def build_payloads(directory: Path, count: int) -> List[Path]:
+    template = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for index in range(count):
+        payload = dict(template)
+        payload["telemetry_stub"] = {**template["telemetry_stub"], "batch_id": f"forge-craft-{index:06d}"}
+        path = directory / f"payload-{index:06d}.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def legacy_emit(paths: List[Path], output_dir: Path) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for index, path in enumerate(paths, start=1):
+        translator = load_translator_payload(path)
+        order_id = f"TF-BENCH-LEGACY-{index:02d}"
+        payload = build_factory_order(
+            translator,
+            order_id=order_id,
+            issued_by="toyfoundry_ai_0",
+            target="toyfoundry_ai_0",
+            priority="standard",
+            timestamp_issued="2025-10-29T00:00:00+00:00",
+            summary_override=None,
+            narrator=None,
+            extra_fields=None,
+        )
+        write_factory_order(payload, output_dir / f"{order_id}.json")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10_000, help="Number of translator payloads")
+    parser.add_argument("--workers", type=int, default=None, help="Batch engine worker count")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-emit-") as tmp:
+        root = Path(tmp)
+        paths = build_payloads(root / "payloads", args.orders)
+
+        start = time.perf_counter()
+        legacy_emit(paths, root / "legacy")
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = emit_batch(
+            paths,
+            EmissionSettings(run_id="TF-BENCH-BATCH"),
+            root / "batch",
+            manifest_path=root / "manifest.json",
+            workers=args.workers,
+            report=lambda _message: None,
+        )
+        batch = time.perf_counter() - start
+        if not result.ok:
+            print(f"batch emission failed: {result.failures[:3]}")
+            return 1
+
+    print(f"orders: {args.orders}")
+    print(f"legacy serial loop: {legacy:8.3f}s  {args.orders / legacy:>10,.0f} orders/s")
+    print(f"batch engine:       {batch:8.3f}s  {args.orders / batch:>10,.0f} orders/s  ({legacy / batch:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
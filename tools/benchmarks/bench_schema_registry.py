@@ -0,0 +1,89 @@
+"""Benchmark generated schema-registry validators.
+
+Times ``tools.schema_registry`` validators over synthetic, already-parsed
+documents (no file I/O) and compares the telemetry-stub check with the
+hand-written loop ``factory_order_emitter`` and ``emoji_runtime_promoter``
+each carried before the registry. The registry targets at least 100K
+documents/second for every schema.
+
+Run:
+    python -m tools.benchmarks.bench_schema_registry --documents 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Mapping
+
+from tools.schema_registry import get_validator
+
+TARGET_DOCS_PER_SECOND = 100_000
+
+
+def build_documents(count: int) -> Dict[str, List[Dict[str, Any]]]:
+    stubs = [
+        {"batch_id": f"batch-{n}", "ritual": "forge", "units_processed": n % 50, "status": "success", "duration_ms": 1200}
+        for n in range(count)
+    ]
+    return {
+        "telemetry-stub@1.0": stubs,
+        "factory-order-emission@1.0": [
+            {
+                "schema": "factory-order@1.0",
+                "order_id": f"TF-{n:06d}",
+                "target": "toyfoundry_ai_0",
+                "timestamp_issued": "2025-10-29T08:40:41+00:00",
+                "summary": "Forge crafts the ally to secure victory.",
+                "glyph_chain": ["a", "b", "c", "d"],
+                "intent": {"actor": "forge"},
+                "telemetry_stub": stubs[n],
+                "narration": {"line": "Forge crafts the ally to secure victory.", "beats": ["Forge"]},
+            }
+            for n in range(count)
+        ],
+        "signal-ack@1.0": [
+            {"ack_id": f"ack-{n}", "referenced_id": f"order-{n}", "sender": "a", "receiver": "b", "status": "ok"}
+            for n in range(count)
+        ],
+    }
+
+
+def legacy_telemetry_check(stub: Mapping[str, Any]) -> None:
+    required_fields = {"batch_id": str, "ritual": str, "units_processed": int, "status": str, "duration_ms": int}
+    for key, expected_type in required_fields.items():
+        if key not in stub:
+            raise ValueError(f"telemetry_stub missing '{key}'")
+        value = stub[key]
+        if not isinstance(value, expected_type):
+            raise ValueError(f"telemetry_stub field '{key}' must be {expected_type.__name__}")
+        if expected_type is int and value < 0:
+            raise ValueError(f"telemetry_stub field '{key}' must be non-negative")
+
+
+def time_validator(check: Callable[[Any], Any], documents: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for document in documents:
+        check(document)
+    return time.perf_counter() - start
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200_000, help="Documents per schema")
+    args = parser.parse_args(argv)
+
+    documents = build_documents(args.documents)
+    below_target = 0
+    for name, docs in documents.items():
+        elapsed = time_validator(get_validator(name), docs)
+        rate = len(docs) / elapsed if elapsed else float("inf")
+        flag = "" if rate >= TARGET_DOCS_PER_SECOND else "  [below target]"
+        below_target += rate < TARGET_DOCS_PER_SECOND
+        print(f"{name:<28} {len(docs):>8} docs  {elapsed:8.3f}s  {rate:>12,.0f} docs/s{flag}")
+    legacy = time_validator(legacy_telemetry_check, documents["telemetry-stub@1.0"])
+    print(f"{'legacy telemetry loop':<28} {args.documents:>8} docs  {legacy:8.3f}s  {args.documents / legacy:>12,.0f} docs/s")
+    return 1 if below_target else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+"""Bundle (packfile) transport for the offline exchange bridge.
+
+Copying thousands of small JSON files to a high-latency share is dominated by
+per-file round trips. A bundle packs an outbox delta into one compressed zip
+with an ``index.json`` (path, size, mtime_ns, sha256 per member) and is
+published with a ``<bundle>.sha256`` sidecar, written last, that marks it
+complete.
+
+Bundles move between the workspace and the hub with ``resumable_copy``: data
+is appended to a ``.part`` file, so an interrupted transfer continues from the
+bytes already written instead of starting over, and the result is verified
+against the sidecar digest before it is renamed into place.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tools.hub_store import file_sha256, is_safe_relpath
+from tools.transfer_engine import TEMP_SUFFIX
+
+BUNDLE_SUFFIX = ".tfbundle.zip"
+CHECKSUM_SUFFIX = ".sha256"
+PART_SUFFIX = ".part"
+INDEX_NAME = "index.json"
+COPY_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class BundleError(RuntimeError):
+    """Raised when a bundle fails verification or is malformed."""
+
+
+@dataclass
+class BundleMember:
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+def new_bundle_name(front: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{front}-{stamp}{BUNDLE_SUFFIX}"
+
+
+def checksum_path(bundle: Path) -> Path:
+    return bundle.with_name(bundle.name + CHECKSUM_SUFFIX)
+
+
+def write_checksum(bundle: Path, digest: str) -> None:
+    # Same "<sha256>  <name>" layout as tools/telemetry/generate_build_info.py
+    target = checksum_path(bundle)
+    tmp = target.with_name(f".{target.name}{TEMP_SUFFIX}")
+    tmp.write_text(f"{digest}  {bundle.name}\n", encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def read_checksum(bundle: Path) -> Optional[str]:
+    try:
+        text = checksum_path(bundle).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return text.split()[0].lower() if text else None
+
+
+def build_bundle(files: Sequence[Tuple[str, Path]], destination: Path) -> Tuple[str, List[BundleMember]]:
+    """Pack ``(rel_path, source)`` pairs into ``destination``; returns (sha256, index)."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    members: List[BundleMember] = []
+    tmp = destination.with_name(destination.name + TEMP_SUFFIX)
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for rel, source in files:
+            st = source.stat()
+            data = source.read_bytes()
+            archive.writestr(rel, data)
+            members.append(BundleMember(rel, st.st_size, st.st_mtime_ns, hashlib.sha256(data).hexdigest()))
+        index = {"version": 1, "files": [member.__dict__ for member in members]}
+        archive.writestr(INDEX_NAME, json.dumps(index, indent=2))
+    os.replace(tmp, destination)
+    digest = file_sha256(destination)
+    write_checksum(destination, digest)
+    return digest, members
+
+
+def read_index(bundle: Path) -> List[BundleMember]:
+    try:
+        with zipfile.ZipFile(bundle) as archive:
+            data = json.loads(archive.read(INDEX_NAME).decode("utf-8"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as exc:
+        raise BundleError(f"Unreadable bundle index in {bundle}: {exc}") from exc
+    return [BundleMember(**entry) for entry in data.get("files", [])]
+
+
+def iter_members(bundle: Path) -> Iterator[Tuple[BundleMember, bytes]]:
+    """Yield each indexed member with its bytes, verifying member digests.
+
+    A corrupt archive or index raises ``BundleError`` like a digest mismatch,
+    as does any member path that is absolute or climbs out with ``..``; paths
+    are checked for the whole index before the first member is yielded.
+    """
+    try:
+        with zipfile.ZipFile(bundle) as archive:
+            index = json.loads(archive.read(INDEX_NAME).decode("utf-8"))
+            members = [BundleMember(**entry) for entry in index.get("files", [])]
+            for member in members:
+                if not isinstance(member.path, str) or not is_safe_relpath(member.path):
+                    raise BundleError(f"Unsafe member path {member.path!r} in {bundle.name}")
+            for member in members:
+                data = archive.read(member.path)
+                if hashlib.sha256(data).hexdigest() != member.sha256:
+                    raise BundleError(f"Checksum mismatch for {member.path} in {bundle.name}")
+                yield member, data
+    except (KeyError, TypeError, ValueError, zipfile.BadZipFile, zlib.error) as exc:
+        raise BundleError(f"Malformed bundle {bundle.name}: {exc}") from exc
+
+
+def resumable_copy(src: Path, dst: Path, expected_sha256: str) -> int:
+    """Copy ``src`` to ``dst`` through ``dst.part``, resuming a previous partial copy.
+
+    Returns the number of bytes transferred in this call. The finished file is
+    verified against ``expected_sha256`` before being renamed to ``dst``.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    part = dst.with_name(dst.name + PART_SUFFIX)
+    total = src.stat().st_size
+    offset = part.stat().st_size if part.exists() else 0
+    if offset > total:
+        part.unlink()
+        offset = 0
+    copied = 0
+    with src.open("rb") as reader, part.open("ab") as writer:
+        reader.seek(offset)
+        while True:
+            block = reader.read(COPY_CHUNK_BYTES)
+            if not block:
+                break
+            writer.write(block)
+            copied += len(block)
+    if file_sha256(part) != expected_sha256:
+        part.unlink()
+        raise BundleError(f"Checksum mismatch copying {src.name}; partial copy discarded")
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    return copied
+
+
+def write_member(dst: Path, data: bytes, mtime_ns: int) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}{TEMP_SUFFIX}")
+    try:
+        tmp.write_bytes(data)
+        os.utime(tmp, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp, dst)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+__all__ = [
+    "BUNDLE_SUFFIX",
+    "BundleError",
+    "BundleMember",
+    "build_bundle",
+    "checksum_path",
+    "iter_members",
+    "new_bundle_name",
+    "read_checksum",
+    "read_index",
+    "resumable_copy",
+    "write_checksum",
+    "write_member",
+]
@@ -1,13 +1,21 @@
-"""Promote emoji-runtime@1.0 payloads into factory-order@1.0 documents."""
+"""Promote emoji-runtime@1.0 payloads into factory-order@1.0 documents.
+
+Pass a single payload file with ``--order-id`` or, for bulk promotion, a
+directory or glob with ``--run-id``: every payload is validated first,
+payloads with identical checksums are promoted once, and a summary index is
+written next to the orders.
+"""
 from __future__ import annotations
 
 import argparse
+import glob
 import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
 
 try:
     from tools.factory_order_emitter import (
@@ -16,6 +24,7 @@ try:
         build_factory_order,
         write_factory_order,
     )
+    from tools.schema_registry import validate as validate_schema
 except ModuleNotFoundError:  # pragma: no cover - script execution fallback
     import sys
 
@@ -28,9 +37,12 @@ except ModuleNotFoundError:  # pragma: no cover - script execution fallback
         build_factory_order,
         write_factory_order,
     )
+    from tools.schema_registry import validate as validate_schema
 
 EMOJI_RUNTIME_SCHEMA = "emoji-runtime@1.0"
 DEFAULT_OUTPUT_DIR = Path("exchange/orders/outbox/emoji_runtime_promoted")
+INDEX_SCHEMA = "emoji-runtime-promotion-index@1.0"
+GLOB_CHARS = "*?["
 
 
 class EmojiRuntimeValidationError(PayloadValidationError):
@@ -51,8 +63,9 @@ class EmojiRuntimePayload:
     template: str | None
     raw: Mapping[str, Any]
 
-    @property
+    @cached_property
     def checksum(self) -> str:
+        # Computed once per payload; ``raw`` is treated as immutable after loading.
         canonical = json.dumps(self.raw, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
@@ -84,29 +97,6 @@ def _validate_glyph_chain(payload: Mapping[str, Any]) -> Sequence[str]:
     return cleaned
 
 
-def _validate_telemetry_stub(payload: Mapping[str, Any]) -> Mapping[str, Any]:
-    telemetry = payload.get("telemetry_stub")
-    telemetry_map = _ensure_mapping(telemetry, "telemetry_stub")
-    required = {
-        "batch_id": str,
-        "ritual": str,
-        "units_processed": int,
-        "status": str,
-        "duration_ms": int,
-    }
-    for field, expected in required.items():
-        if field not in telemetry_map:
-            raise EmojiRuntimeValidationError(f"telemetry_stub missing '{field}'")
-        value = telemetry_map[field]
-        if not isinstance(value, expected):
-            raise EmojiRuntimeValidationError(
-                f"telemetry_stub field '{field}' must be {expected.__name__}, found {type(value).__name__}"
-            )
-        if expected is int and value < 0:
-            raise EmojiRuntimeValidationError(f"telemetry_stub field '{field}' must be non-negative")
-    return telemetry_map
-
-
 def _extract_narration(payload: Mapping[str, Any]) -> tuple[str | None, Sequence[str] | None]:
     narration = payload.get("narration")
     if narration is None:
@@ -134,13 +124,14 @@ def load_emoji_runtime_payload(path: Path) -> EmojiRuntimePayload:
             f"emoji-runtime payload schema must be '{EMOJI_RUNTIME_SCHEMA}', found '{raw_data.get('schema')}'"
         )
 
-    summary = raw_data.get("summary")
-    if not isinstance(summary, str) or not summary.strip():
-        raise EmojiRuntimeValidationError("emoji-runtime payload must include non-empty 'summary'")
-
+    # summary, intent and telemetry_stub (types, nested fields) per the shared registry schema
+    problem = validate_schema(EMOJI_RUNTIME_SCHEMA, raw_data)
+    if problem is not None:
+        raise EmojiRuntimeValidationError(problem)
+    summary = raw_data["summary"]
     glyph_chain = _validate_glyph_chain(raw_data)
-    intent = _ensure_mapping(raw_data.get("intent"), "intent")
-    telemetry = _validate_telemetry_stub(raw_data)
+    intent = raw_data["intent"]
+    telemetry = raw_data["telemetry_stub"]
     narration_line, narration_beats = _extract_narration(raw_data)
 
     timestamp = None
@@ -189,6 +180,7 @@ def build_factory_order_from_emoji(
     summary_override: str | None = None,
     narrator: str | None = None,
     extra_fields: Mapping[str, Any] | None = None,
+    generated_at: str | None = None,
 ) -> Dict[str, Any]:
     translator = TranslatorPayload(
         summary=payload.summary,
@@ -209,6 +201,7 @@ def build_factory_order_from_emoji(
         summary_override=summary_override,
         narrator=narrator,
         extra_fields=extra_fields,
+        generated_at=generated_at,
     )
 
     metadata = factory_order.setdefault("metadata", {})
@@ -227,18 +220,148 @@ def build_factory_order_from_emoji(
     return factory_order
 
 
+@dataclass
+class PromotionEntry:
+    """One payload in a bulk promotion run, as recorded in the summary index."""
+
+    source: Path
+    checksum: str
+    order_id: str | None = None
+    destination: Path | None = None
+    duplicate_of: str | None = None
+
+
+@dataclass
+class BulkPromotion:
+    entries: List[PromotionEntry] = field(default_factory=list)
+    failures: List[Tuple[Path, str]] = field(default_factory=list)
+    orders: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    index_path: Path | None = None
+
+    @property
+    def promoted(self) -> List[PromotionEntry]:
+        return [entry for entry in self.entries if entry.duplicate_of is None]
+
+
+def is_bulk_source(source: Path) -> bool:
+    return source.is_dir() or any(char in str(source) for char in GLOB_CHARS)
+
+
+def discover_emoji_payloads(source: Path) -> List[Path]:
+    """Payload files under a directory (``*.json``) or matching a glob pattern, sorted."""
+    if source.is_dir():
+        return sorted(path for path in source.glob("*.json") if path.is_file())
+    return sorted(Path(match) for match in glob.glob(str(source)) if Path(match).is_file())
+
+
+def promote_many(
+    paths: Sequence[Path],
+    *,
+    run_id: str,
+    output_dir: Path,
+    issued_by: str,
+    target: str,
+    priority: str,
+    timestamp_issued: str,
+    summary_override: str | None = None,
+    narrator: str | None = None,
+    extra_fields: Mapping[str, Any] | None = None,
+    index_path: Path | None = None,
+    dry_run: bool = False,
+) -> BulkPromotion:
+    """Promote every payload in ``paths``, once per distinct checksum.
+
+    All payloads are loaded and built before anything is written; if any is
+    rejected no orders or index are written. Order ids are
+    ``<run_id>-NN`` over the distinct payloads, in path order.
+    """
+    result = BulkPromotion()
+    first_by_checksum: Dict[str, PromotionEntry] = {}
+    generated_at = datetime.now(timezone.utc).isoformat()
+    for path in paths:
+        try:
+            payload = load_emoji_runtime_payload(path)
+        except (PayloadValidationError, json.JSONDecodeError, UnicodeDecodeError, OSError) as exc:
+            result.failures.append((path, str(exc)))
+            continue
+        entry = PromotionEntry(source=path, checksum=payload.checksum)
+        result.entries.append(entry)
+        original = first_by_checksum.get(payload.checksum)
+        if original is not None:
+            entry.duplicate_of = original.order_id
+            continue
+        first_by_checksum[payload.checksum] = entry
+        entry.order_id = f"{run_id}-{len(first_by_checksum):02d}"
+        entry.destination = output_dir / f"{entry.order_id}.json"
+        try:
+            result.orders[entry.order_id] = build_factory_order_from_emoji(
+                payload,
+                order_id=entry.order_id,
+                issued_by=issued_by,
+                target=target,
+                priority=priority,
+                timestamp_issued=timestamp_issued,
+                summary_override=summary_override,
+                narrator=narrator,
+                extra_fields=extra_fields,
+                generated_at=generated_at,
+            )
+        except PayloadValidationError as exc:
+            result.failures.append((path, str(exc)))
+
+    if result.failures or dry_run:
+        return result
+
+    for entry in result.promoted:
+        write_factory_order(result.orders[entry.order_id], entry.destination)
+    index_path = index_path or output_dir / f"_index-{run_id}.json"
+    index = {
+        "schema": INDEX_SCHEMA,
+        "run_id": run_id,
+        "generated_at": generated_at,
+        "timestamp_issued": timestamp_issued,
+        "payloads": len(result.entries),
+        "promoted": len(result.promoted),
+        "duplicates": len(result.entries) - len(result.promoted),
+        "entries": [
+            {
+                "source": str(entry.source),
+                "checksum_sha256": entry.checksum,
+                "order_id": entry.order_id,
+                "path": str(entry.destination) if entry.destination else None,
+                "duplicate_of": entry.duplicate_of,
+            }
+            for entry in result.entries
+        ],
+    }
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+    result.index_path = index_path
+    return result
+
+
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Promote emoji-runtime@1.0 payloads into factory-order@1.0 documents",
     )
-    parser.add_argument("emoji_payload", type=Path, help="Path to emoji-runtime@1.0 payload JSON")
+    parser.add_argument(
+        "emoji_payload",
+        type=Path,
+        help="emoji-runtime@1.0 payload JSON, or a directory / glob (quote it) for bulk promotion",
+    )
     parser.add_argument(
         "destination",
         type=Path,
         nargs="?",
-        help="Destination for the emitted factory-order JSON (defaults to output directory)",
+        help="Destination for the emitted factory-order JSON, or the output directory in bulk mode "
+        "(defaults to output directory)",
+    )
+    parser.add_argument("--order-id", help="Factory order identifier (single-payload mode)")
+    parser.add_argument(
+        "--run-id",
+        help="Bulk mode: order ids become <run-id>-NN (defaults to TF-EMOJI-<timestamp>)",
     )
-    parser.add_argument("--order-id", required=True, help="Factory order identifier")
+    parser.add_argument("--index", type=Path, help="Bulk mode: summary index path (defaults to <output>/_index-<run-id>.json)")
     parser.add_argument("--issued-by", default="toyfoundry_ai_0", help="ID of the issuing workspace")
     parser.add_argument("--target", default="toyfoundry_ai_0", help="Factory order target workspace")
     parser.add_argument("--priority", default="standard", help="Factory order priority flag")
@@ -284,9 +407,52 @@ def _parse_extra_fields(pairs: Sequence[str] | None) -> Dict[str, Any]:
     return extras
 
 
+def _main_bulk(args: argparse.Namespace) -> int:
+    paths = discover_emoji_payloads(args.emoji_payload)
+    if not paths:
+        print(f"Promotion aborted: no emoji-runtime payloads found at {args.emoji_payload}")
+        return 1
+    run_id = args.run_id or datetime.now(timezone.utc).strftime("TF-EMOJI-%Y%m%d-%H%M")
+    result = promote_many(
+        paths,
+        run_id=run_id,
+        output_dir=args.destination or DEFAULT_OUTPUT_DIR,
+        issued_by=args.issued_by,
+        target=args.target,
+        priority=args.priority,
+        timestamp_issued=args.timestamp,
+        summary_override=args.summary,
+        narrator=args.narrator,
+        extra_fields=_parse_extra_fields(args.extra_field),
+        index_path=args.index,
+        dry_run=args.dry_run,
+    )
+    if result.failures:
+        for path, problem in result.failures:
+            print(f"Promotion aborted for {path}: {problem}")
+        return 1
+    for entry in result.entries:
+        if entry.duplicate_of:
+            print(f"[skip] {entry.source} duplicates {entry.duplicate_of} (sha256 {entry.checksum[:12]})")
+        elif args.dry_run:
+            print(f"[dry-run] {entry.source} -> {entry.order_id}")
+        else:
+            print(f"factory-order emitted to {entry.destination}")
+    if result.index_path is not None:
+        print(
+            f"[OK] {len(result.promoted)} order(s) from {len(result.entries)} payload(s); "
+            f"index written to {result.index_path}"
+        )
+    return 0
+
+
 def main(argv: Iterable[str] | None = None) -> int:
     try:
         args = parse_args(argv)
+        if is_bulk_source(args.emoji_payload):
+            return _main_bulk(args)
+        if not args.order_id:
+            raise EmojiRuntimeValidationError("--order-id is required when promoting a single payload")
         payload = load_emoji_runtime_payload(args.emoji_payload)
         extras = _parse_extra_fields(args.extra_field)
 
@@ -0,0 +1,387 @@
+"""Long-lived exchange agent: heartbeat, bridge sync, ledger and watchers in one process.
+
+Operators used to chain ``exchange_heartbeat``, ``offline_bridge sync``,
+``ledger_update``, ``exchange_watcher`` and ``manufacturing_order_watcher`` as
+separate processes, each resolving config and rescanning the exchange tree
+from scratch. ``python -m tools.exchange_agent run`` does all of it in one
+asyncio process:
+
+- hub, front and target are resolved once at start-up;
+- ``ExchangeModel`` keeps the watched exchange folders in memory and caches
+  each file's header fields by (size, mtime_ns), so a rescan only stats files
+  and re-reads the ones that changed;
+- the hub is probed every ``--heartbeat`` seconds and push/pull deltas are
+  synced every ``--sync`` seconds (skipped while the hub is offline);
+- the ledger is updated only when one of its source folders changed;
+- status is served as JSON lines on a localhost socket whose port is recorded
+  in ``.toyfoundry/exchange_agent/agent.json``, so ``exchange_agent status``,
+  ``scan``, ``sync`` and ``stop`` talk to the running agent.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from tools.exchange_headers import read_header_fields
+    from tools.exchange_heartbeat import probe_hub
+    from tools.exchange_watcher import CATEGORIES, EXCHANGE_ROOT, Entry, Snapshot, compute_changes, format_entry
+    from tools.ledger_update import update_ledger
+    from tools.offline_bridge import BridgeConfig, pull, push, resolve_config
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools.exchange_headers import read_header_fields
+    from tools.exchange_heartbeat import probe_hub
+    from tools.exchange_watcher import CATEGORIES, EXCHANGE_ROOT, Entry, Snapshot, compute_changes, format_entry
+    from tools.ledger_update import update_ledger
+    from tools.offline_bridge import BridgeConfig, pull, push, resolve_config
+
+AGENT_STATE_FILE = Path(".toyfoundry") / "exchange_agent" / "agent.json"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_TARGET = "toyfoundry_ai_0"
+COMMANDS = ("status", "scan", "sync", "stop")
+# Header fields manufacturing_order_watcher filters on, per category.
+TARGET_FIELDS = {"orders_pending": "target", "acks_pending": "sender", "reports_inbox": "origin"}
+# Folders update_ledger indexes; the ledger is refreshed only when one of them changes.
+LEDGER_DIRS = (
+    Path("acknowledgements") / "logged",
+    Path("reports") / "inbox",
+    Path("reports") / "archived",
+    Path("orders") / "completed",
+    Path("orders") / "dispatched",
+)
+
+
+class AgentError(RuntimeError):
+    """Raised when the running agent cannot be reached."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class CachedHeader:
+    size: int
+    mtime_ns: int
+    fields: Optional[Dict[str, Any]]
+
+
+class ExchangeModel:
+    """In-memory view of the watched exchange folders, refreshed incrementally."""
+
+    def __init__(self, exchange_root: Path) -> None:
+        self.exchange_root = exchange_root
+        self.categories = {
+            name: (exchange_root / config["path"].relative_to(EXCHANGE_ROOT), config)
+            for name, config in CATEGORIES.items()
+        }
+        self.snapshot: Snapshot = {name: {} for name in CATEGORIES}
+        self.header_reads = 0
+        self._headers: Dict[Path, CachedHeader] = {}
+        self._ledger_signature: Optional[Tuple] = None
+
+    def _header(self, path: Path, st: os.stat_result, fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        cached = self._headers.get(path)
+        if cached is not None and cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+            return cached.fields
+        try:
+            data: Optional[Dict[str, Any]] = read_header_fields(path, fields)
+        except json.JSONDecodeError:
+            data = None
+        self.header_reads += 1
+        self._headers[path] = CachedHeader(st.st_size, st.st_mtime_ns, data)
+        return data
+
+    def refresh(self) -> Dict[str, Dict[str, List[str]]]:
+        """Rescan the watched folders; returns added/removed ids per category like ``exchange_watcher``."""
+        current: Snapshot = {}
+        seen = set()
+        for name, (root, config) in self.categories.items():
+            fields = (config["id_field"], config["summary_field"], config["timestamp_field"], TARGET_FIELDS[name])
+            entries: Dict[str, Dict[str, str]] = {}
+            for path in sorted(root.glob("*.json")) if root.exists() else ():
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                seen.add(path)
+                data = self._header(path, st, fields)
+                if data is None:
+                    entries[path.stem] = {"id": path.stem, "path": str(path), "summary": "<unreadable>"}
+                    continue
+                identifier = str(data.get(config["id_field"], path.stem))
+                entry = Entry(
+                    identifier=identifier,
+                    path=path,
+                    summary=data.get(config["summary_field"]) or None,
+                    timestamp=data.get(config["timestamp_field"]) or None,
+                )
+                snapshot_entry = dict(entry.to_snapshot())
+                if data.get(TARGET_FIELDS[name]) is not None:
+                    snapshot_entry[TARGET_FIELDS[name]] = str(data[TARGET_FIELDS[name]])
+                entries[identifier] = snapshot_entry
+            current[name] = entries
+        for stale in set(self._headers) - seen:
+            del self._headers[stale]
+        changes = compute_changes(self.snapshot, current)
+        self.snapshot = current
+        return changes
+
+    def for_target(self, target: str) -> Dict[str, List[str]]:
+        """Ids ``manufacturing_order_watcher`` would report for ``target``, per category."""
+        return {
+            name: sorted(i for i, entry in entries.items() if entry.get(TARGET_FIELDS[name]) == target)
+            for name, entries in self.snapshot.items()
+        }
+
+    def ledger_changed(self) -> bool:
+        """True when a ledger source folder gained, lost or touched a file since the last call."""
+        signature = []
+        for rel in LEDGER_DIRS:
+            folder = self.exchange_root / rel
+            try:
+                with os.scandir(folder) as it:
+                    signature.append(
+                        (str(rel), tuple(sorted((e.name, e.stat().st_mtime_ns) for e in it if e.name.endswith(".json"))))
+                    )
+            except FileNotFoundError:
+                signature.append((str(rel), ()))
+        current = tuple(signature)
+        changed = current != self._ledger_signature
+        self._ledger_signature = current
+        return changed
+
+
+@dataclass
+class AgentConfig:
+    bridge: BridgeConfig
+    target: str = DEFAULT_TARGET
+    heartbeat_interval: float = 60.0
+    sync_interval: float = 300.0
+    scan_interval: float = 10.0
+    host: str = DEFAULT_HOST
+    port: int = 0
+    sync: bool = True
+
+    @property
+    def repo_root(self) -> Path:
+        return self.bridge.repo_root
+
+    @property
+    def state_file(self) -> Path:
+        return self.repo_root / AGENT_STATE_FILE
+
+
+class ExchangeAgent:
+    """Runs heartbeat, sync and scan loops and serves their state over a local socket."""
+
+    def __init__(self, config: AgentConfig, report: Callable[[str], None] = print) -> None:
+        self.config = config
+        self.report = report
+        self.model = ExchangeModel(config.repo_root / "exchange")
+        self.status: Dict[str, Any] = {
+            "pid": os.getpid(),
+            "started_at": _now(),
+            "hub": str(config.bridge.hub),
+            "front": config.bridge.front,
+            "target": config.target,
+            "hub_online": None,
+            "heartbeat": None,
+            "last_sync": None,
+            "last_scan": None,
+            "ledger_changes": 0,
+            "last_error": None,
+        }
+        self.port: Optional[int] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._scan_lock: Optional[asyncio.Lock] = None
+        self._sync_lock: Optional[asyncio.Lock] = None
+
+    async def heartbeat_once(self) -> int:
+        code, lines = await asyncio.to_thread(probe_hub, self.config.bridge.hub)
+        if self.status["hub_online"] is not (code == 0):
+            self.report(f"[agent] {lines[0]}")
+        self.status["hub_online"] = code == 0
+        self.status["heartbeat"] = {"code": code, "message": lines[0], "at": _now()}
+        return code
+
+    async def scan_once(self) -> Dict[str, Dict[str, List[str]]]:
+        async with self._scan_lock:
+            changes = await asyncio.to_thread(self.model.refresh)
+            ledger_changes = 0
+            if await asyncio.to_thread(self.model.ledger_changed):
+                ledger_changes = await asyncio.to_thread(update_ledger, self.config.repo_root)
+                self.status["ledger_changes"] += ledger_changes
+            self._render(changes)
+            self.status["last_scan"] = {
+                "at": _now(),
+                "counts": {name: len(entries) for name, entries in self.model.snapshot.items()},
+                "ledger_changes": ledger_changes,
+            }
+            return changes
+
+    async def sync_once(self) -> Dict[str, Any]:
+        async with self._sync_lock:
+            if not self.status["hub_online"] and await self.heartbeat_once() != 0:
+                result: Dict[str, Any] = {"at": _now(), "skipped": "hub offline"}
+            else:
+                pushed = await asyncio.to_thread(push, self.config.bridge)
+                # The scan below updates the ledger once for everything pulled.
+                pulled = await asyncio.to_thread(pull, self.config.bridge, ledger=False)
+                result = {"at": _now(), "pushed": pushed, "pulled": pulled}
+            self.status["last_sync"] = result
+        await self.scan_once()
+        return result
+
+    def _render(self, changes: Dict[str, Dict[str, List[str]]]) -> None:
+        for category, delta in changes.items():
+            label = CATEGORIES[category]["label"]
+            for identifier in delta["added"]:
+                info = self.model.snapshot[category][identifier]
+                self.report(f"[exchange] New {label.lower()} detected: {format_entry(identifier, info)}")
+            for identifier in delta["removed"]:
+                self.report(f"[exchange] {label} cleared: {identifier}")
+
+    def snapshot_status(self) -> Dict[str, Any]:
+        payload = dict(self.status)
+        payload["port"] = self.port
+        payload["for_target"] = self.model.for_target(self.config.target)
+        return payload
+
+    async def handle_command(self, command: str) -> Dict[str, Any]:
+        if command == "scan":
+            await self.scan_once()
+        elif command == "sync":
+            await self.sync_once()
+        elif command == "stop":
+            self._stop.set()
+        elif command != "status":
+            return {"error": f"unknown command {command!r}; expected one of {', '.join(COMMANDS)}"}
+        return self.snapshot_status()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = await reader.readline()
+            command = line.decode("utf-8", "replace").strip() or "status"
+            try:
+                reply = await self.handle_command(command)
+            except Exception as exc:
+                reply = {"error": f"{type(exc).__name__}: {exc}"}
+            writer.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _every(self, interval: float, step: Callable[[], Any], name: str) -> None:
+        while not self._stop.is_set():
+            try:
+                await step()
+            except Exception as exc:
+                self.status["last_error"] = {"loop": name, "error": f"{type(exc).__name__}: {exc}", "at": _now()}
+                self.report(f"[WARN] agent {name} failed: {exc}")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _write_state_file(self) -> None:
+        path = self.config.state_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"pid": os.getpid(), "host": self.config.host, "port": self.port, "started_at": self.status["started_at"]}
+        path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    async def run(self) -> int:
+        self._stop = asyncio.Event()
+        self._scan_lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        server = await asyncio.start_server(self._serve_client, self.config.host, self.config.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._write_state_file()
+        self.report(f"[agent] Serving status on {self.config.host}:{self.port} (hub {self.config.bridge.hub})")
+        loops = [
+            self._every(self.config.heartbeat_interval, self.heartbeat_once, "heartbeat"),
+            self._every(self.config.scan_interval, self.scan_once, "scan"),
+        ]
+        if self.config.sync:
+            loops.append(self._every(self.config.sync_interval, self.sync_once, "sync"))
+        try:
+            async with server:
+                await asyncio.gather(*loops)
+        finally:
+            self.config.state_file.unlink(missing_ok=True)
+        self.report("[agent] Stopped")
+        return 0
+
+
+def query_agent(repo_root: Path, command: str = "status", *, timeout: float = 300.0) -> Dict[str, Any]:
+    """Send ``command`` to the agent running for ``repo_root`` and return its JSON reply."""
+    try:
+        state = json.loads((repo_root / AGENT_STATE_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise AgentError(f"No running exchange agent recorded at {repo_root / AGENT_STATE_FILE}") from exc
+    try:
+        with socket.create_connection((state["host"], int(state["port"])), timeout=timeout) as conn:
+            conn.sendall((command + "\n").encode("utf-8"))
+            with conn.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+    except OSError as exc:
+        raise AgentError(f"Exchange agent at {state.get('host')}:{state.get('port')} is not responding: {exc}") from exc
+    if not line:
+        raise AgentError("Exchange agent closed the connection without replying")
+    return json.loads(line)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Long-lived exchange agent (heartbeat, sync, ledger, watchers)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_run = sub.add_parser("run", help="Run the agent in the foreground")
+    p_run.add_argument("--target", default=DEFAULT_TARGET, help="Order target identifier to track")
+    p_run.add_argument("--heartbeat", type=float, default=60.0, help="Seconds between hub heartbeats")
+    p_run.add_argument("--sync", type=float, default=300.0, help="Seconds between push/pull syncs")
+    p_run.add_argument("--scan", type=float, default=10.0, help="Seconds between exchange rescans")
+    p_run.add_argument("--no-sync", action="store_true", help="Watch and update the ledger without syncing the hub")
+    p_run.add_argument("--port", type=int, default=0, help="Status port on 127.0.0.1 (0 picks a free port)")
+    for name in COMMANDS:
+        sub.add_parser(name, help=f"Ask the running agent to {name}" if name != "status" else "Show agent status")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    bridge = resolve_config()
+    if args.cmd == "run":
+        config = AgentConfig(
+            bridge=bridge,
+            target=args.target,
+            heartbeat_interval=args.heartbeat,
+            sync_interval=args.sync,
+            scan_interval=args.scan,
+            port=args.port,
+            sync=not args.no_sync,
+        )
+        try:
+            return asyncio.run(ExchangeAgent(config).run())
+        except KeyboardInterrupt:
+            return 130
+    try:
+        reply = query_agent(bridge.repo_root, args.cmd)
+    except AgentError as exc:
+        print(f"[WARN] {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps(reply, indent=2))
+    return 1 if "error" in reply else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
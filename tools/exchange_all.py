@@ -1,7 +1,13 @@
-import json, os, sys, shutil
+import json, sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    from tools.sync_engine import SyncPipeline, iter_tree, require_json_fields, resolve_hub, write_item
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from tools.sync_engine import SyncPipeline, iter_tree, require_json_fields, resolve_hub, write_item
+
 WORKSPACE = "toyfoundry_ai_0"
 ROOT = Path(__file__).resolve().parents[1]
 LOGS = ROOT / "logs"
@@ -14,55 +20,41 @@ def iso_now():
     return datetime.now(timezone.utc).isoformat()
 
 def read_hub_path():
-    env = os.environ.get("SHAGI_EXCHANGE_PATH")
-    if env:
-        return Path(env)
-    cfg = ROOT / "exchange" / "config.json"
-    try:
-        if cfg.exists():
-            obj = json.loads(cfg.read_text(encoding="utf-8"))
-            hp = obj.get("hub_path")
-            if hp:
-                return Path(hp)
-    except Exception:
-        pass
-    return None
+    # SHAGI_EXCHANGE_PATH -> exchange/config.json hub_path; upstream_root is the bridge's key
+    return resolve_hub(ROOT, default=None, config_keys=("hub_path",))
 
-def collect_staged():
-    return {
-        "orders": list((ROOT/"outbox"/"orders").glob("*.json")),
-        "reports": list((ROOT/"outbox"/"reports").glob("*.json")),
-        "acks": list((ROOT/"outbox"/"acks").glob("*.json")),
-    }
+FIELDS = {
+    "orders": ["id","workspace","title","status","created_at","attachments"],
+    "acks": ["order_id","ack_id","workspace","ack_timestamp","notes"],
+    "reports": ["order_id","report_id","workspace","summary","created_at","artifacts"],
+}
+DEST_SUBS = {"orders": ORDERS_SUB, "reports": REPORTS_SUB, "acks": ACKS_SUB}
 
-def validate(files_by_kind):
-    missing = []
-    def fields_for(kind):
-        return {
-            "orders": ["id","workspace","title","status","created_at","attachments"],
-            "acks": ["order_id","ack_id","workspace","ack_timestamp","notes"],
-            "reports": ["order_id","report_id","workspace","summary","created_at","artifacts"],
-        }[kind]
-    for kind, files in files_by_kind.items():
-        req = fields_for(kind)
-        for f in files:
-            try:
-                obj = json.loads(f.read_text(encoding="utf-8"))
-            except Exception:
-                missing.append({"kind": kind, "file": f.name, "missing": ["invalid_json"]})
-                continue
-            miss = [k for k in req if obj.get(k) is None]
-            if miss:
-                missing.append({"kind": kind, "file": f.name, "missing": miss})
-    return missing
+def discover_staged():
+    for kind in ("orders", "reports", "acks"):
+        yield from iter_tree(ROOT/"outbox"/kind, "*.json", kind=kind)
+
+def build_pipeline(hub):
+    # Validation reads and parses each file once, then drops the bytes; transfers re-read from disk
+    # and fail any file that changed after it was validated.
+    return SyncPipeline(
+        discover=discover_staged,
+        validators=[require_json_fields(FIELDS)],
+        transfer=lambda item: write_item(item, hub/DEST_SUBS[item.kind]/item.source.name),
+        all_or_nothing=True,
+        label="exchange_all",
+    )
 
 def main():
     hub = read_hub_path()
     if not hub:
         print("No hub path. Set SHAGI_EXCHANGE_PATH or edit exchange/config.json.", file=sys.stderr)
         sys.exit(2)
-    files = collect_staged()
-    missing = validate(files)
+    report = build_pipeline(hub).run()
+    missing = [
+        {"kind": item.kind, "file": item.source.name, "missing": item.errors}
+        for item in sorted(report.invalid + report.failed, key=lambda i: (i.kind, i.source.name))
+    ]
     ok = len(missing) == 0
 
     summary = {
@@ -73,26 +65,19 @@ def main():
         "validation_errors": missing,
         "copied": {"orders": [], "reports": [], "acks": []},
     }
+    for item in report.transferred:
+        summary["copied"][item.kind].append(item.source.name)
+    for names in summary["copied"].values():
+        names.sort()
 
     LOGS.mkdir(parents=True, exist_ok=True)
     out = LOGS/"exchange_all.json"
+    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
     if not ok:
-        out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
         print(f"Validation failed. See {out}")
         sys.exit(1)
 
-    (hub/ORDERS_SUB).mkdir(parents=True, exist_ok=True)
-    (hub/REPORTS_SUB).mkdir(parents=True, exist_ok=True)
-    (hub/ACKS_SUB).mkdir(parents=True, exist_ok=True)
-
-    for kind, dest_sub in (("orders", ORDERS_SUB), ("reports", REPORTS_SUB), ("acks", ACKS_SUB)):
-        for f in files[kind]:
-            dest = hub/dest_sub/f.name
-            shutil.copy2(f, dest)
-            summary["copied"][kind].append(f.name)
-
-    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
     print(f"exchange_all complete. See {out}")
     sys.exit(0)
 
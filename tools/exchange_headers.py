@@ -0,0 +1,142 @@
+"""Bounded-prefix header extraction for exchange JSON documents.
+
+Exchange scanners usually only need a handful of top-level fields (``order_id``,
+``target``, ``sender``, ``origin``, ``summary`` or a timestamp) but orders can
+carry large ``attachments`` / ``directives`` arrays. ``read_header_fields``
+reads the document in growing prefixes and decodes the top-level object one
+member at a time, stopping as soon as every requested key has been seen, so
+the tail of a large document is never read or parsed.
+
+Documents that are not a JSON object at the top level, or that turn out to be
+malformed, fall back to a full ``json.loads`` so callers see the same
+``json.JSONDecodeError`` they would get from parsing the whole file.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+HEADER_PREFIX_BYTES = 4096
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _NeedMore(Exception):
+    """Raised internally when the buffered prefix ends mid-member."""
+
+
+class _NotAnObject(Exception):
+    """Raised internally when the document is not a top-level JSON object."""
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    end = len(buf)
+    while pos < end and buf[pos] in _WHITESPACE:
+        pos += 1
+    if pos >= end:
+        raise _NeedMore
+    return pos
+
+
+def _decode_at(buf: str, pos: int) -> Tuple[Any, int]:
+    try:
+        value, end = _DECODER.raw_decode(buf, pos)
+    except json.JSONDecodeError as exc:
+        raise _NeedMore from exc
+    # A scalar that runs into the end of the buffer (e.g. ``12`` of ``123``)
+    # may be truncated; only trust it once a following delimiter is buffered.
+    if end >= len(buf):
+        raise _NeedMore
+    return value, end
+
+
+def _scan_members(buf: str, pos: int, wanted: set, found: Dict[str, Any]) -> Tuple[int, bool]:
+    """Decode complete members starting at ``pos``.
+
+    Returns the position after the last complete member and whether the
+    scan is finished (all keys found or the object closed).
+    """
+    while True:
+        member_start = pos
+        try:
+            pos = _skip_ws(buf, pos)
+            if buf[pos] == "}":
+                return pos, True
+            key, pos = _decode_at(buf, pos)
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", buf, pos)
+            pos = _skip_ws(buf, pos)
+            if buf[pos] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", buf, pos)
+            pos = _skip_ws(buf, pos + 1)
+            value, pos = _decode_at(buf, pos)
+            pos = _skip_ws(buf, pos)
+            if buf[pos] not in ",}":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        except _NeedMore:
+            return member_start, False
+        if key in wanted and key not in found:
+            found[key] = value
+            if len(found) == len(wanted):
+                return pos, True
+        if buf[pos] == "}":
+            return pos, True
+        pos += 1
+
+
+def read_header_fields(
+    path: Path,
+    fields: Iterable[str],
+    *,
+    prefix_bytes: int = HEADER_PREFIX_BYTES,
+) -> Dict[str, Any]:
+    """Return the requested top-level ``fields`` present in the JSON document at ``path``.
+
+    Keys missing from the document are omitted from the result. The file is
+    read in chunks starting at ``prefix_bytes`` and doubling, and reading stops
+    once every requested key has been decoded.
+    """
+    wanted = set(fields)
+    found: Dict[str, Any] = {}
+    if not wanted:
+        return found
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunk = max(1, prefix_bytes)
+    buf = ""
+    pos = 0
+    opened = False
+    with path.open("rb") as handle:
+        while True:
+            raw = handle.read(chunk)
+            eof = not raw
+            buf += decoder.decode(raw, final=eof)
+            try:
+                if not opened:
+                    pos = _skip_ws(buf, 0)
+                    if buf[pos] != "{":
+                        raise _NotAnObject
+                    pos += 1
+                    opened = True
+                pos, done = _scan_members(buf, pos, wanted, found)
+            except _NeedMore:
+                done = False
+            except (_NotAnObject, json.JSONDecodeError):
+                break
+            if done:
+                return found
+            if eof:
+                break
+            chunk *= 2
+        buf += decoder.decode(handle.read(), final=True)
+    # Not an object, malformed, or truncated: defer to the full parser so the
+    # caller sees the standard error (or the standard result for odd shapes).
+    document = json.loads(buf)
+    if not isinstance(document, dict):
+        return {}
+    return {key: document[key] for key in wanted if key in document}
+
+
+__all__ = ["HEADER_PREFIX_BYTES", "read_header_fields"]
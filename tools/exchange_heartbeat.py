@@ -6,9 +6,11 @@ Resolves hub path with precedence:
 - default C:/Users/Admin/high_command_exchange
 """
 from pathlib import Path
+from typing import List, Optional, Tuple
 import os
 import sys
 import json
+import threading
 
 
 DEFAULT_HUB = Path("C:/Users/Admin/high_command_exchange")
@@ -29,24 +31,27 @@ def _load_hub(repo_root: Path) -> Path:
     return DEFAULT_HUB
 
 
-def heartbeat() -> int:
-    repo_root = Path(__file__).resolve().parents[1]
-    exchange = _load_hub(repo_root)
+def probe_hub(exchange: Optional[Path]) -> Tuple[int, List[str]]:
+    """Check that ``exchange`` exists and is writable; returns (exit code, status lines)."""
     if not exchange or not exchange.exists():
-        print("[ERROR] Exchange Offline - SHAGI_EXCHANGE_PATH missing or invalid")
-        return 1
+        return 1, ["[ERROR] Exchange Offline - SHAGI_EXCHANGE_PATH missing or invalid"]
 
     # Test write permission safely
     try:
-        test_file = exchange / f"heartbeat_test_{os.getpid()}.tmp"
+        test_file = exchange / f"heartbeat_test_{os.getpid()}_{threading.get_ident()}.tmp"
         test_file.write_text("pulse", encoding="utf-8")
         test_file.unlink(missing_ok=True)
-        print(f"[OK] Exchange Online - connected to {exchange}")
-        return 0
+        return 0, [f"[OK] Exchange Online - connected to {exchange}"]
     except Exception as e:
-        print(f"[WARN] Exchange Reachable but Unwritable - {exchange}")
-        print(f"       Details: {e}")
-        return 2
+        return 2, [f"[WARN] Exchange Reachable but Unwritable - {exchange}", f"       Details: {e}"]
+
+
+def heartbeat() -> int:
+    repo_root = Path(__file__).resolve().parents[1]
+    code, lines = probe_hub(_load_hub(repo_root))
+    for line in lines:
+        print(line)
+    return code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""Compiled routing table for the offline exchange bridge.
+
+``ExchangeRouter`` answers the two routing questions ``offline_bridge`` asks:
+
+- ``route_pull(rel)``  where a peer ``<front>/outbox/<rel>`` file lands locally;
+- ``route_inbox(name)`` where the post-pull sorter moves an ``exchange/inbox``
+  file, based on its basename.
+
+Inbox routing checks the built-in report/ack/emoji-sample rules with one
+combined regex, then the optional ``router_rules.json`` globs. Each glob is
+indexed by its literal prefix (or, for globs starting with a wildcard, its
+literal suffix), so a name is only tested against the few rules that could
+match it; those candidates are then checked with one combined regex, cached
+per candidate set. First matching rule wins, exactly as with the previous
+linear ``fnmatch`` loop.
+
+``get_router`` caches the compiled router per repository and rebuilds it only
+when a rules file's mtime changes.
+"""
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+RULES_CANDIDATES = (
+    Path("exchange") / "router_rules.json",
+    Path("tools") / "router_rules.json",
+)
+ORDER_STATES = frozenset({"pending", "dispatched", "completed"})
+_GLOB_SPECIALS = "*?["
+
+_BUILTIN_DESTINATIONS = {
+    "report": Path("exchange") / "reports" / "inbox",
+    "ack": Path("exchange") / "acknowledgements" / "logged",
+    "emoji": Path("telemetry") / "emoji_runtime" / "promoted_samples",
+}
+# Mirrors the historic string checks: order-*-report.json, order-*-ack.json
+# (prefix and suffix may overlap) and TF-EMOJI-DRYRUN*.json, case-insensitive.
+_BUILTIN_RE = re.compile(
+    r"(?P<report>(?=order-).*-report\.json)"
+    r"|(?P<ack>(?=order-).*-ack\.json)"
+    r"|(?P<emoji>(?=tf-emoji-dryrun).*\.json)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def load_router_rules(repo_root: Path) -> List[Dict[str, str]]:
+    rules: List[Dict[str, str]] = []
+    for rel in RULES_CANDIDATES:
+        candidate = repo_root / rel
+        try:
+            if candidate.exists():
+                data = json.loads(candidate.read_text(encoding="utf-8"))
+                if isinstance(data, list):
+                    for r in data:
+                        if (
+                            isinstance(r, dict)
+                            and isinstance(r.get("glob"), str)
+                            and isinstance(r.get("dest"), str)
+                        ):
+                            rules.append({"glob": r["glob"], "dest": r["dest"]})
+        except Exception:
+            # Ignore malformed rules files
+            pass
+    return rules
+
+
+MAX_CACHED_CANDIDATE_SETS = 4096
+
+
+def _literal_prefix(pattern: str) -> str:
+    for index, char in enumerate(pattern):
+        if char in _GLOB_SPECIALS:
+            return pattern[:index]
+    return pattern
+
+
+def _literal_suffix(pattern: str) -> str:
+    for index in range(len(pattern) - 1, -1, -1):
+        if pattern[index] in _GLOB_SPECIALS or pattern[index] == "]":
+            return pattern[index + 1 :]
+    return pattern
+
+
+class ExchangeRouter:
+    """Routes peer outbox paths and inbox basenames to local destinations."""
+
+    def __init__(self, repo_root: Path, rules: Sequence[Dict[str, str]] = ()) -> None:
+        self.repo_root = repo_root
+        self._builtin_dest = {key: repo_root / rel for key, rel in _BUILTIN_DESTINATIONS.items()}
+        # (regex source, destination directory), in rule order
+        self._rules: List[Tuple[str, Path]] = []
+        self._by_prefix: Dict[int, Dict[str, List[int]]] = {}
+        self._by_suffix: Dict[int, Dict[str, List[int]]] = {}
+        self._unindexed: List[int] = []
+        for rule in rules:
+            pattern = os.path.normcase(rule["glob"])
+            source = fnmatch.translate(pattern)
+            try:
+                re.compile(source)
+            except re.error:
+                continue
+            index = len(self._rules)
+            self._rules.append((source, repo_root / Path(rule["dest"])))
+            prefix = _literal_prefix(pattern)
+            suffix = _literal_suffix(pattern)
+            if prefix:
+                self._by_prefix.setdefault(len(prefix), {}).setdefault(prefix, []).append(index)
+            elif suffix:
+                self._by_suffix.setdefault(len(suffix), {}).setdefault(suffix, []).append(index)
+            else:
+                self._unindexed.append(index)
+        self._combined: Dict[Tuple[int, ...], Pattern[str]] = {}
+        self._combined_lock = threading.Lock()
+
+    @property
+    def rule_count(self) -> int:
+        return len(self._rules)
+
+    def _candidates(self, name: str) -> Tuple[int, ...]:
+        found = list(self._unindexed)
+        for length, table in self._by_prefix.items():
+            hit = table.get(name[:length])
+            if hit:
+                found.extend(hit)
+        for length, table in self._by_suffix.items():
+            hit = table.get(name[-length:])
+            if hit:
+                found.extend(hit)
+        return tuple(sorted(found))
+
+    def _combined_pattern(self, candidates: Tuple[int, ...]) -> Pattern[str]:
+        pattern = self._combined.get(candidates)
+        if pattern is None:
+            source = "|".join(f"(?P<rule_{index}>{self._rules[index][0]})" for index in candidates)
+            pattern = re.compile(source)
+            with self._combined_lock:
+                if len(self._combined) >= MAX_CACHED_CANDIDATE_SETS:
+                    self._combined.clear()
+                self._combined[candidates] = pattern
+        return pattern
+
+    def route_inbox(self, name: str) -> Optional[Path]:
+        """Destination for an ``exchange/inbox`` file called ``name``, or ``None`` to leave it."""
+        match = _BUILTIN_RE.fullmatch(name)
+        if match is not None:
+            return self._builtin_dest[match.lastgroup] / name
+        if not self._rules:
+            return None
+        normalized = os.path.normcase(name)
+        candidates = self._candidates(normalized)
+        if not candidates:
+            return None
+        match = self._combined_pattern(candidates).match(normalized)
+        if match is None:
+            return None
+        group = match.lastgroup
+        if not group or not group.startswith("rule_"):
+            # Older fnmatch.translate output carries its own named groups.
+            group = next(k for k, v in match.groupdict().items() if k.startswith("rule_") and v is not None)
+        return self._rules[int(group[5:])][1] / name
+
+    def route_pull(self, peer_rel_under_outbox: Path) -> Tuple[Path, str]:
+        """Local destination and bucket label for a peer ``outbox/<rel>`` file."""
+        rel_parts = peer_rel_under_outbox.parts
+        parts = tuple(part.lower() for part in rel_parts)
+        root = self.repo_root
+
+        # reports -> exchange/reports/inbox/[rest after 'reports']
+        if "reports" in parts:
+            idx = parts.index("reports")
+            return root / "exchange" / "reports" / "inbox" / Path(*rel_parts[idx + 1 :]), "reports/inbox"
+
+        # acknowledgements -> exchange/acknowledgements/[same structure]
+        if "acknowledgements" in parts:
+            idx = parts.index("acknowledgements")
+            return root / "exchange" / "acknowledgements" / Path(*rel_parts[idx + 1 :]), "acknowledgements"
+
+        # orders/<state> -> exchange/orders/<state>/[rest after state]
+        if len(parts) >= 2 and parts[0] == "orders" and parts[1] in ORDER_STATES:
+            state = parts[1]
+            return root / "exchange" / "orders" / state / Path(*rel_parts[2:]), f"orders/{state}"
+
+        # telemetry/emoji_runtime/promoted_samples -> telemetry/emoji_runtime/promoted_samples/[tail]
+        if len(parts) >= 3 and parts[:3] == ("telemetry", "emoji_runtime", "promoted_samples"):
+            dest = root / "telemetry" / "emoji_runtime" / "promoted_samples" / Path(*rel_parts[3:])
+            return dest, "telemetry/emoji_runtime/promoted_samples"
+
+        # default inbox catch-all under exchange/inbox
+        return root / "exchange" / "inbox" / peer_rel_under_outbox, "exchange/inbox"
+
+
+_ROUTER_CACHE: Dict[Path, Tuple[Tuple[Optional[int], ...], ExchangeRouter]] = {}
+_ROUTER_CACHE_LOCK = threading.Lock()
+
+
+def _rules_signature(repo_root: Path) -> Tuple[Optional[int], ...]:
+    signature: List[Optional[int]] = []
+    for rel in RULES_CANDIDATES:
+        try:
+            signature.append((repo_root / rel).stat().st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def get_router(repo_root: Path) -> ExchangeRouter:
+    """Return the compiled router for ``repo_root``, rebuilding it when rules files change."""
+    signature = _rules_signature(repo_root)
+    with _ROUTER_CACHE_LOCK:
+        cached = _ROUTER_CACHE.get(repo_root)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        router = ExchangeRouter(repo_root, load_router_rules(repo_root))
+        _ROUTER_CACHE[repo_root] = (signature, router)
+        return router
+
+
+__all__ = ["ExchangeRouter", "RULES_CANDIDATES", "get_router", "load_router_rules"]
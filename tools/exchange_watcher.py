@@ -14,6 +14,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Optional
 
+try:
+    from tools.exchange_headers import read_header_fields
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    import sys
+
+    if str(Path(__file__).resolve().parents[1]) not in sys.path:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from tools.exchange_headers import read_header_fields
+
 
 # Workspace root is the parent of the tools/ folder where this file lives
 # Example: C:\Users\Admin\toyfoundry_ai_0\tools\exchange_watcher.py
@@ -96,9 +105,10 @@ def scan_category(category_name: str) -> Dict[str, Mapping[str, str]]:
     results: Dict[str, Mapping[str, str]] = {}
     if not root.exists():
         return results
+    fields = (config["id_field"], config["summary_field"], config["timestamp_field"])
     for candidate in sorted(root.glob("*.json")):
         try:
-            data = json.loads(candidate.read_text(encoding="utf-8"))
+            data = read_header_fields(candidate, fields)
         except json.JSONDecodeError:
             identifier = candidate.stem
             results[identifier] = {
@@ -0,0 +1,283 @@
+"""Batch factory-order emission engine.
+
+Turns many translator payloads into ``factory-order@1.0`` documents in one
+run instead of one ``load → build → write`` round trip per file:
+
+1. payload files are read concurrently on a thread pool;
+2. decoding, validation, building (with one shared ``generated_at`` stamp),
+   rendering and hashing run in a process pool;
+3. rendered orders are written with atomic renames, in chunks, through a
+   ``TransferEngine`` thread pool;
+4. a single emission manifest records every order with its SHA-256.
+
+The pools only pay off once the batch reaches ``PARALLEL_THRESHOLD`` and more
+than one worker is available; smaller batches and single-CPU hosts run every
+step inline.
+
+Validation is all-or-nothing: if any payload is rejected no orders are
+written. ``alfa_two_emit.py`` drives this engine; benchmark it with
+``python -m tools.benchmarks.bench_factory_order_batch``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from tools.factory_order_emitter import (
+        PayloadValidationError,
+        build_factory_order,
+        decode_translator_json,
+        parse_translator_payload,
+        render_factory_order,
+    )
+    from tools.transfer_engine import DEFAULT_WORKERS, TEMP_SUFFIX, TransferEngine
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    import sys
+
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools.factory_order_emitter import (
+        PayloadValidationError,
+        build_factory_order,
+        decode_translator_json,
+        parse_translator_payload,
+        render_factory_order,
+    )
+    from tools.transfer_engine import DEFAULT_WORKERS, TEMP_SUFFIX, TransferEngine
+
+MANIFEST_SCHEMA = "factory-order-emission-manifest@1.0"
+DEFAULT_MANIFEST_DIR = Path(".toyfoundry") / "telemetry" / "alfa_two" / "emissions"
+PARALLEL_THRESHOLD = 256
+CHUNK_SIZE = 128
+WRITE_CHUNK_SIZE = 64
+
+
+@dataclass
+class EmissionSettings:
+    """Fields shared by every order in one emission run."""
+
+    run_id: str
+    issued_by: str = "toyfoundry_ai_0"
+    target: str = "toyfoundry_ai_0"
+    priority: str = "standard"
+    timestamp_issued: Optional[str] = None
+    summary_override: Optional[str] = None
+    narrator: Optional[str] = None
+
+    def order_id(self, index: int) -> str:
+        return f"{self.run_id}-{index:02d}"
+
+
+@dataclass
+class EmittedOrder:
+    source: Path
+    order_id: str
+    destination: Path
+    data: bytes
+    sha256: str
+
+    def payload(self) -> Dict[str, Any]:
+        return json.loads(self.data)
+
+
+@dataclass
+class EmissionResult:
+    orders: List[EmittedOrder] = field(default_factory=list)
+    failures: List[Tuple[Path, str]] = field(default_factory=list)
+    manifest_path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+# (index, order_id, rendered order, sha256) or (index, rejection message)
+_Prepared = Union[Tuple[int, str, bytes, str], Tuple[int, str]]
+
+
+def _prepare_one(settings: EmissionSettings, generated_at: str, index: int, path: Path, data: bytes) -> _Prepared:
+    order_id = settings.order_id(index)
+    try:
+        translator = parse_translator_payload(decode_translator_json(data, path))
+        payload = build_factory_order(
+            translator,
+            order_id=order_id,
+            issued_by=settings.issued_by,
+            target=settings.target,
+            priority=settings.priority,
+            timestamp_issued=settings.timestamp_issued or generated_at,
+            summary_override=settings.summary_override,
+            narrator=settings.narrator,
+            extra_fields=None,
+            generated_at=generated_at,
+        )
+    except PayloadValidationError as exc:
+        return index, str(exc)
+    rendered = render_factory_order(payload)
+    return index, order_id, rendered, hashlib.sha256(rendered).hexdigest()
+
+
+def _prepare_chunk(
+    settings: EmissionSettings, generated_at: str, chunk: Sequence[Tuple[int, str, bytes]]
+) -> List[_Prepared]:
+    return [_prepare_one(settings, generated_at, index, Path(path), data) for index, path, data in chunk]
+
+
+def _inline(count: int, workers: int) -> bool:
+    return count < PARALLEL_THRESHOLD or workers < 2
+
+
+def _read(path: Path) -> Union[bytes, str]:
+    try:
+        return path.read_bytes()
+    except OSError as exc:
+        return f"Unreadable payload: {exc}"
+
+
+def prepare_orders(
+    paths: Sequence[Path],
+    settings: EmissionSettings,
+    generated_at: str,
+    *,
+    workers: Optional[int] = None,
+) -> List[_Prepared]:
+    """Read ``paths``, then validate, build, render and hash each order.
+
+    Reads use a thread pool and the CPU-bound part a process pool when the
+    batch reaches ``PARALLEL_THRESHOLD`` and more than one worker is
+    available. Results come back in input order, indexed from 1.
+    """
+    processes = workers or os.cpu_count() or 1
+    if _inline(len(paths), processes):
+        blobs = [_read(path) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(DEFAULT_WORKERS, len(paths))) as pool:
+            blobs = list(pool.map(_read, paths))
+    prepared: List[_Prepared] = []
+    pending: List[Tuple[int, str, bytes]] = []
+    for index, (path, blob) in enumerate(zip(paths, blobs), start=1):
+        if isinstance(blob, str):
+            prepared.append((index, blob))
+        else:
+            pending.append((index, str(path), blob))
+
+    if _inline(len(pending), processes):
+        prepared.extend(_prepare_chunk(settings, generated_at, pending))
+    else:
+        chunks = [pending[i : i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for results in pool.map(_prepare_chunk, repeat(settings), repeat(generated_at), chunks):
+                prepared.extend(results)
+    prepared.sort(key=lambda item: item[0])
+    return prepared
+
+
+def _write_orders(orders: Sequence[EmittedOrder]) -> None:
+    suffix = f".{os.getpid()}-{threading.get_ident()}{TEMP_SUFFIX}"
+    for order in orders:
+        destination = order.destination
+        tmp = destination.with_name(f".{destination.name}{suffix}")
+        try:
+            tmp.write_bytes(order.data)
+            os.replace(tmp, destination)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def build_manifest(settings: EmissionSettings, generated_at: str, orders: Sequence[EmittedOrder]) -> Dict[str, Any]:
+    return {
+        "schema": MANIFEST_SCHEMA,
+        "run_id": settings.run_id,
+        "generated_at": generated_at,
+        "timestamp_issued": settings.timestamp_issued,
+        "count": len(orders),
+        "orders": [
+            {
+                "order_id": order.order_id,
+                "source": str(order.source),
+                "path": str(order.destination),
+                "sha256": order.sha256,
+                "bytes": len(order.data),
+            }
+            for order in orders
+        ],
+    }
+
+
+def emit_batch(
+    paths: Sequence[Path],
+    settings: EmissionSettings,
+    output_dir: Path,
+    *,
+    manifest_path: Optional[Path] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    report: Callable[[str], None] = print,
+) -> EmissionResult:
+    """Validate every payload, then write all orders and one manifest.
+
+    Nothing is written when any payload fails validation or when
+    ``dry_run`` is set; the rendered orders are still returned. ``settings``
+    is not modified; a missing ``timestamp_issued`` is filled in on a copy.
+    """
+    now = datetime.now(timezone.utc)
+    generated_at = now.isoformat()
+    if settings.timestamp_issued is None:
+        settings = replace(settings, timestamp_issued=now.replace(microsecond=0).isoformat())
+
+    result = EmissionResult()
+    for item in prepare_orders(paths, settings, generated_at, workers=workers):
+        source = paths[item[0] - 1]
+        if len(item) == 2:
+            result.failures.append((source, item[1]))
+            continue
+        _, order_id, data, digest = item
+        result.orders.append(EmittedOrder(source, order_id, output_dir / f"{order_id}.json", data, digest))
+
+    if result.failures or dry_run:
+        return result
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    chunks = [result.orders[i : i + WRITE_CHUNK_SIZE] for i in range(0, len(result.orders), WRITE_CHUNK_SIZE)]
+    if _inline(len(result.orders), workers or os.cpu_count() or 1):
+        for chunk in chunks:
+            try:
+                _write_orders(chunk)
+            except OSError as exc:
+                result.failures.append((chunk[0].source, f"Write failed: {exc}"))
+    else:
+        engine = TransferEngine(workers=workers or DEFAULT_WORKERS, label="emit", report=report)
+        summary = engine.run([(str(output_dir), chunk) for chunk in chunks], _write_orders)
+        for outcome in summary.failed:
+            result.failures.append((outcome.item[0].source, f"Write failed: {outcome.error}"))
+    if result.failures:
+        return result
+
+    manifest_path = manifest_path or DEFAULT_MANIFEST_DIR / f"{settings.run_id}.json"
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    # Compact on purpose: the C encoder is skipped whenever ``indent`` is set.
+    manifest_path.write_text(json.dumps(build_manifest(settings, generated_at, result.orders)) + "\n", encoding="utf-8")
+    result.manifest_path = manifest_path
+    return result
+
+
+__all__ = [
+    "EmissionResult",
+    "EmissionSettings",
+    "EmittedOrder",
+    "MANIFEST_SCHEMA",
+    "build_manifest",
+    "emit_batch",
+    "prepare_orders",
+]
@@ -19,11 +19,22 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Sequence
 
+try:
+    from tools.schema_registry import validate as validate_schema
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    import sys
+
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools.schema_registry import validate as validate_schema
+
 QUINT_SYNCED_DIR = Path("quint_synced")
 PAYLOAD_ALIGNMENT_PATH = QUINT_SYNCED_DIR / "payload_alignment.md"
 NARRATION_ALIGNMENT_PATH = QUINT_SYNCED_DIR / "narration_alignment.md"
 
 FACTORY_SCHEMA = "factory-order@1.0"
+TELEMETRY_STUB_SCHEMA = "telemetry-stub@1.0"
 
 
 class PayloadValidationError(RuntimeError):
@@ -44,9 +55,13 @@ class TranslatorPayload:
 
 
 def _load_json(path: Path) -> MutableMapping[str, Any]:
+    return decode_translator_json(path.read_bytes(), path)
+
+
+def decode_translator_json(data: bytes, path: Path) -> MutableMapping[str, Any]:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))  # type: ignore[return-value]
-    except json.JSONDecodeError as exc:  # pragma: no cover - IO guard
+        return json.loads(data)  # type: ignore[return-value]
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:  # pragma: no cover - IO guard
         raise PayloadValidationError(f"Malformed JSON: {path}: {exc}") from exc
 
 
@@ -76,23 +91,9 @@ def _validate_glyph_chain(chain: Sequence[Any]) -> List[str]:
 
 
 def _validate_telemetry_stub(stub: Mapping[str, Any]) -> Mapping[str, Any]:
-    required_fields = {
-        "batch_id": str,
-        "ritual": str,
-        "units_processed": int,
-        "status": str,
-        "duration_ms": int,
-    }
-    for key, expected_type in required_fields.items():
-        if key not in stub:
-            raise PayloadValidationError(f"telemetry_stub missing '{key}'")
-        value = stub[key]
-        if not isinstance(value, expected_type):
-            raise PayloadValidationError(
-                f"telemetry_stub field '{key}' must be {expected_type.__name__}, found {type(value).__name__}"
-            )
-        if expected_type is int and value < 0:
-            raise PayloadValidationError(f"telemetry_stub field '{key}' must be non-negative")
+    problem = validate_schema(TELEMETRY_STUB_SCHEMA, stub)
+    if problem is not None:
+        raise PayloadValidationError(problem)
     return stub
 
 
@@ -113,7 +114,13 @@ def _normalise_narration(raw_payload: Mapping[str, Any]) -> tuple[str | None, Se
 
 
 def load_translator_payload(path: Path) -> TranslatorPayload:
-    raw = _load_json(path)
+    return parse_translator_payload(_load_json(path))
+
+
+def parse_translator_payload(raw: Mapping[str, Any]) -> TranslatorPayload:
+    """Validate already-decoded translator output (see ``load_translator_payload``)."""
+    if not isinstance(raw, Mapping):
+        raise PayloadValidationError("Translator payload must be a JSON object")
     if raw.get("schema") != FACTORY_SCHEMA:
         raise PayloadValidationError(
             f"Translator payload schema must be '{FACTORY_SCHEMA}', found '{raw.get('schema')}'"
@@ -148,12 +155,18 @@ def ensure_summary_alignment(payload: TranslatorPayload, override_summary: str |
     return summary
 
 
-def generate_metadata(translator: TranslatorPayload, *, narrator: str | None) -> Dict[str, Any]:
+def generate_metadata(
+    translator: TranslatorPayload,
+    *,
+    narrator: str | None,
+    generated_at: str | None = None,
+) -> Dict[str, Any]:
+    """Order metadata; batch emitters pass one shared ``generated_at`` for the whole run."""
     meta: Dict[str, Any] = {
         "translator_version": translator.raw.get("translator_version", "unknown"),
         "quint_synced_payload_spec": str(PAYLOAD_ALIGNMENT_PATH),
         "quint_synced_narration_spec": str(NARRATION_ALIGNMENT_PATH),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": generated_at or datetime.now(timezone.utc).isoformat(),
     }
     if narrator:
         meta["narrator_profile"] = narrator
@@ -171,6 +184,7 @@ def build_factory_order(
     summary_override: str | None,
     narrator: str | None,
     extra_fields: Mapping[str, Any] | None,
+    generated_at: str | None = None,
 ) -> Dict[str, Any]:
     summary = ensure_summary_alignment(translator, summary_override)
 
@@ -190,7 +204,7 @@ def build_factory_order(
             "beats": list(translator.narration_beats) if translator.narration_beats else [],
         },
         "attachments": translator.raw.get("attachments", []),
-        "metadata": generate_metadata(translator, narrator=narrator),
+        "metadata": generate_metadata(translator, narrator=narrator, generated_at=generated_at),
     }
 
     if extra_fields:
@@ -202,6 +216,10 @@ def build_factory_order(
     return payload
 
 
+def render_factory_order(payload: Mapping[str, Any]) -> bytes:
+    return (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+
+
 def write_factory_order(payload: Mapping[str, Any], destination: Path) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     destination.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
@@ -9,17 +9,14 @@ Responsibilities (pilot):
 from __future__ import annotations
 
 import argparse
-import subprocess
 from pathlib import Path
 
+from tools.schema_validator import report_results, validate_paths
 
-def run_validator(paths: list[Path]) -> None:
-    cmd = [
-        "python",
-        "tools/schema_validator.py",
-        *[str(p) for p in paths],
-    ]
-    subprocess.run(cmd, check=False)
+
+def run_validator(paths: list[Path]) -> int:
+    """Validate ``paths`` (files or directories) in-process; returns the failure count."""
+    return report_results(validate_paths(paths))
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -0,0 +1,165 @@
+"""Content-addressed object store for the offline exchange hub.
+
+Optional alternative to publishing plain files under ``<hub>/<front>/outbox``.
+Each payload is stored once as a blob named by its SHA-256 and every front
+publishes a ref manifest mapping its outbox paths to blob digests:
+
+- ``<hub>/.objects/sha256/<ab>/<cdef...>``  blobs (write-once, atomic)
+- ``<hub>/<front>/refs.json``              ``{"files": {rel: {"sha256", "size", ...}}}``
+
+Identical payloads published by several fronts (or several times by one
+front) cost a single blob, and peers decide what to pull by diffing ref
+manifests against their pull cursor instead of walking and stat'ing outboxes.
+Blobs no longer referenced by any front are removed by ``gc``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Dict, Iterable, List, Set
+
+from tools.transfer_engine import TEMP_SUFFIX, atomic_copy
+
+OBJECTS_DIR = Path(".objects") / "sha256"
+REFS_NAME = "refs.json"
+HASH_CHUNK_BYTES = 1024 * 1024
+SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+Manifest = Dict[str, Dict[str, object]]
+
+
+def is_safe_relpath(key: str) -> bool:
+    """Whether a path read from the shared hub stays inside the directory it is joined to.
+
+    Rejects empty, absolute and drive-qualified paths and any ``..`` part,
+    under both POSIX and Windows parsing (``\\`` is a separator on Windows).
+    """
+    if not key:
+        return False
+    for pure in (PurePosixPath(key), PureWindowsPath(key)):
+        if pure.anchor or ".." in pure.parts:
+            return False
+    return True
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> Manifest:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    files = data.get("files") if isinstance(data, dict) else None
+    if not isinstance(files, dict):
+        return {}
+    return {k: v for k, v in files.items() if isinstance(v, dict)}
+
+
+def save_manifest(path: Path, entries: Manifest) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}{TEMP_SUFFIX}")
+    payload = {"version": 1, "files": dict(sorted(entries.items()))}
+    tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class HubStore:
+    """Blob store plus per-front ref manifests rooted at a hub directory."""
+
+    def __init__(self, hub: Path) -> None:
+        self.hub = hub
+        self.objects_root = hub / OBJECTS_DIR
+        self._claimed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects_root / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        return self.blob_path(digest).is_file()
+
+    def put(self, src: Path, digest: str) -> bool:
+        """Store ``src`` under ``digest``; returns ``False`` when the blob already existed."""
+        blob = self.blob_path(digest)
+        # Concurrent pushers in this process share one writer per digest.
+        with self._lock:
+            if digest in self._claimed:
+                return False
+            self._claimed.add(digest)
+        if blob.is_file():
+            return False
+        try:
+            atomic_copy(src, blob)
+        except BaseException:
+            # Let a later put of the same content retry the write.
+            with self._lock:
+                self._claimed.discard(digest)
+            raise
+        return True
+
+    def fetch(self, digest: str, dst: Path) -> None:
+        atomic_copy(self.blob_path(digest), dst)
+
+    def refs_path(self, front: str) -> Path:
+        return self.hub / front / REFS_NAME
+
+    def load_refs(self, front: str) -> Manifest:
+        return load_manifest(self.refs_path(front))
+
+    def save_refs(self, front: str, refs: Manifest) -> None:
+        save_manifest(self.refs_path(front), refs)
+
+    def fronts_with_refs(self) -> List[str]:
+        if not self.hub.exists():
+            return []
+        return sorted(
+            p.name for p in self.hub.iterdir() if p.is_dir() and not p.name.startswith(".") and (p / REFS_NAME).is_file()
+        )
+
+    def referenced(self, fronts: Iterable[str]) -> Set[str]:
+        digests: Set[str] = set()
+        for front in fronts:
+            digests.update(str(entry.get("sha256")) for entry in self.load_refs(front).values() if entry.get("sha256"))
+        return digests
+
+    def gc(self, *, dry_run: bool = False) -> List[str]:
+        """Remove blobs not referenced by any front's ref manifest; returns their digests."""
+        if not self.objects_root.exists():
+            return []
+        live = self.referenced(self.fronts_with_refs())
+        removed: List[str] = []
+        for shard in sorted(self.objects_root.iterdir()):
+            if not shard.is_dir():
+                continue
+            for blob in sorted(shard.iterdir()):
+                if blob.name.endswith(TEMP_SUFFIX):
+                    continue
+                digest = shard.name + blob.name
+                if digest in live:
+                    continue
+                removed.append(digest)
+                if not dry_run:
+                    blob.unlink(missing_ok=True)
+        return removed
+
+
+__all__ = [
+    "HubStore",
+    "OBJECTS_DIR",
+    "REFS_NAME",
+    "SHA256_RE",
+    "file_sha256",
+    "is_safe_relpath",
+    "load_manifest",
+    "save_manifest",
+]
@@ -13,6 +13,7 @@ import time
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
+from tools.exchange_headers import read_header_fields
 from tools.forge.forge_mint_alfa import TELEMETRY_FILE  # type: ignore
 
 QUILT_COMPOSITE_FILE = Path(".toyfoundry") / "telemetry" / "quilt" / "quilt_rollup_all.json"
@@ -49,12 +50,20 @@ def load_json(document: Path) -> Dict:
         raise ValueError(f"Failed to parse {document}: {exc}") from exc
 
 
+def load_header(document: Path, *fields: str) -> Dict:
+    """Read only the top-level ``fields`` of ``document`` (see ``tools.exchange_headers``)."""
+    try:
+        return read_header_fields(document, fields)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Failed to parse {document}: {exc}") from exc
+
+
 def filter_orders(order_paths: Iterable[Path], target: str) -> List[Tuple[Path, Dict]]:
     matching: List[Tuple[Path, Dict]] = []
     for path in order_paths:
-        payload = load_json(path)
-        if payload.get("target") == target:
-            matching.append((path, payload))
+        # Only orders for this target are summarised, so only those are parsed in full.
+        if load_header(path, "target").get("target") == target:
+            matching.append((path, load_json(path)))
     return matching
 
 
@@ -64,8 +73,7 @@ def discover_pending_acks(exchange_root: Path, target: str) -> List[Path]:
         return []
     matches: List[Path] = []
     for path in pending_dir.glob("*.json"):
-        payload = load_json(path)
-        if payload.get("sender") == target:
+        if load_header(path, "sender").get("sender") == target:
             matches.append(path)
     return sorted(matches)
 
@@ -76,8 +84,7 @@ def discover_inbox_reports(exchange_root: Path, target: str) -> List[Path]:
         return []
     matches: List[Path] = []
     for path in inbox_dir.glob("*.json"):
-        payload = load_json(path)
-        if payload.get("origin") == target:
+        if load_header(path, "origin").get("origin") == target:
             matches.append(path)
     return sorted(matches)
 
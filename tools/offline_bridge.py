@@ -22,6 +22,48 @@ Routing rules (pull)
                                                 -> telemetry/emoji_runtime/promoted_samples/**
 - Otherwise                                      -> exchange/inbox/**
 
+Differential push
+- push keeps <hub>/<front>/push_manifest.json (path -> size/mtime_ns/sha256)
+  and only copies files whose content changed; unchanged files are skipped
+  and reported as bytes skipped. Writes land via temp file + atomic rename.
+  Entries for outbox files that were deleted or moved are dropped each push.
+
+Pull cursor
+- pull keeps a per-peer ingest cursor in .toyfoundry/offline_bridge/pull_cursors/
+  (path -> size/mtime_ns/sha256) and only transfers new or changed peer files.
+  `reconcile` lists cursor entries whose hub file was removed upstream
+  (--prune drops them); `pull --full` ignores the cursor.
+
+Content-addressed hub store (optional)
+- With `push --store cas` (or SHAGI_HUB_STORE=cas / exchange/config.json
+  "hub_store": "cas") a front publishes blobs under <hub>/.objects/sha256/
+  plus a <hub>/<front>/refs.json ref manifest instead of outbox copies, so
+  identical payloads are stored once. pull reads peers' refs.json alongside
+  their outboxes and diffs it against the pull cursor by digest. `gc` drops
+  blobs no front references any more.
+
+Bundle transport
+- `push --bundle` packs the outbox delta (vs <hub>/<front>/bundle_manifest.json)
+  into one compressed, checksummed zip with an index under
+  <hub>/<front>/bundles/; pull unpacks peers' bundles in one read each.
+  Bundles are staged locally and copied with resume-from-partial, so an
+  interrupted push or pull continues where it stopped on the next run.
+- pull records the bundles it ingested in <hub>/<front>/bundle_acks.json;
+  push deletes its own published bundles once every peer front on the hub
+  has acknowledged them, and pull drops cursor entries for bundles that are
+  gone.
+
+Routing
+- Pull routing and the inbox sorter share tools.exchange_router: built-in
+  rules plus optional router_rules.json globs compiled once into combined
+  regexes and cached until a rules file's mtime changes.
+
+Transfers
+- push and pull are tools.sync_engine pipelines (discover -> transfer ->
+  ingest -> sort -> ledger) on top of tools.transfer_engine: a bounded thread
+  pool (--workers) that interleaves peers fairly and reports progress in
+  batches. Pass --verbose for the old per-file lines.
+
 Front identity
 - SHAGI_FRONT env var, or workspace folder name.
 
@@ -34,15 +76,41 @@ from __future__ import annotations
 
 import argparse
 import os
-import shutil
+import sys
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional, Tuple, List, Dict
 import json
-import fnmatch
+
+try:
+    from tools import bridge_bundle
+    from tools.exchange_router import get_router
+    from tools.hub_store import SHA256_RE, HubStore, file_sha256, is_safe_relpath, load_manifest, save_manifest
+    from tools.sync_engine import SyncItem, SyncPipeline, SyncReport, iter_tree, resolve_hub
+    from tools.transfer_engine import DEFAULT_WORKERS, TEMP_SUFFIX, TransferEngine, atomic_copy, move_file
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools import bridge_bundle
+    from tools.exchange_router import get_router
+    from tools.hub_store import SHA256_RE, HubStore, file_sha256, is_safe_relpath, load_manifest, save_manifest
+    from tools.sync_engine import SyncItem, SyncPipeline, SyncReport, iter_tree, resolve_hub
+    from tools.transfer_engine import DEFAULT_WORKERS, TEMP_SUFFIX, TransferEngine, atomic_copy, move_file
 
 
 DEFAULT_HUB = Path("C:/Users/Admin/high_command_exchange")
+PUSH_MANIFEST_NAME = "push_manifest.json"
+PULL_CURSOR_DIR = Path(".toyfoundry") / "offline_bridge" / "pull_cursors"
+HUB_STORES = ("files", "cas")
+BUNDLE_DIR_NAME = "bundles"
+BUNDLE_MANIFEST_NAME = "bundle_manifest.json"
+BUNDLE_ACKS_NAME = "bundle_acks.json"
+BUNDLE_OUTGOING_DIR = Path(".toyfoundry") / "offline_bridge" / "outgoing"
+BUNDLE_INCOMING_DIR = Path(".toyfoundry") / "offline_bridge" / "incoming"
+# Cursor keys for bundles use a prefix no outbox-relative path can start with.
+BUNDLE_CURSOR_PREFIX = ":bundle:"
 
 
 @dataclass
@@ -50,6 +118,12 @@ class BridgeConfig:
     hub: Path
     front: str
     repo_root: Path
+    workers: int = DEFAULT_WORKERS
+    verbose: bool = False
+    store: str = "files"
+
+    def engine(self, label: str) -> TransferEngine:
+        return TransferEngine(workers=self.workers, label=label)
 
 
 def _load_config(repo_root: Path) -> Dict[str, object]:
@@ -70,8 +144,7 @@ def load_hub_from_config(repo_root: Path) -> Optional[Path]:
 
 def resolve_config() -> BridgeConfig:
     repo_root = Path(__file__).resolve().parents[1]
-    env_hub = os.getenv("SHAGI_EXCHANGE_PATH")
-    hub = Path(env_hub) if env_hub else (load_hub_from_config(repo_root) or DEFAULT_HUB)
+    hub = resolve_hub(repo_root, default=DEFAULT_HUB, config_keys=("upstream_root",))
     # SHAGI_FRONT precedence: env -> exchange/config.json.front -> repo folder name
     cfg_front: Optional[str] = None
     try:
@@ -83,208 +156,687 @@ def resolve_config() -> BridgeConfig:
     except Exception:
         cfg_front = None
     front = os.getenv("SHAGI_FRONT") or cfg_front or repo_root.name
-    return BridgeConfig(hub=hub, front=front, repo_root=repo_root)
+    # SHAGI_HUB_STORE precedence: env -> exchange/config.json.hub_store -> plain files
+    data = _load_config(repo_root)
+    cfg_store = data.get("hub_store") if isinstance(data, dict) else None
+    store = os.getenv("SHAGI_HUB_STORE") or (cfg_store if isinstance(cfg_store, str) else None) or "files"
+    if store not in HUB_STORES:
+        print(f"[WARN] Unknown hub store {store!r}; using plain files")
+        store = "files"
+    return BridgeConfig(hub=hub, front=front, repo_root=repo_root, store=store)
 
 
 def _iter_files(root: Path) -> Iterable[Path]:
     if not root.exists():
         return []
     for p in root.rglob("*"):
-        if p.is_file():
+        # Skip in-flight temp files written by another bridge run
+        if p.is_file() and not p.name.endswith(TEMP_SUFFIX):
             yield p
 
 
-def _copy_file(src: Path, dst: Path) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
-
-
-def _move_file(src: Path, dst: Path) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.move(str(src), str(dst))
-
-
-def push(cfg: BridgeConfig) -> int:
+@dataclass
+class PushStats:
+    copied: int = 0
+    skipped: int = 0
+    bytes_copied: int = 0
+    bytes_skipped: int = 0
+
+
+def _run_push_pipeline(cfg: BridgeConfig, local_outbox: Path, push_one, record) -> SyncReport:
+    """Stream the local outbox through ``push_one``; each file is stat'ed once, at discovery."""
+    report = SyncPipeline(
+        discover=lambda: iter_tree(local_outbox, group=cfg.front),
+        transfer=push_one,
+        workers=cfg.workers,
+        label="push",
+        on_transferred=record,
+    ).run()
+    for item in report.failed:
+        print(f"[WARN] Failed to push {item.source}: {'; '.join(item.errors)}")
+    return report
+
+
+def _prune_manifest(manifest: Dict[str, Dict[str, object]], present: Iterable[str]) -> int:
+    """Drop entries for outbox files that were deleted or moved; returns how many were dropped."""
+    keep = set(present)
+    gone = [key for key in manifest if key not in keep]
+    for key in gone:
+        del manifest[key]
+    return len(gone)
+
+
+def _push_is_current(src: Path, dst: Path, st: os.stat_result, entry: Optional[Dict[str, object]]) -> Tuple[bool, Optional[str]]:
+    """Decide whether ``dst`` already holds ``src``; returns (current, sha256 if computed)."""
+    try:
+        hub_size = dst.stat().st_size
+    except FileNotFoundError:
+        return False, None
+    if hub_size != st.st_size:
+        return False, None
+    if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return True, str(entry.get("sha256") or "") or None
+    digest = file_sha256(src)
+    if entry and entry.get("sha256") == digest:
+        return True, digest
+    if not entry:
+        # No manifest record yet (first differential run): compare hub content once.
+        return file_sha256(dst) == digest, digest
+    return False, digest
+
+
+def _push_to_store(cfg: BridgeConfig, local_outbox: Path, *, force: bool) -> int:
+    store = HubStore(cfg.hub)
+    refs = {} if force else store.load_refs(cfg.front)
+
+    def _push_one(item: SyncItem) -> Tuple[str, Dict[str, object], bool]:
+        key = item.rel
+        st = item.ensure_stat()
+        entry = refs.get(key)
+        if (
+            entry
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and store.has(str(entry.get("sha256")))
+        ):
+            return key, entry, False
+        digest = file_sha256(item.source)
+        written = store.put(item.source, digest)
+        return key, {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}, written
+
+    stats = PushStats()
+
+    def _record(item: SyncItem, result: Tuple[str, Dict[str, object], bool]) -> None:
+        key, entry, written = result
+        refs[key] = entry
+        size = int(entry["size"])
+        if written:
+            stats.copied += 1
+            stats.bytes_copied += size
+            if cfg.verbose:
+                print(f"PUSH {item.source} -> {store.blob_path(str(entry['sha256']))}")
+        else:
+            stats.skipped += 1
+            stats.bytes_skipped += size
+
+    _run_push_pipeline(cfg, local_outbox, _push_one, _record)
+
+    store.save_refs(cfg.front, refs)
+    print(
+        f"[OK] Stored {stats.copied} new blob(s) ({stats.bytes_copied} bytes) for {len(refs)} ref(s) "
+        f"in {store.refs_path(cfg.front)}; skipped {stats.skipped} unchanged or duplicate file(s) "
+        f"({stats.bytes_skipped} bytes)"
+    )
+    return stats.copied
+
+
+def _publish_bundle(staged: Path, hub_bundles: Path, manifest: Dict[str, Dict[str, object]]) -> int:
+    """Copy a staged bundle to the hub (resuming if needed) and fold its index into ``manifest``."""
+    digest = bridge_bundle.read_checksum(staged) or file_sha256(staged)
+    published = hub_bundles / staged.name
+    sent = bridge_bundle.resumable_copy(staged, published, digest)
+    # The sidecar is written last: peers only pick up bundles that have one.
+    bridge_bundle.write_checksum(published, digest)
+    for member in bridge_bundle.read_index(staged):
+        manifest[member.path] = {"size": member.size, "mtime_ns": member.mtime_ns, "sha256": member.sha256}
+    bridge_bundle.checksum_path(staged).unlink(missing_ok=True)
+    staged.unlink()
+    return sent
+
+
+def _prune_acknowledged_bundles(cfg: BridgeConfig, hub_bundles: Path) -> int:
+    """Delete this front's published bundles that every peer front has acknowledged pulling."""
+    peers = _peer_dirs(cfg)
+    if not peers or not hub_bundles.is_dir():
+        return 0
+    acks = [load_manifest(peer / BUNDLE_ACKS_NAME) for peer in peers]
+    pruned = 0
+    for bundle in sorted(hub_bundles.glob(f"*{bridge_bundle.BUNDLE_SUFFIX}")):
+        digest = bridge_bundle.read_checksum(bundle)
+        key = f"{cfg.front}/{bundle.name}"
+        if digest is None or any((peer_acks.get(key) or {}).get("sha256") != digest for peer_acks in acks):
+            continue
+        # Sidecar first: without it peers treat the bundle as unpublished.
+        bridge_bundle.checksum_path(bundle).unlink(missing_ok=True)
+        bundle.unlink(missing_ok=True)
+        pruned += 1
+    return pruned
+
+
+def _push_bundle(cfg: BridgeConfig, local_outbox: Path, *, force: bool) -> int:
+    hub_front = cfg.hub / cfg.front
+    hub_bundles = hub_front / BUNDLE_DIR_NAME
+    manifest_path = hub_front / BUNDLE_MANIFEST_NAME
+    manifest = {} if force else load_manifest(manifest_path)
+    outgoing = cfg.repo_root / BUNDLE_OUTGOING_DIR / cfg.front
+    bytes_sent = 0
+    published = 0
+
+    # Finish bundles left behind by an interrupted push before computing a new delta.
+    for staged in sorted(outgoing.glob(f"*{bridge_bundle.BUNDLE_SUFFIX}")):
+        print(f"[INFO] Resuming interrupted bundle {staged.name}")
+        bytes_sent += _publish_bundle(staged, hub_bundles, manifest)
+        published += 1
+
+    delta: List[Tuple[str, Path]] = []
+    present: List[str] = []
+    stats = PushStats()
+    for f in _iter_files(local_outbox):
+        key = f.relative_to(local_outbox).as_posix()
+        present.append(key)
+        st = f.stat()
+        entry = manifest.get(key)
+        unchanged = bool(entry) and entry.get("size") == st.st_size and (
+            entry.get("mtime_ns") == st.st_mtime_ns or entry.get("sha256") == file_sha256(f)
+        )
+        if unchanged:
+            stats.skipped += 1
+            stats.bytes_skipped += st.st_size
+        else:
+            delta.append((key, f))
+            stats.copied += 1
+            stats.bytes_copied += st.st_size
+
+    if delta:
+        staged = outgoing / bridge_bundle.new_bundle_name(cfg.front)
+        bridge_bundle.build_bundle(delta, staged)
+        if cfg.verbose:
+            for key, f in delta:
+                print(f"BUNDLE {f} -> {staged.name}:{key}")
+        bytes_sent += _publish_bundle(staged, hub_bundles, manifest)
+        published += 1
+
+    _prune_manifest(manifest, present)
+    save_manifest(manifest_path, manifest)
+    pruned = _prune_acknowledged_bundles(cfg, hub_bundles)
+    print(
+        f"[OK] Bundled {stats.copied} file(s) ({stats.bytes_copied} bytes) into {published} bundle(s) "
+        f"({bytes_sent} bytes sent) at {hub_bundles}; skipped {stats.skipped} unchanged file(s) "
+        f"({stats.bytes_skipped} bytes); pruned {pruned} bundle(s) every peer has pulled"
+    )
+    return stats.copied
+
+
+def push(cfg: BridgeConfig, *, force: bool = False, store: Optional[str] = None, bundle: bool = False) -> int:
     local_outbox = cfg.repo_root / "exchange" / "outbox"
     if not local_outbox.exists():
         print(f"[WARN] Local outbox not found: {local_outbox}")
         return 0
+    if bundle:
+        return _push_bundle(cfg, local_outbox, force=force)
+    if (store or cfg.store) == "cas":
+        return _push_to_store(cfg, local_outbox, force=force)
+
+    hub_front = cfg.hub / cfg.front
+    hub_outbox = hub_front / "outbox"
+    manifest_path = hub_front / PUSH_MANIFEST_NAME
+    manifest = {} if force else load_manifest(manifest_path)
+
+    def _push_one(item: SyncItem) -> Tuple[str, Dict[str, object], bool]:
+        key = item.rel
+        f = item.source
+        dst = hub_outbox / key
+        st = item.ensure_stat()
+        current, digest = (False, None) if force else _push_is_current(f, dst, st, manifest.get(key))
+        if not current:
+            atomic_copy(f, dst)
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest or file_sha256(f)}
+        return key, entry, not current
+
+    stats = PushStats()
+
+    def _record(item: SyncItem, result: Tuple[str, Dict[str, object], bool]) -> None:
+        key, entry, copied = result
+        manifest[key] = entry
+        size = int(entry["size"])
+        if copied:
+            stats.copied += 1
+            stats.bytes_copied += size
+            if cfg.verbose:
+                print(f"PUSH {item.source} -> {hub_outbox / key}")
+        else:
+            stats.skipped += 1
+            stats.bytes_skipped += size
+
+    report = _run_push_pipeline(cfg, local_outbox, _push_one, _record)
+
+    _prune_manifest(manifest, (item.rel for item in report.items))
+    save_manifest(manifest_path, manifest)
+    print(
+        f"[OK] Pushed {stats.copied} file(s) ({stats.bytes_copied} bytes) to hub: {hub_outbox}; "
+        f"skipped {stats.skipped} unchanged file(s) ({stats.bytes_skipped} bytes)"
+    )
+    return stats.copied
 
-    hub_outbox = cfg.hub / cfg.front / "outbox"
-    count = 0
-    for f in _iter_files(local_outbox):
-        rel = f.relative_to(local_outbox)
-        dst = hub_outbox / rel
-        _copy_file(f, dst)
-        print(f"PUSH {f} -> {dst}")
-        count += 1
 
-    print(f"[OK] Pushed {count} file(s) to hub: {hub_outbox}")
-    return count
+def _route_pull_destination(cfg: BridgeConfig, peer_rel_under_outbox: Path) -> Tuple[Path, str]:
+    return get_router(cfg.repo_root).route_pull(peer_rel_under_outbox)
 
 
-def _route_pull_destination(cfg: BridgeConfig, peer_rel_under_outbox: Path) -> Tuple[Path, str]:
-    parts = tuple(part.lower() for part in peer_rel_under_outbox.parts)
-
-    # reports -> exchange/reports/inbox/[rest after 'reports']
-    if "reports" in parts:
-        idx = parts.index("reports")
-        tail = Path(*peer_rel_under_outbox.parts[idx + 1 :])
-        dest = cfg.repo_root / "exchange" / "reports" / "inbox" / tail
-        return dest, "reports/inbox"
-
-    # acknowledgements -> exchange/acknowledgements/[same structure]
-    if "acknowledgements" in parts:
-        idx = parts.index("acknowledgements")
-        tail = Path(*peer_rel_under_outbox.parts[idx + 1 :])
-        dest = cfg.repo_root / "exchange" / "acknowledgements" / tail
-        return dest, "acknowledgements"
-
-    # orders/<state> -> exchange/orders/<state>/[rest after state]
-    if len(parts) >= 2 and parts[0] == "orders" and parts[1] in {"pending", "dispatched", "completed"}:
-        state = parts[1]
-        tail = Path(*peer_rel_under_outbox.parts[2:])
-        dest = cfg.repo_root / "exchange" / "orders" / state / tail
-        return dest, f"orders/{state}"
-
-    # telemetry/emoji_runtime/promoted_samples -> telemetry/emoji_runtime/promoted_samples/[tail]
-    if len(parts) >= 3 and parts[0] == "telemetry" and parts[1] == "emoji_runtime" and parts[2] == "promoted_samples":
-        tail = Path(*peer_rel_under_outbox.parts[3:])
-        dest = cfg.repo_root / "telemetry" / "emoji_runtime" / "promoted_samples" / tail
-        return dest, "telemetry/emoji_runtime/promoted_samples"
-
-    # default inbox catch-all under exchange/inbox
-    dest = cfg.repo_root / "exchange" / "inbox" / peer_rel_under_outbox
-    return dest, "exchange/inbox"
-
-
-def pull(cfg: BridgeConfig, *, move: bool = False) -> int:
-    if not cfg.hub.exists():
-        print(f"[WARN] Hub path does not exist: {cfg.hub}")
-        return 0
+@dataclass
+class PullJob:
+    peer: str
+    rel: Path
+    src: Path
+    dst: Optional[Path]
+    bucket: str
+    size: int = 0
+    mtime_ns: int = 0
+    # Set for jobs sourced from a peer's refs.json; ``src`` is then the blob.
+    sha256: Optional[str] = None
 
-    count = 0
-    for peer in sorted(p for p in cfg.hub.iterdir() if p.is_dir() and p.name != cfg.front):
+    @property
+    def key(self) -> str:
+        return self.rel.as_posix()
+
+
+def _peer_dirs(cfg: BridgeConfig) -> List[Path]:
+    # Dot-directories (e.g. the .objects blob store) are hub internals, not fronts.
+    return sorted(
+        p for p in cfg.hub.iterdir() if p.is_dir() and p.name != cfg.front and not p.name.startswith(".")
+    )
+
+
+def _cursor_path(cfg: BridgeConfig, peer: str) -> Path:
+    return cfg.repo_root / PULL_CURSOR_DIR / f"{peer}.json"
+
+
+def load_pull_cursor(cfg: BridgeConfig, peer: str) -> Dict[str, Dict[str, object]]:
+    return load_manifest(_cursor_path(cfg, peer))
+
+
+def _cursor_matches_stat(entry: Optional[Dict[str, object]], job: PullJob) -> bool:
+    if not entry:
+        return False
+    if job.sha256 is not None:
+        return entry.get("sha256") == job.sha256
+    return entry.get("size") == job.size and entry.get("mtime_ns") == job.mtime_ns
+
+
+def _collect_pull_jobs(cfg: BridgeConfig) -> List[PullJob]:
+    """List peer files to ingest; when peers publish the same destination the later peer wins."""
+    jobs: Dict[Path, PullJob] = {}
+    shadowed: List[PullJob] = []
+    router = get_router(cfg.repo_root)
+    store = HubStore(cfg.hub)
+
+    def _add(job: PullJob) -> None:
+        previous = jobs.get(job.dst)
+        if previous is not None:
+            previous.dst = None
+            shadowed.append(previous)
+        jobs[job.dst] = job
+
+    for peer in _peer_dirs(cfg):
         peer_outbox = peer / "outbox"
-        if not peer_outbox.exists():
-            continue
         for f in _iter_files(peer_outbox):
             rel = f.relative_to(peer_outbox)
-            dst, bucket = _route_pull_destination(cfg, rel)
-            _copy_file(f, dst)
-            action = "MOVE" if move else "COPY"
-            print(f"PULL {action} {peer.name}:{rel} -> {dst} [{bucket}]")
+            dst, bucket = router.route_pull(rel)
+            st = f.stat()
+            _add(PullJob(peer.name, rel, f, dst, bucket, st.st_size, st.st_mtime_ns))
+        # Content-addressed publications: the ref manifest replaces walking the outbox.
+        for key, entry in store.load_refs(peer.name).items():
+            digest = entry.get("sha256")
+            if not isinstance(digest, str) or not SHA256_RE.fullmatch(digest):
+                continue
+            if not is_safe_relpath(key):
+                # refs.json lives on the shared hub; never let a key route outside the workspace.
+                print(f"[WARN] Skipping unsafe ref path from {peer.name}: {key!r}")
+                continue
+            rel = Path(key)
+            dst, bucket = router.route_pull(rel)
+            _add(PullJob(peer.name, rel, store.blob_path(digest), dst, bucket, int(entry.get("size") or 0), 0, digest))
+    return shadowed + list(jobs.values())
+
+
+def sort_inbox(cfg: BridgeConfig) -> int:
+    """Promote known artifacts from exchange/inbox into their routed folders."""
+    inbox_root = cfg.repo_root / "exchange" / "inbox"
+    if not inbox_root.exists():
+        return 0
+    router = get_router(cfg.repo_root)
+    moves: Dict[Path, List[Path]] = {}
+    for f in _iter_files(inbox_root):
+        dest = router.route_inbox(f.name)
+        if dest is not None:
+            # Same-named files share a destination; moving them in walk order leaves the last one
+            # there, as the sequential sorter did, without stranding the others in the inbox.
+            moves.setdefault(dest, []).append(f)
+
+    promoted = 0
+
+    def _move_all(job: Tuple[Path, List[Path]]) -> List[Tuple[Path, Optional[BaseException]]]:
+        dest, sources = job
+        moved: List[Tuple[Path, Optional[BaseException]]] = []
+        for src in sources:
+            try:
+                move_file(src, dest)
+            except Exception as e:
+                moved.append((src, e))
+            else:
+                moved.append((src, None))
+        return moved
+
+    def _record(outcome) -> None:
+        nonlocal promoted
+        dest, sources = outcome.item
+        if not outcome.ok:
+            print(f"[WARN] Failed to sort {sources[0]}: {outcome.error}")
+            return
+        for src, error in outcome.result:
+            if error is not None:
+                print(f"[WARN] Failed to sort {src}: {error}")
+                continue
+            promoted += 1
+            if cfg.verbose:
+                print(f"SORT MOVE {src} -> {dest}")
+
+    cfg.engine("sort").run(
+        ((dest.parent.as_posix(), (dest, sources)) for dest, sources in moves.items()),
+        _move_all,
+        on_done=_record,
+    )
+    return promoted
+
+
+def pull(cfg: BridgeConfig, *, move: bool = False, full: bool = False, ledger: bool = True) -> int:
+    """Pull peers' hub files into local inboxes, then sort the inbox and (with ``ledger``) update the ledger."""
+    if not cfg.hub.exists():
+        print(f"[WARN] Hub path does not exist: {cfg.hub}")
+        return 0
+
+    action = "MOVE" if move else "COPY"
+    jobs = _collect_pull_jobs(cfg)
+    cursors: Dict[str, Dict[str, Dict[str, object]]] = {}
+
+    def _cursor_for(peer: str) -> Dict[str, Dict[str, object]]:
+        if peer not in cursors:
+            cursors[peer] = {} if full else load_pull_cursor(cfg, peer)
+        return cursors[peer]
+
+    skipped = 0
+    bytes_skipped = 0
+    pending: List[PullJob] = []
+    for job in jobs:
+        cursor = _cursor_for(job.peer)
+        # With --move every file must still leave the hub, so only copy mode can drop jobs here.
+        if not move and _cursor_matches_stat(cursor.get(job.key), job):
+            skipped += 1
+            bytes_skipped += job.size
+        else:
+            pending.append(job)
+
+    def _pull_one(job: PullJob) -> Tuple[Optional[Dict[str, object]], bool]:
+        entry = cursors[job.peer].get(job.key)
+        digest: Optional[str] = job.sha256
+        ingested = _cursor_matches_stat(entry, job)
+        if job.sha256 is not None:
+            if not ingested and job.dst is not None:
+                atomic_copy(job.src, job.dst)
+            # Blobs are shared between fronts; --move releases the ref, never the blob.
             if move:
-                try:
-                    f.unlink(missing_ok=True)
-                except Exception as e:
-                    print(f"[WARN] Failed to remove {f}: {e}")
+                return None, not ingested
+            return {"size": job.size, "mtime_ns": job.mtime_ns, "sha256": digest}, not ingested
+        if not ingested and entry and entry.get("size") == job.size:
+            # Touched but possibly identical: one read of the peer file saves a hub->local write.
+            digest = file_sha256(job.src)
+            ingested = digest == entry.get("sha256")
+        if not ingested and job.dst is not None:
+            atomic_copy(job.src, job.dst)
+        if move:
+            try:
+                job.src.unlink(missing_ok=True)
+            except Exception as e:
+                print(f"[WARN] Failed to remove {job.src}: {e}")
+            return None, not ingested
+        if not ingested:
+            digest = file_sha256(job.dst if job.dst is not None else job.src)
+        elif digest is None:
+            digest = str(entry.get("sha256") or "") or None
+        return {"size": job.size, "mtime_ns": job.mtime_ns, "sha256": digest}, not ingested
+
+    count = 0
+    shadowed = 0
+    released: Dict[str, List[str]] = {}
+
+    def _record(item: SyncItem, result: Tuple[Optional[Dict[str, object]], bool]) -> None:
+        nonlocal count, shadowed, skipped, bytes_skipped
+        job: PullJob = item.meta["job"]
+        entry, transferred = result
+        if move and job.sha256 is not None:
+            released.setdefault(job.peer, []).append(job.key)
+        if entry is None:
+            cursors[job.peer].pop(job.key, None)
+        else:
+            cursors[job.peer][job.key] = entry
+        if job.dst is None:
+            # A later peer publishes the same destination; nothing was written locally.
+            shadowed += 1
+            if cfg.verbose:
+                print(f"PULL SKIP {job.peer}:{job.rel} [shadowed]")
+        elif transferred or move:
             count += 1
+            if cfg.verbose:
+                print(f"PULL {action} {job.peer}:{job.rel} -> {job.dst} [{job.bucket}]")
+        else:
+            skipped += 1
+            bytes_skipped += job.size
+
+    def _ingest(report: SyncReport) -> int:
+        nonlocal count
+        for item in report.failed:
+            job = item.meta["job"]
+            print(f"[WARN] Failed to pull {job.peer}:{job.rel}: {'; '.join(item.errors)}")
+        count += _pull_bundles(cfg, _cursor_for, move=move)
+        for peer, cursor in cursors.items():
+            save_manifest(_cursor_path(cfg, peer), cursor)
+        if released:
+            store = HubStore(cfg.hub)
+            for peer, keys in released.items():
+                refs = store.load_refs(peer)
+                for key in keys:
+                    refs.pop(key, None)
+                store.save_refs(peer, refs)
+        print(
+            f"[OK] Pulled {count} file(s) from hub into local inboxes; "
+            f"skipped {skipped} already-ingested file(s) ({bytes_skipped} bytes); "
+            f"skipped {shadowed} shadowed file(s)"
+        )
+        return count
+
+    SyncPipeline(
+        # Pull jobs are collected per peer; materialise them so peers interleave over the whole run.
+        discover=lambda: (
+            SyncItem(source=job.src, rel=job.key, kind=job.bucket, group=job.peer, destination=job.dst, meta={"job": job})
+            for job in pending
+        ),
+        transfer=lambda item: _pull_one(item.meta["job"]),
+        post=[("ingest", _ingest), ("sort", lambda _: _sort_stage(cfg))]
+        + ([("ledger", lambda _: _ledger_stage(cfg))] if ledger else []),
+        workers=cfg.workers,
+        label="pull",
+        stream_discovery=False,
+        on_transferred=_record,
+    ).run()
+    return count
 
-    print(f"[OK] Pulled {count} file(s) from hub into local inboxes")
 
-    # Post-pull sorter: promote known artifacts from exchange/inbox
-    try:
-        inbox_root = cfg.repo_root / "exchange" / "inbox"
-        promoted = 0
-        # Load optional router rules
-        def _load_rules() -> List[Dict[str, str]]:
-            rules: List[Dict[str, str]] = []
-            for candidate in [
-                cfg.repo_root / "exchange" / "router_rules.json",
-                cfg.repo_root / "tools" / "router_rules.json",
-            ]:
-                try:
-                    if candidate.exists():
-                        data = json.loads(candidate.read_text(encoding="utf-8"))
-                        if isinstance(data, list):
-                            for r in data:
-                                if (
-                                    isinstance(r, dict)
-                                    and isinstance(r.get("glob"), str)
-                                    and isinstance(r.get("dest"), str)
-                                ):
-                                    rules.append({"glob": r["glob"], "dest": r["dest"]})
-                except Exception:
-                    # Ignore malformed rules files
-                    pass
-            return rules
-
-        rules = _load_rules()
-        if inbox_root.exists():
-            for f in inbox_root.rglob("*"):
-                if not f.is_file():
-                    continue
-                name = f.name
-                low = name.lower()
-                dest: Optional[Path] = None
-                # Reports
-                if low.startswith("order-") and low.endswith("-report.json"):
-                    dest = cfg.repo_root / "exchange" / "reports" / "inbox" / name
-                # Acknowledgements
-                elif low.startswith("order-") and low.endswith("-ack.json"):
-                    dest = cfg.repo_root / "exchange" / "acknowledgements" / "logged" / name
-                # TF emoji dryrun samples
-                elif name.upper().startswith("TF-EMOJI-DRYRUN") and low.endswith(".json"):
-                    dest = cfg.repo_root / "telemetry" / "emoji_runtime" / "promoted_samples" / name
-                # Externalizable rules (basename glob -> relative dest dir)
-                if dest is None and rules:
-                    for r in rules:
-                        try:
-                            if fnmatch.fnmatch(name, r["glob"]):
-                                dest = cfg.repo_root / Path(r["dest"]) / name
-                                break
-                        except Exception:
-                            continue
-                if dest is not None:
-                    _move_file(f, dest)
-                    print(f"SORT MOVE {f} -> {dest}")
-                    promoted += 1
-        print(f"[OK] Sorted {promoted} inbox file(s)")
-    except Exception as e:
-        print(f"[WARN] Inbox sorting failed: {e}")
-
-    # Update ledger after ingest
+def _sort_stage(cfg: BridgeConfig) -> int:
+    """Post-pull sorter: promote known artifacts from exchange/inbox."""
+    promoted = sort_inbox(cfg)
+    print(f"[OK] Sorted {promoted} inbox file(s)")
+    return promoted
+
+
+def _ledger_stage(cfg: BridgeConfig) -> int:
+    """Update the ledger after ingest."""
     try:
-        try:
-            from tools.ledger_update import update_ledger  # type: ignore
-        except ModuleNotFoundError:
-            import sys as _sys
-            root = str(cfg.repo_root)
-            if root not in _sys.path:
-                _sys.path.insert(0, root)
-            from tools.ledger_update import update_ledger  # type: ignore
-
-        changed = update_ledger(cfg.repo_root)
-        print(f"[OK] Ledger updated ({changed} change(s))")
-    except Exception as e:
-        print(f"[WARN] Ledger update failed: {e}")
-    return count
+        from tools.ledger_update import update_ledger  # type: ignore
+    except ModuleNotFoundError:
+        root = str(cfg.repo_root)
+        if root not in sys.path:
+            sys.path.insert(0, root)
+        from tools.ledger_update import update_ledger  # type: ignore
+
+    changed = update_ledger(cfg.repo_root)
+    print(f"[OK] Ledger updated ({changed} change(s))")
+    return changed
+
+
+def _pull_bundles(cfg: BridgeConfig, cursor_for, *, move: bool) -> int:
+    """Unpack peers' published bundles not yet ingested; returns the number of files extracted.
+
+    Ingested bundles are acknowledged in ``<hub>/<front>/bundle_acks.json`` so
+    their publisher can prune them, and cursor entries for bundles that have
+    left the hub are dropped.
+    """
+    router = get_router(cfg.repo_root)
+    extracted = 0
+    acks: Dict[str, Dict[str, object]] = {}
+    for peer in _peer_dirs(cfg):
+        bundle_dir = peer / BUNDLE_DIR_NAME
+        if not bundle_dir.is_dir():
+            continue
+        cursor = cursor_for(peer.name)
+        bundles = sorted(bundle_dir.glob(f"*{bridge_bundle.BUNDLE_SUFFIX}"))
+        listed = {BUNDLE_CURSOR_PREFIX + bundle.name for bundle in bundles}
+        for key in [key for key in cursor if key.startswith(BUNDLE_CURSOR_PREFIX) and key not in listed]:
+            del cursor[key]  # pruned by its publisher; bundle names are never reused
+        # Names sort by creation time, so later deltas overwrite earlier ones.
+        for bundle in bundles:
+            digest = bridge_bundle.read_checksum(bundle)
+            if digest is None:
+                continue  # still being published
+            key = BUNDLE_CURSOR_PREFIX + bundle.name
+            try:
+                if (cursor.get(key) or {}).get("sha256") != digest:
+                    local = cfg.repo_root / BUNDLE_INCOMING_DIR / peer.name / bundle.name
+                    bridge_bundle.resumable_copy(bundle, local, digest)
+                    for member, data in bridge_bundle.iter_members(local):
+                        dst, bucket = router.route_pull(Path(member.path))
+                        bridge_bundle.write_member(dst, data, member.mtime_ns)
+                        extracted += 1
+                        if cfg.verbose:
+                            print(f"PULL BUNDLE {peer.name}:{bundle.name}:{member.path} -> {dst} [{bucket}]")
+                    local.unlink()
+                    cursor[key] = {"size": bundle.stat().st_size, "mtime_ns": 0, "sha256": digest}
+                if move:
+                    bridge_bundle.checksum_path(bundle).unlink(missing_ok=True)
+                    bundle.unlink(missing_ok=True)
+                    cursor.pop(key, None)
+                else:
+                    acks[f"{peer.name}/{bundle.name}"] = {"sha256": digest}
+            except (OSError, ValueError, zipfile.BadZipFile, bridge_bundle.BundleError) as e:
+                print(f"[WARN] Failed to pull bundle {peer.name}:{bundle.name}: {e}")
+    acks_path = cfg.hub / cfg.front / BUNDLE_ACKS_NAME
+    if acks or acks_path.exists():
+        save_manifest(acks_path, acks)
+    return extracted
+
+
+def reconcile(cfg: BridgeConfig, *, prune: bool = False) -> Dict[str, List[str]]:
+    """Report pull-cursor entries whose peer file no longer exists on the hub."""
+    cursor_root = cfg.repo_root / PULL_CURSOR_DIR
+    removed: Dict[str, List[str]] = {}
+    if not cursor_root.exists():
+        print("[OK] No pull cursors recorded yet")
+        return removed
+    for cursor_file in sorted(cursor_root.glob("*.json")):
+        peer = cursor_file.stem
+        cursor = load_manifest(cursor_file)
+        peer_outbox = cfg.hub / peer / "outbox"
+        refs = HubStore(cfg.hub).load_refs(peer)
+        bundle_dir = cfg.hub / peer / BUNDLE_DIR_NAME
+
+        def _present(key: str) -> bool:
+            if key.startswith(BUNDLE_CURSOR_PREFIX):
+                return (bundle_dir / key[len(BUNDLE_CURSOR_PREFIX) :]).is_file()
+            return key in refs or (peer_outbox / key).is_file()
+
+        gone = sorted(key for key in cursor if not _present(key))
+        if not gone:
+            continue
+        removed[peer] = gone
+        print(f"RECONCILE {peer}: {len(gone)} file(s) removed upstream")
+        for key in gone:
+            print(f"  - {key}")
+        if prune:
+            for key in gone:
+                cursor.pop(key, None)
+            save_manifest(cursor_file, cursor)
+    total = sum(len(keys) for keys in removed.values())
+    verb = "Pruned" if prune else "Found"
+    print(f"[OK] {verb} {total} cursor entr{'y' if total == 1 else 'ies'} for files removed upstream")
+    return removed
+
+
+def gc(cfg: BridgeConfig, *, dry_run: bool = False) -> int:
+    """Remove hub blobs that no front's refs.json references.
+
+    Run while no front is pushing in cas mode: a blob stored moments before
+    its ref manifest is saved would otherwise look unreferenced.
+    """
+    removed = HubStore(cfg.hub).gc(dry_run=dry_run)
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"[OK] {verb} {len(removed)} unreferenced blob(s) from {cfg.hub}")
+    return len(removed)
 
 
 def main() -> int:
     cfg = resolve_config()
 
     parser = argparse.ArgumentParser(description="Bidirectional offline exchange bridge")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent file transfers")
+    parser.add_argument("--verbose", action="store_true", help="Print one line per transferred file")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    sub.add_parser("push", help="Push local exchange/outbox to hub/<front>/outbox")
+    p_push = sub.add_parser("push", help="Push local exchange/outbox to hub/<front>/outbox")
+    p_push.add_argument("--force", action="store_true", help="Copy every file, ignoring the hub push manifest")
+    p_push.add_argument("--store", choices=HUB_STORES, help=f"Hub layout to publish into (default: {cfg.store})")
+    p_push.add_argument("--bundle", action="store_true", help="Publish the outbox delta as one compressed bundle")
 
     p_pull = sub.add_parser("pull", help="Pull peers' outboxes into local inboxes")
     p_pull.add_argument("--move", action="store_true", help="Remove files from hub after successful pull")
+    p_pull.add_argument("--full", action="store_true", help="Ignore the pull cursor and re-copy every peer file")
 
     p_sync = sub.add_parser("sync", help="Push then pull")
     p_sync.add_argument("--move", action="store_true", help="Remove files from hub after successful pull")
+    p_sync.add_argument("--force", action="store_true", help="Copy every file, ignoring the hub push manifest")
+    p_sync.add_argument("--full", action="store_true", help="Ignore the pull cursor and re-copy every peer file")
+    p_sync.add_argument("--store", choices=HUB_STORES, help=f"Hub layout to publish into (default: {cfg.store})")
+    p_sync.add_argument("--bundle", action="store_true", help="Publish the outbox delta as one compressed bundle")
+
+    p_reconcile = sub.add_parser("reconcile", help="Detect pull-cursor entries for files removed upstream")
+    p_reconcile.add_argument("--prune", action="store_true", help="Drop those entries from the cursor")
+
+    p_gc = sub.add_parser("gc", help="Remove content-addressed blobs no front references")
+    p_gc.add_argument("--dry-run", action="store_true", help="List what would be removed")
 
     args = parser.parse_args()
+    cfg.workers = args.workers
+    cfg.verbose = args.verbose
 
     if args.cmd == "push":
-        push(cfg)
+        push(
+            cfg,
+            force=bool(getattr(args, "force", False)),
+            store=getattr(args, "store", None),
+            bundle=bool(getattr(args, "bundle", False)),
+        )
     elif args.cmd == "pull":
-        pull(cfg, move=bool(getattr(args, "move", False)))
+        pull(cfg, move=bool(getattr(args, "move", False)), full=bool(getattr(args, "full", False)))
     elif args.cmd == "sync":
-        push(cfg)
-        pull(cfg, move=bool(getattr(args, "move", False)))
+        push(
+            cfg,
+            force=bool(getattr(args, "force", False)),
+            store=getattr(args, "store", None),
+            bundle=bool(getattr(args, "bundle", False)),
+        )
+        pull(cfg, move=bool(getattr(args, "move", False)), full=bool(getattr(args, "full", False)))
+    elif args.cmd == "reconcile":
+        reconcile(cfg, prune=bool(getattr(args, "prune", False)))
+    elif args.cmd == "gc":
+        gc(cfg, dry_run=bool(getattr(args, "dry_run", False)))
     else:
         parser.print_help()
         return 2
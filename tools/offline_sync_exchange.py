@@ -1,12 +1,17 @@
 # offline_sync_exchange.py — offline exchange sync for Genesis Mesh
 # Works across any workspace; detects and creates missing folders.
 
-import os
-import shutil
+import sys
 from pathlib import Path
 
-# Shared hub path
-EXCHANGE = Path(os.getenv("SHAGI_EXCHANGE_PATH", "C:/Users/Admin/high_command_exchange"))
+try:
+    from tools.sync_engine import SyncPipeline, iter_tree, resolve_hub, write_item
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from tools.sync_engine import SyncPipeline, iter_tree, resolve_hub, write_item
+
+SYNC_KINDS = ("orders", "reports")
+
 
 def sync_local(workspace_root: str):
     """
@@ -14,38 +19,51 @@ def sync_local(workspace_root: str):
     into the shared high_command_exchange hub. Creates target folders if missing.
     """
     ws = Path(workspace_root)
+    # Shared hub path: SHAGI_EXCHANGE_PATH -> default (this tool never read exchange/config.json)
+    exchange = resolve_hub(ws, config_keys=())
 
     # Define source folders
-    source_folders = {
-        "orders": ws / "outbox" / "orders",
-        "reports": ws / "outbox" / "reports",
-    }
-
+    source_folders = {name: ws / "outbox" / name for name in SYNC_KINDS}
     for name, src in source_folders.items():
-        dst = EXCHANGE / name
         if not src.exists():
             print(f"[WARN] No {name} folder found in outbox: {src}")
-            continue
 
+    def _discover():
+        for name, src in source_folders.items():
+            yield from iter_tree(src, "**/*.*", kind=name)
+
+    files_copied = {name: 0 for name in SYNC_KINDS}
+
+    def _copied(item, _result):
+        print(f"Copied {item.source} -> {item.destination}")
+        files_copied[item.kind] += 1
+
+    def _transfer(item):
+        item.destination = exchange / item.kind / item.rel
+        write_item(item, item.destination)
+
+    report = SyncPipeline(
+        discover=_discover,
+        transfer=_transfer,
+        label="offline_sync",
+        on_transferred=_copied,
+    ).run()
+    for item in report.failed:
+        print(f"[WARN] Failed to copy {item.source}: {'; '.join(item.errors)}")
+
+    for name, src in source_folders.items():
+        if not src.exists():
+            continue
+        dst = exchange / name
         # Ensure destination folder exists
-        os.makedirs(dst, exist_ok=True)
-
-        files_copied = 0
-        for f in src.glob("**/*.*"):
-            if f.is_file():
-                rel_path = f.relative_to(src)
-                dst_file = dst / rel_path
-                dst_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(f, dst_file)
-                print(f"Copied {f} -> {dst_file}")
-                files_copied += 1
-
-        if files_copied == 0:
+        dst.mkdir(parents=True, exist_ok=True)
+        if files_copied[name] == 0:
             print(f"[INFO] No new {name} files to sync from {src}")
         else:
-            print(f"[OK] Synced {files_copied} {name} file(s) to {dst}")
+            print(f"[OK] Synced {files_copied[name]} {name} file(s) to {dst}")
 
     print("[OK] Local exchange sync complete.")
+    return report
 
 
 if __name__ == "__main__":
@@ -0,0 +1,335 @@
+"""Versioned schema registry with generated, cached validators.
+
+Every exchange document and internal payload shape Toyfoundry checks is
+declared once here as a JSON-Schema subset (``type``, ``required``,
+``properties``, ``items``, ``enum``, ``minimum``, ``minLength``,
+``minItems`` and ``$ref`` to another registered schema) plus ``notBlank``,
+which rejects strings that are empty or whitespace only. The first call to
+``get_validator(name)`` generates straight-line Python source for that
+schema, compiles it and caches the function, so validating a document is a
+handful of dict lookups and ``isinstance`` checks with no schema walking.
+
+A validator returns ``None`` for a valid document or the first problem as a
+message such as ``"telemetry_stub missing 'units_processed'"`` or
+``"telemetry_stub field 'duration_ms' must be int, found str"``; callers
+wrap it in their own exception type.
+
+Shared by ``schema_validator`` (exchange documents), ``factory_order_emitter``
+and ``emoji_runtime_promoter`` (telemetry stubs) and ``alfa_two_monitor``
+(emitted factory orders). Benchmark with
+``python -m tools.benchmarks.bench_schema_registry``.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+Validator = Callable[[Any], Optional[str]]
+
+_STRING = {"type": "string"}
+_COUNT = {"type": "integer", "minimum": 0}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "telemetry-stub@1.0": {
+        "title": "telemetry_stub",
+        "type": "object",
+        "required": ["batch_id", "ritual", "units_processed", "status", "duration_ms"],
+        "properties": {
+            "batch_id": _STRING,
+            "ritual": _STRING,
+            "units_processed": _COUNT,
+            "status": _STRING,
+            "duration_ms": _COUNT,
+        },
+    },
+    "high-command-order@1.0": {
+        "type": "object",
+        "required": ["order_id", "target", "directives", "timestamp_issued"],
+        "properties": {
+            "order_id": _STRING,
+            "target": _STRING,
+            "directives": {"type": "array", "items": {"type": "object"}},
+            "timestamp_issued": _STRING,
+        },
+    },
+    "factory-order@1.0": {
+        "type": "object",
+        "required": ["order_id", "target", "directives", "timestamp_issued"],
+        "properties": {
+            "order_id": _STRING,
+            "target": _STRING,
+            "directives": {"type": "array"},
+            "timestamp_issued": _STRING,
+            "glyph_chain": _STRINGS,
+            "intent": {"type": "object"},
+            "telemetry_stub": {"$ref": "telemetry-stub@1.0"},
+            "narration": {"type": "object"},
+        },
+    },
+    # factory-order@1.0 documents as factory_order_emitter / emoji_runtime_promoter write
+    # them: directives are only present when the source payload carried some.
+    "factory-order-emission@1.0": {
+        "type": "object",
+        "required": ["order_id", "target", "timestamp_issued", "summary", "glyph_chain", "telemetry_stub", "narration"],
+        "properties": {
+            "order_id": {"type": "string", "notBlank": True},
+            "target": _STRING,
+            "timestamp_issued": _STRING,
+            "summary": _STRING,
+            "glyph_chain": _STRINGS,
+            "intent": {"type": "object"},
+            "telemetry_stub": {"$ref": "telemetry-stub@1.0"},
+            "narration": {
+                "type": "object",
+                "properties": {"line": {"type": ["string", "null"]}, "beats": {"type": ["array", "null"]}},
+            },
+            "directives": {"type": "array"},
+        },
+    },
+    "emoji-runtime@1.0": {
+        "title": "emoji-runtime payload",
+        "type": "object",
+        "required": ["summary", "intent", "telemetry_stub"],
+        "properties": {
+            "summary": {"type": "string", "notBlank": True},
+            "glyph_chain": _STRINGS,
+            "intent": {"type": "object"},
+            "telemetry_stub": {"$ref": "telemetry-stub@1.0"},
+        },
+    },
+    "signal-ack@1.0": {
+        "type": "object",
+        "required": ["ack_id", "referenced_id", "sender", "receiver", "status"],
+        "properties": {
+            "ack_id": _STRING,
+            "referenced_id": _STRING,
+            "sender": _STRING,
+            "receiver": _STRING,
+            "status": _STRING,
+        },
+    },
+    "field-report@1.0": {
+        "type": "object",
+        "required": ["report_id", "origin", "relates_to", "status"],
+        "properties": {"report_id": _STRING, "origin": _STRING, "status": _STRING},
+    },
+    "factory-report@1.0": {
+        "type": "object",
+        "required": ["order_id", "reported_by", "timestamp_reported", "status"],
+        "properties": {
+            "order_id": _STRING,
+            "reported_by": _STRING,
+            "timestamp_reported": _STRING,
+            "status": _STRING,
+        },
+    },
+}
+
+# JSON type -> (isinstance check on ``{v}``, Python name used in messages)
+_TYPE_CHECKS = {
+    "object": ("isinstance({v}, dict)", "dict"),
+    "array": ("isinstance({v}, list)", "list"),
+    "string": ("isinstance({v}, str)", "str"),
+    "integer": ("(isinstance({v}, int) and not isinstance({v}, bool))", "int"),
+    "number": ("(isinstance({v}, (int, float)) and not isinstance({v}, bool))", "float"),
+    "boolean": ("isinstance({v}, bool)", "bool"),
+    "null": ("{v} is None", "None"),
+}
+MAX_REF_DEPTH = 8
+MAX_NESTING = 64
+
+
+class UnknownSchemaError(KeyError):
+    """Raised when a schema name is not registered."""
+
+
+class _Generator:
+    """Emits the body of one validator function as Python source lines.
+
+    ``subject`` arguments are Python expressions evaluating to the message
+    prefix for the value being checked (``"telemetry_stub field 'status'"``,
+    ``"glyph_chain[" + str(i) + "]"``); ``label`` names an object in messages
+    about its own keys.
+    """
+
+    def __init__(self, registry: "SchemaRegistry") -> None:
+        self.registry = registry
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {"MISSING": _MISSING}
+        self._names = 0
+
+    def _var(self) -> str:
+        self._names += 1
+        return f"v{self._names}"
+
+    def _const(self, value: Any) -> str:
+        name = f"C{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def _resolve(self, schema: Mapping[str, Any]) -> Mapping[str, Any]:
+        depth = 0
+        while "$ref" in schema:
+            depth += 1
+            if depth > MAX_REF_DEPTH:
+                raise ValueError(f"$ref nesting deeper than {MAX_REF_DEPTH}: {schema['$ref']}")
+            schema = self.registry.schema(schema["$ref"])
+        return schema
+
+    def _fail(self, indent: int, condition: str, subject: str, text: str) -> None:
+        self.emit(indent, f"if {condition}:")
+        self.emit(indent + 1, f"return {subject} + {text!r}")
+
+    def value(self, schema: Mapping[str, Any], var: str, subject: str, label: str, root: bool, indent: int) -> None:
+        if indent > MAX_NESTING:
+            raise ValueError(f"schema nests deeper than {MAX_NESTING} levels (recursive $ref?) at {label}")
+        schema = self._resolve(schema)
+        types = schema.get("type")
+        if types is not None:
+            names = [types] if isinstance(types, str) else list(types)
+            check = " or ".join(_TYPE_CHECKS[name][0].format(v=var) for name in names)
+            expected = " or ".join(_TYPE_CHECKS[name][1] for name in names)
+            self.emit(indent, f"if not ({check}):")
+            self.emit(indent + 1, f"return {subject} + {f' must be {expected}, found '!r} + type({var}).__name__")
+        if "enum" in schema:
+            allowed = sorted(map(str, schema["enum"]))
+            try:
+                members = self._const(frozenset(schema["enum"]))
+                # Unhashable values (lists, dicts) cannot be in a set of hashable members.
+                condition = f"{var}.__hash__ is None or {var} not in {members}"
+            except TypeError:
+                # Unhashable enum members: fall back to an equality scan.
+                condition = f"{var} not in {self._const(tuple(schema['enum']))}"
+            self._fail(indent, condition, subject, f" must be one of {allowed}")
+        if "minimum" in schema:
+            minimum = schema["minimum"]
+            text = " must be non-negative" if minimum == 0 else f" must be >= {minimum}"
+            self._fail(indent, f"isinstance({var}, (int, float)) and {var} < {minimum!r}", subject, text)
+        if "minLength" in schema:
+            length = int(schema["minLength"])
+            self._fail(indent, f"isinstance({var}, str) and len({var}) < {length}", subject, f" must have at least {length} character(s)")
+        if schema.get("notBlank"):
+            self._fail(indent, f"isinstance({var}, str) and not {var}.strip()", subject, " cannot be empty")
+        if "minItems" in schema:
+            count = int(schema["minItems"])
+            self._fail(indent, f"isinstance({var}, list) and len({var}) < {count}", subject, f" must have at least {count} item(s)")
+        if "items" in schema:
+            index, item = self._var(), self._var()
+            self.emit(indent, f"if isinstance({var}, list):")
+            self.emit(indent + 1, f"for {index}, {item} in enumerate({var}):")
+            item_subject = f"{label!r} + '[' + str({index}) + ']'"
+            self.value(schema["items"], item, item_subject, f"{label}[]", False, indent + 2)
+        if schema.get("properties") or schema.get("required"):
+            if types == "object":
+                # The type check above already returned for non-objects.
+                self._object(schema, var, label, root, indent)
+            else:
+                self.emit(indent, f"if isinstance({var}, dict):")
+                self.emit(indent + 1, "pass")
+                self._object(schema, var, label, root, indent + 1)
+
+    def _object(self, schema: Mapping[str, Any], var: str, label: str, root: bool, indent: int) -> None:
+        required = list(schema.get("required", ()))
+        properties: Mapping[str, Any] = schema.get("properties", {})
+        for key in list(properties) + [key for key in required if key not in properties]:
+            value = self._var()
+            self.emit(indent, f"{value} = {var}.get({key!r}, MISSING)")
+            if key not in properties:
+                self._fail(indent, f"{value} is MISSING", repr(label), f" missing {key!r}")
+                continue
+            inner = indent
+            if key in required:
+                self._fail(indent, f"{value} is MISSING", repr(label), f" missing {key!r}")
+            else:
+                self.emit(indent, f"if {value} is not MISSING:")
+                self.emit(indent + 1, "pass")
+                inner += 1
+            child = key if root else f"{label}.{key}"
+            self.value(properties[key], value, repr(f"{label} field {key!r}"), child, False, inner)
+
+
+_MISSING = object()
+
+
+class SchemaRegistry:
+    """Named, versioned schemas plus their lazily generated validators."""
+
+    def __init__(self, schemas: Mapping[str, Mapping[str, Any]] = ()) -> None:
+        self._schemas: Dict[str, Mapping[str, Any]] = dict(schemas)
+        self._validators: Dict[str, Validator] = {}
+        self._sources: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return sorted(self._schemas)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._schemas
+
+    def schema(self, name: str) -> Mapping[str, Any]:
+        try:
+            return self._schemas[name]
+        except KeyError:
+            raise UnknownSchemaError(name) from None
+
+    def register(self, name: str, schema: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._schemas[name] = schema
+            # Schemas may $ref each other, so drop every compiled validator.
+            self._validators.clear()
+            self._sources.clear()
+
+    def _compile(self, name: str) -> Validator:
+        schema = self.schema(name)
+        generator = _Generator(self)
+        label = schema.get("title", "document")
+        generator.value(schema, "data", repr(label), label, True, 1)
+        generator.emit(1, "return None")
+        source = "def validate(data):\n" + "\n".join(generator.lines) + "\n"
+        namespace: Dict[str, Any] = dict(generator.constants)
+        exec(compile(source, f"<schema {name}>", "exec"), namespace)
+        self._sources[name] = source
+        return namespace["validate"]
+
+    def validator(self, name: str) -> Validator:
+        validator = self._validators.get(name)
+        if validator is None:
+            with self._lock:
+                validator = self._validators.get(name)
+                if validator is None:
+                    validator = self._validators[name] = self._compile(name)
+        return validator
+
+    def validate(self, name: str, data: Any) -> Optional[str]:
+        return self.validator(name)(data)
+
+    def source(self, name: str) -> str:
+        """Generated Python source of ``name``'s validator (for debugging)."""
+        self.validator(name)
+        return self._sources[name]
+
+
+REGISTRY = SchemaRegistry(SCHEMAS)
+
+
+def get_validator(name: str) -> Validator:
+    return REGISTRY.validator(name)
+
+
+def validate(name: str, data: Any) -> Optional[str]:
+    return REGISTRY.validator(name)(data)
+
+
+__all__ = [
+    "REGISTRY",
+    "SCHEMAS",
+    "SchemaRegistry",
+    "UnknownSchemaError",
+    "Validator",
+    "get_validator",
+    "validate",
+]
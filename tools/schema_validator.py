@@ -1,86 +1,156 @@
-"""Lightweight validator for High Command exchange payloads."""
+"""Lightweight validator for High Command exchange payloads.
+
+Schemas come from ``tools.schema_registry``, whose generated validators
+cover required keys, field types and nested fields.
+``validate_paths`` validates files and whole directory trees, spreading
+large batches over a process pool.
+"""
 from __future__ import annotations
 
 import argparse
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
-
-SCHEMA_REQUIREMENTS: Dict[str, List[str]] = {
-    "high-command-order@1.0": [
-        "order_id",
-        "target",
-        "directives",
-        "timestamp_issued",
-    ],
-    "factory-order@1.0": [
-        "order_id",
-        "target",
-        "directives",
-        "timestamp_issued",
-    ],
-    "signal-ack@1.0": [
-        "ack_id",
-        "referenced_id",
-        "sender",
-        "receiver",
-        "status",
-    ],
-    "field-report@1.0": [
-        "report_id",
-        "origin",
-        "relates_to",
-        "status",
-    ],
-    "factory-report@1.0": [
-        "order_id",
-        "reported_by",
-        "timestamp_reported",
-        "status",
-    ],
-}
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from tools.schema_registry import REGISTRY, get_validator
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from tools.schema_registry import REGISTRY, get_validator
+
+EXCHANGE_SCHEMAS = (
+    "high-command-order@1.0",
+    "factory-order@1.0",
+    "signal-ack@1.0",
+    "field-report@1.0",
+    "factory-report@1.0",
+)
+# Required keys per exchange schema, as declared in ``tools.schema_registry``.
+SCHEMA_REQUIREMENTS: Dict[str, List[str]] = {name: list(REGISTRY.schema(name)["required"]) for name in EXCHANGE_SCHEMAS}
+
+# Below this many documents the process pool costs more than it saves.
+PARALLEL_THRESHOLD = 256
+CHUNK_SIZE = 128
+
+Check = Callable[[Mapping[str, Any]], Optional[str]]
 
 
 class ValidationError(RuntimeError):
     """Raised when a document fails validation."""
 
 
-def validate_document(path: Path) -> None:
-    data = json.loads(path.read_text(encoding="utf-8"))
+@lru_cache(maxsize=None)
+def compile_validator(schema: str) -> Check:
+    """Check function for ``schema``; it returns the first problem found, or ``None``.
+
+    Missing keys are reported together, as before; types and nested fields are
+    checked by the registry's generated validator.
+    """
+    required = tuple(SCHEMA_REQUIREMENTS[schema])
+    required_set = frozenset(required)
+    generated = get_validator(schema)
+
+    def _check(data: Mapping[str, Any]) -> Optional[str]:
+        if not required_set.issubset(data.keys()):
+            return f"missing required keys {[key for key in required if key not in data]}"
+        return generated(data)
+
+    return _check
+
+
+def validate_payload(data: Any, source: object = "<document>") -> None:
+    """Validate an already-parsed document; raises ``ValidationError`` naming ``source``."""
+    if not isinstance(data, dict):
+        raise ValidationError(f"{source}: document must be a JSON object")
     schema = data.get("schema")
     if not schema:
-        raise ValidationError(f"{path}: missing 'schema' field")
+        raise ValidationError(f"{source}: missing 'schema' field")
+    if schema not in SCHEMA_REQUIREMENTS:
+        raise ValidationError(f"{source}: unknown schema '{schema}'")
+    problem = compile_validator(schema)(data)
+    if problem is not None:
+        raise ValidationError(f"{source}: {problem}")
+
+
+def validate_document(path: Path) -> None:
+    validate_payload(json.loads(path.read_text(encoding="utf-8")), path)
+
 
-    required_fields = SCHEMA_REQUIREMENTS.get(schema)
-    if required_fields is None:
-        raise ValidationError(f"{path}: unknown schema '{schema}'")
+@dataclass
+class ValidationResult:
+    path: Path
+    error: Optional[str] = None
 
-    missing = [field for field in required_fields if field not in data]
-    if missing:
-        raise ValidationError(f"{path}: missing required keys {missing}")
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
-    if schema == "high-command-order@1.0" and not isinstance(data.get("directives"), list):
-        raise ValidationError(f"{path}: directives must be a list")
+
+def _validate_chunk(paths: Sequence[str]) -> List[Tuple[str, Optional[str]]]:
+    results: List[Tuple[str, Optional[str]]] = []
+    for raw in paths:
+        try:
+            validate_document(Path(raw))
+        except (OSError, ValidationError, ValueError) as exc:
+            results.append((raw, str(exc)))
+        else:
+            results.append((raw, None))
+    return results
+
+
+def expand_paths(paths: Iterable[Path], pattern: str = "**/*.json") -> List[Path]:
+    """Expand directories into the JSON documents below them; files pass through unchanged."""
+    expanded: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            expanded.extend(sorted(p for p in path.glob(pattern) if p.is_file()))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def validate_paths(paths: Iterable[Path], *, workers: Optional[int] = None) -> List[ValidationResult]:
+    """Validate files and directory trees, fanning large batches out over a process pool.
+
+    Results keep the input order. ``workers=1`` (or a batch under
+    ``PARALLEL_THRESHOLD``) validates in-process.
+    """
+    documents = [str(p) for p in expand_paths(paths)]
+    if workers == 1 or len(documents) < PARALLEL_THRESHOLD:
+        raw = _validate_chunk(documents)
+    else:
+        chunks = [documents[i : i + CHUNK_SIZE] for i in range(0, len(documents), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            raw = [item for chunk in pool.map(_validate_chunk, chunks) for item in chunk]
+    return [ValidationResult(Path(path), error) for path, error in raw]
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Validate exchange payloads against baseline requirements.")
-    parser.add_argument("paths", nargs="+", type=Path, help="One or more JSON documents to validate.")
+    parser.add_argument("paths", nargs="+", type=Path, help="JSON documents or directories to validate.")
+    parser.add_argument("--workers", type=int, default=None, help="Validation processes for large batches.")
     return parser.parse_args(argv)
 
 
-def main(argv: List[str]) -> int:
-    args = parse_args(argv)
+def report_results(results: Iterable[ValidationResult]) -> int:
+    """Print one pass/fail line per result; returns the number of failures."""
     errors = 0
-    for path in args.paths:
-        try:
-            validate_document(path)
-        except (OSError, ValidationError, json.JSONDecodeError) as exc:
-            errors += 1
-            print(f"Validation failed: {exc}", file=sys.stderr)
+    for result in results:
+        if result.ok:
+            print(f"Validation passed: {result.path}")
         else:
-            print(f"Validation passed: {path}")
+            errors += 1
+            print(f"Validation failed: {result.error}", file=sys.stderr)
+    return errors
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    errors = report_results(validate_paths(args.paths, workers=args.workers))
     return 0 if errors == 0 else 1
 
 
@@ -0,0 +1,350 @@
+"""Shared exchange sync pipeline.
+
+``exchange_all``, ``offline_sync_exchange`` and ``offline_bridge`` used to
+resolve the hub, walk their staged folders, validate and copy files each in
+their own way. They now configure one ``SyncPipeline``:
+
+    discover -> validate -> transfer -> sort -> ledger update
+
+- **discover** yields ``SyncItem`` objects (one ``stat`` per file, taken once);
+- **validate** stages return error strings for an item; they share the
+  item's cached bytes / parsed JSON, so each file is read and parsed once;
+- **transfer** moves a valid item to its destination, writing the cached
+  bytes when the file was already read instead of reading it again;
+- **post** stages (inbox sort, ledger update) run once over the report.
+
+Discovery walks one directory at a time on its own thread and feeds a bounded
+queue, so validation and transfer of early files overlap with walking the rest
+of the tree. Cached bytes are released as soon as an item is done with, so
+memory stays bounded by the queue rather than the size of the tree. With
+``all_or_nothing`` (``exchange_all``'s contract) nothing is transferred unless
+every discovered item validates; items are then re-read from disk and fail if
+they changed after validation.
+"""
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from tools.transfer_engine import DEFAULT_WORKERS, TEMP_SUFFIX, TransferEngine, atomic_copy
+
+DEFAULT_HUB = Path("C:/Users/Admin/high_command_exchange")
+HUB_ENV = "SHAGI_EXCHANGE_PATH"
+_UNSET = object()
+
+
+def resolve_hub(
+    repo_root: Path,
+    *,
+    default: Optional[Path] = DEFAULT_HUB,
+    config_keys: Sequence[str] = ("upstream_root", "hub_path"),
+) -> Optional[Path]:
+    """Resolve the shared hub path for a workspace.
+
+    Precedence: ``SHAGI_EXCHANGE_PATH`` -> the first of ``config_keys`` set in
+    ``exchange/config.json`` -> ``default``. Each tool passes the keys it has
+    always read, so sharing this helper does not change its precedence.
+    """
+    env = os.getenv(HUB_ENV)
+    if env:
+        return Path(env)
+    if not config_keys:
+        return default
+    try:
+        data = json.loads((repo_root / "exchange" / "config.json").read_text(encoding="utf-8"))
+    except Exception:
+        data = {}
+    if isinstance(data, dict):
+        for key in config_keys:
+            value = data.get(key)
+            if isinstance(value, str) and value.strip():
+                return Path(value)
+    return default
+
+
+@dataclass
+class SyncItem:
+    """One discovered file, with its stat, bytes and JSON cached across stages."""
+
+    source: Path
+    rel: str
+    kind: str = ""
+    group: str = ""
+    destination: Optional[Path] = None
+    stat: Optional[os.stat_result] = None
+    errors: List[str] = field(default_factory=list)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    _data: Optional[bytes] = field(default=None, repr=False)
+    _json: Any = field(default=_UNSET, repr=False)
+
+    def ensure_stat(self) -> os.stat_result:
+        if self.stat is None:
+            self.stat = self.source.stat()
+        return self.stat
+
+    @property
+    def size(self) -> int:
+        return self.ensure_stat().st_size
+
+    def read(self) -> bytes:
+        if self._data is None:
+            self._data = self.source.read_bytes()
+        return self._data
+
+    def json(self) -> Any:
+        """Parsed JSON document; raises ``ValueError`` for invalid JSON."""
+        if self._json is _UNSET:
+            self._json = json.loads(self.read().decode("utf-8"))
+        return self._json
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def release(self) -> None:
+        """Drop the cached bytes and JSON; the stat and errors are kept."""
+        self._data = None
+        self._json = _UNSET
+
+    def changed(self) -> bool:
+        """Whether the source's size or mtime differs from the cached stat."""
+        if self.stat is None:
+            return False
+        st = self.source.stat()
+        return (st.st_size, st.st_mtime_ns) != (self.stat.st_size, self.stat.st_mtime_ns)
+
+
+def write_item(item: SyncItem, destination: Path) -> None:
+    """Atomically write ``item`` to ``destination``, preserving its mtime like ``copy2``."""
+    if not item.loaded:
+        atomic_copy(item.source, destination)
+        return
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_name(f".{destination.name}.{os.getpid()}-{threading.get_ident()}{TEMP_SUFFIX}")
+    try:
+        tmp.write_bytes(item.read())
+        st = item.ensure_stat()
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, destination)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def require_json_fields(fields_by_kind: Dict[str, Sequence[str]]) -> Callable[[SyncItem], List[str]]:
+    """Validator: the item must parse as JSON and carry non-null ``fields_by_kind[item.kind]``."""
+
+    def _validate(item: SyncItem) -> List[str]:
+        required = fields_by_kind.get(item.kind)
+        if not required:
+            return []
+        try:
+            document = item.json()
+        except ValueError:
+            return ["invalid_json"]
+        if not isinstance(document, dict):
+            return ["invalid_json"]
+        return [key for key in required if document.get(key) is None]
+
+    return _validate
+
+
+@dataclass
+class SyncReport:
+    items: List[SyncItem] = field(default_factory=list)
+    transferred: List[SyncItem] = field(default_factory=list)
+    failed: List[SyncItem] = field(default_factory=list)
+    results: Dict[str, Any] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def invalid(self) -> List[SyncItem]:
+        return [item for item in self.items if item.errors]
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid and not self.failed
+
+
+Validator = Callable[[SyncItem], List[str]]
+Transfer = Callable[[SyncItem], Any]
+PostStage = Callable[["SyncReport"], Any]
+
+
+@dataclass
+class SyncPipeline:
+    """Configurable discover -> validate -> transfer -> post-stage pipeline."""
+
+    discover: Callable[[], Iterable[SyncItem]]
+    validators: Sequence[Validator] = ()
+    transfer: Optional[Transfer] = None
+    post: Sequence[tuple] = ()  # (name, PostStage) pairs, run in order after transfers
+    all_or_nothing: bool = False
+    workers: int = DEFAULT_WORKERS
+    label: str = "sync"
+    queue_size: int = 1024
+    # False materialises discovery first so items interleave fairly across all groups.
+    stream_discovery: bool = True
+    on_transferred: Optional[Callable[[SyncItem, Any], None]] = None
+    report: Callable[[str], None] = print
+
+    def _validate(self, item: SyncItem) -> SyncItem:
+        for validator in self.validators:
+            item.errors.extend(validator(item))
+        return item
+
+    def _discover_async(self) -> Iterable[SyncItem]:
+        """Run discovery on a thread, yielding items through a bounded queue."""
+        channel: "queue.Queue[object]" = queue.Queue(maxsize=max(1, self.queue_size))
+        done = object()
+        failure: List[BaseException] = []
+        stop = threading.Event()
+
+        def _put(value: object) -> bool:
+            while not stop.is_set():
+                try:
+                    channel.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _produce() -> None:
+            try:
+                for item in self.discover():
+                    if not _put(item):
+                        return  # consumer went away; stop walking
+            except BaseException as exc:  # surfaced on the consumer side
+                failure.append(exc)
+            finally:
+                _put(done)
+
+        producer = threading.Thread(target=_produce, name=f"{self.label}-discover", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = channel.get()
+                if item is done:
+                    break
+                yield item  # type: ignore[misc]
+        finally:
+            stop.set()
+            producer.join()
+        if failure:
+            raise failure[0]
+
+    def run(self) -> SyncReport:
+        start = time.monotonic()
+        report = SyncReport()
+        engine = TransferEngine(workers=self.workers, label=self.label, report=self.report)
+        streaming = self.transfer is not None and not self.all_or_nothing
+
+        def _stage(item: SyncItem) -> Any:
+            self._validate(item)
+            if streaming and not item.errors:
+                return self.transfer(item)
+            # Invalid items and all_or_nothing items wait for the run to finish; don't hold their bytes.
+            item.release()
+            return None
+
+        def _done(outcome) -> None:
+            item = outcome.item
+            report.items.append(item)
+            if not outcome.ok:
+                item.errors.append(f"{type(outcome.error).__name__}: {outcome.error}")
+                report.failed.append(item)
+            elif streaming and not item.errors:
+                report.transferred.append(item)
+                if self.on_transferred is not None:
+                    self.on_transferred(item, outcome.result)
+            item.release()
+
+        # Items stream from discovery straight into validate(+transfer) workers.
+        if self.stream_discovery:
+            discovered: Iterable[tuple] = ((item.group, item) for item in self._discover_async())
+        else:
+            discovered = [(item.group, item) for item in self.discover()]
+        engine.run(discovered, _stage, on_done=_done)
+
+        if self.transfer is not None and self.all_or_nothing and not report.invalid and not report.failed:
+
+            def _transfer_validated(item: SyncItem) -> Any:
+                if item.changed():
+                    raise RuntimeError(f"{item.rel} changed after validation")
+                return self.transfer(item)
+
+            def _transferred(outcome) -> None:
+                if outcome.ok:
+                    report.transferred.append(outcome.item)
+                    if self.on_transferred is not None:
+                        self.on_transferred(outcome.item, outcome.result)
+                else:
+                    outcome.item.errors.append(f"{type(outcome.error).__name__}: {outcome.error}")
+                    report.failed.append(outcome.item)
+                outcome.item.release()
+
+            engine.run([(item.group, item) for item in report.items], _transfer_validated, on_done=_transferred)
+
+        for name, stage in self.post:
+            try:
+                report.results[name] = stage(report)
+            except Exception as exc:
+                report.results[name] = exc
+                self.report(f"[WARN] {name} stage failed: {exc}")
+        report.elapsed = time.monotonic() - start
+        return report
+
+
+def _walk(directory: Path, name_pattern: str, recursive: bool) -> Iterator[tuple]:
+    """Yield ``(path, stat)`` for matching files, listing one directory at a time in name order."""
+    try:
+        with os.scandir(directory) as scan:
+            entries = sorted(scan, key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                if recursive:
+                    yield from _walk(Path(entry.path), name_pattern, recursive)
+                continue
+            if entry.name.endswith(TEMP_SUFFIX) or not fnmatch.fnmatchcase(entry.name, name_pattern):
+                continue
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        if entry.is_file():
+            yield Path(entry.path), st
+
+
+def iter_tree(root: Path, pattern: str = "**/*", *, kind: str = "", group: str = "") -> Iterable[SyncItem]:
+    """Discover files under ``root`` (skipping in-flight temp files) as ``SyncItem`` objects.
+
+    ``pattern`` is a file-name glob, optionally prefixed with ``**/`` to descend
+    into subdirectories. The tree is walked lazily in sorted path order.
+    """
+    recursive = pattern.startswith("**/")
+    name_pattern = pattern[3:] if recursive else pattern
+    if "/" in name_pattern:
+        raise ValueError(f"unsupported discovery pattern: {pattern!r}")
+    for path, st in _walk(root, name_pattern, recursive):
+        yield SyncItem(source=path, rel=path.relative_to(root).as_posix(), kind=kind, group=group or kind, stat=st)
+
+
+__all__ = [
+    "DEFAULT_HUB",
+    "SyncItem",
+    "SyncPipeline",
+    "SyncReport",
+    "iter_tree",
+    "require_json_fields",
+    "resolve_hub",
+    "write_item",
+]
@@ -3,7 +3,8 @@
 This script re-normalises JSON and CSV exports for canary batches, rewrites
 associated SHA256 sidecars, and updates build/manifest metadata timestamps.
 Run after schema remediation to keep per-order canary bundles aligned with
-Order 021 expectations.
+Order 021 expectations. Each rewritten JSON/CSV pair is then cross-checked
+with ``validate_order_021.check_parity``.
 """
 from __future__ import annotations
 
@@ -11,9 +12,18 @@ import csv
 import datetime as _dt
 import hashlib
 import json
+import sys
 from pathlib import Path
 from typing import Dict, Iterable, List
 
+try:
+    from tools.validate_order_021 import check_parity
+except ModuleNotFoundError:  # pragma: no cover - script execution fallback
+    REPO_ROOT = Path(__file__).resolve().parents[2]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from tools.validate_order_021 import check_parity
+
 EXPORT_FIELDS = [
     "schema_version",
     "batch_id",
@@ -147,7 +157,22 @@ def refresh_top_level(source_json: Path, dest_json: Path, dest_csv: Path, build_
         _update_build_info(build_info, records, checksums)
 
 
-def main() -> None:
+def verify_parity(json_path: Path, csv_path: Path) -> bool:
+    report = check_parity(json_path, csv_path)
+    if report.ok:
+        print(f"[OK] {json_path.parent.name}/{json_path.name} and {csv_path.name}: {report.json_rows} rows match")
+        return True
+    print(
+        f"[WARN] {json_path.parent.name}/{json_path.name} and {csv_path.name}: "
+        f"{report.mismatch_count} unmatched row(s)",
+        file=sys.stderr,
+    )
+    for mismatch in report.mismatches:
+        print(f"  - {mismatch}", file=sys.stderr)
+    return False
+
+
+def main() -> int:
     base = Path(".toyfoundry/telemetry/quilt/exports")
 
     directories = [
@@ -157,8 +182,10 @@ def main() -> None:
         base / "canary_c1",
     ]
 
+    pairs = []
     for directory in directories:
         refresh_directory(directory)
+        pairs.append((directory / "composite_export.json", directory / "composite_export.csv"))
 
     refresh_top_level(
         base / "order030_canary_b1" / "composite_export.json",
@@ -172,7 +199,14 @@ def main() -> None:
         base / "canary_batch_b2.csv",
         base / "build_info_b2.json",
     )
+    pairs += [
+        (base / "canary_batch_b1.json", base / "canary_batch_b1.csv"),
+        (base / "canary_batch_b2.json", base / "canary_batch_b2.csv"),
+    ]
+
+    results = [verify_parity(json_path, csv_path) for json_path, csv_path in pairs]
+    return 0 if all(results) else 1
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
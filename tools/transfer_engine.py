@@ -0,0 +1,204 @@
+"""Thread-pool file transfer engine for the offline exchange bridge.
+
+``TransferEngine.run`` fans work items out over a thread pool while keeping
+the number of in-flight items bounded, interleaves items round-robin across
+groups (one group per peer/front) so a single large outbox cannot starve the
+others, and reports progress in batches instead of once per file. Lists are
+interleaved in full; other iterables are consumed lazily through a bounded
+look-ahead window so producers can keep discovering while workers run.
+
+File operations are I/O bound (shared mounts, network hubs), so threads give
+near-linear speed-ups even under the GIL.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+TEMP_SUFFIX = ".bridge-tmp"
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+DEFAULT_PROGRESS_EVERY = 1000
+DEFAULT_PROGRESS_SECONDS = 2.0
+
+
+def atomic_copy(src: Path, dst: Path) -> None:
+    """Copy ``src`` to ``dst`` via a sibling temp file and an atomic rename."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}-{threading.get_ident()}{TEMP_SUFFIX}")
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def move_file(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(src), str(dst))
+
+
+def round_robin(items: Iterable[Tuple[str, T]]) -> Iterator[T]:
+    """Yield ``(group, item)`` pairs' items interleaved across groups, preserving per-group order."""
+    queues: "OrderedDict[str, Deque[T]]" = OrderedDict()
+    for group, item in items:
+        queues.setdefault(group, deque()).append(item)
+    while queues:
+        for group in list(queues):
+            bucket = queues[group]
+            yield bucket.popleft()
+            if not bucket:
+                del queues[group]
+
+
+def windowed_round_robin(items: Iterable[Tuple[str, T]], window: int) -> Iterator[T]:
+    """Like ``round_robin`` but buffers at most ``window`` items from a lazy source."""
+    source = iter(items)
+    queues: "OrderedDict[str, Deque[T]]" = OrderedDict()
+    buffered = 0
+    exhausted = False
+    while True:
+        while not exhausted and buffered < window:
+            try:
+                group, item = next(source)
+            except StopIteration:
+                exhausted = True
+                break
+            queues.setdefault(group, deque()).append(item)
+            buffered += 1
+        if not queues:
+            return
+        for group in list(queues):
+            bucket = queues[group]
+            yield bucket.popleft()
+            buffered -= 1
+            if not bucket:
+                del queues[group]
+
+
+@dataclass
+class TransferOutcome(Generic[T, R]):
+    item: T
+    result: Optional[R] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class TransferSummary(Generic[T, R]):
+    outcomes: List[TransferOutcome[T, R]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[TransferOutcome[T, R]]:
+        return [o for o in self.outcomes if o.ok]
+
+    @property
+    def failed(self) -> List[TransferOutcome[T, R]]:
+        return [o for o in self.outcomes if not o.ok]
+
+
+class TransferEngine:
+    """Run a per-item function over grouped work items on a bounded thread pool."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: Optional[int] = None,
+        label: str = "transfer",
+        progress_every: int = DEFAULT_PROGRESS_EVERY,
+        progress_seconds: float = DEFAULT_PROGRESS_SECONDS,
+        report: Callable[[str], None] = print,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.max_pending = max(self.workers, int(max_pending or self.workers * 4))
+        self.label = label
+        self.progress_every = max(1, int(progress_every))
+        self.progress_seconds = progress_seconds
+        self.report = report
+
+    def run(
+        self,
+        items: Iterable[Tuple[str, T]],
+        fn: Callable[[T], R],
+        *,
+        on_done: Optional[Callable[[TransferOutcome[T, R]], None]] = None,
+    ) -> TransferSummary[T, R]:
+        """Apply ``fn`` to every item; ``on_done`` runs on the calling thread as items finish."""
+        total: Optional[int]
+        if isinstance(items, Sequence):
+            feed: Iterator[T] = round_robin(items)
+            total = len(items)
+        else:
+            feed = windowed_round_robin(items, self.max_pending * 4)
+            total = None
+        summary: TransferSummary[T, R] = TransferSummary()
+        start = time.monotonic()
+        last_report = start
+        next_report = self.progress_every
+        if total == 0:
+            return summary
+
+        pending: Dict[Future, T] = {}
+
+        def _fill(executor: ThreadPoolExecutor) -> None:
+            while len(pending) < self.max_pending:
+                try:
+                    item = next(feed)
+                except StopIteration:
+                    return
+                pending[executor.submit(fn, item)] = item
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.label) as executor:
+            _fill(executor)
+            while pending:
+                done: Set[Future] = wait(pending, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    outcome: TransferOutcome[T, R] = TransferOutcome(
+                        item=item,
+                        result=None if error else future.result(),
+                        error=error,
+                    )
+                    summary.outcomes.append(outcome)
+                    if on_done is not None:
+                        on_done(outcome)
+                _fill(executor)
+                completed = len(summary.outcomes)
+                now = time.monotonic()
+                if pending and (completed >= next_report or now - last_report >= self.progress_seconds):
+                    of_total = f"/{total}" if total is not None else ""
+                    self.report(f"[{self.label}] {completed}{of_total} item(s) processed")
+                    next_report = completed + self.progress_every
+                    last_report = now
+
+        summary.elapsed = time.monotonic() - start
+        return summary
+
+
+__all__ = [
+    "DEFAULT_WORKERS",
+    "TEMP_SUFFIX",
+    "TransferEngine",
+    "TransferOutcome",
+    "TransferSummary",
+    "atomic_copy",
+    "move_file",
+    "round_robin",
+    "windowed_round_robin",
+]
@@ -1,12 +1,29 @@
-"""Schema and data-quality validator for Order 021 exports."""
+"""Schema and data-quality validator for Order 021 exports.
+
+Exports are streamed rather than loaded whole: JSON arrays are decoded one
+record at a time from fixed-size chunks, NDJSON one line at a time, and CSV
+rows through ``csv.DictReader``, so memory stays bounded for multi-GB
+exports. The JSON and CSV exports are validated concurrently, failures are
+reported as soon as they are found, and ``--max-failures`` stops both
+streams once enough failures have been seen.
+
+``--parity`` also proves the two exports hold the same rows: every row is
+reduced to a SHA-256 digest of its canonical field values, the digests are
+summed into an order-independent aggregate per file, and rows present on
+only one side are reported.
+"""
 from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 REQUIRED_FIELDS = {
     "schema_version": str,
@@ -21,6 +38,8 @@ ALLOWED_RITUALS = {"forge", "parade", "purge", "promote"}
 ALLOWED_STATUS = {"success", "failure", "partial"}
 SCHEMA_VERSION = "1.0"
 DURATION_RANGE = (0, 300_000)
+CHUNK_SIZE = 1 << 16
+REPORTED_FAILURES = 10
 
 
 class ValidationIssue(Exception):
@@ -28,12 +47,19 @@ class ValidationIssue(Exception):
 
 
 class ValidationSummary:
-    """Collects pass/fail counts for reporting."""
+    """Collects pass/fail counts for reporting.
+
+    Only the first ``REPORTED_FAILURES`` reasons are kept so a badly broken
+    export cannot grow the summary without bound.
+    """
 
     def __init__(self) -> None:
         self.records = 0
         self.successful = 0
+        self.failure_count = 0
         self.failures: List[str] = []
+        self.csv_rows = 0
+        self.parity: Optional[ParityReport] = None
 
     def add_success(self) -> None:
         self.records += 1
@@ -41,18 +67,151 @@ class ValidationSummary:
 
     def add_failure(self, reason: str) -> None:
         self.records += 1
-        self.failures.append(reason)
+        self.failure_count += 1
+        if len(self.failures) < REPORTED_FAILURES:
+            self.failures.append(reason)
+
+    def merge(self, other: "ValidationSummary") -> None:
+        """Fold CSV row results into the JSON summary."""
+        self.csv_rows += other.records
+        self.failure_count += other.failure_count
+        self.failures.extend(other.failures[: REPORTED_FAILURES - len(self.failures)])
+
+    def merge_parity(self, report: "ParityReport") -> None:
+        self.parity = report
+        self.failure_count += report.mismatch_count
+        self.failures.extend(report.mismatches[: REPORTED_FAILURES - len(self.failures)])
 
     def has_failures(self) -> bool:
-        return bool(self.failures)
+        return bool(self.failure_count)
+
+    def headline(self) -> str:
+        if self.failure_count:
+            return f"Validation failed: {self.failure_count} failure(s), {self.successful}/{self.records} records passed."
+        return f"Validation passed for all {self.successful} records."
 
     def __str__(self) -> str:  # pragma: no cover - human-readable output
         if self.failures:
-            return (
-                f"Validation failed for {self.successful}/{self.records} records.\n"
-                + "\n".join(f"  - {failure}" for failure in self.failures[:10])
-            )
-        return f"Validation passed for all {self.successful} records."
+            return self.headline() + "\n" + "\n".join(f"  - {failure}" for failure in self.failures)
+        return self.headline()
+
+
+_DIGEST_MODULUS = 1 << 256
+
+
+def row_digest(record: Any) -> bytes:
+    """SHA-256 of a row's Order 021 fields in canonical order and encoding.
+
+    JSON records and CSV rows (after integer conversion) with the same
+    values produce the same digest regardless of key order or formatting.
+    """
+    if isinstance(record, dict):
+        values: Any = [record.get(name) for name in REQUIRED_FIELDS]
+    else:
+        values = record
+    canonical = json.dumps(values, separators=(",", ":"), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+
+@dataclass
+class ParityReport:
+    """Outcome of cross-checking the JSON and CSV exports row by row."""
+
+    json_rows: int
+    csv_rows: int
+    json_aggregate: str
+    csv_aggregate: str
+    mismatch_count: int = 0
+    mismatches: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatch_count == 0
+
+
+class RowParity:
+    """Order-independent row comparison fed concurrently by both streams.
+
+    Each digest keeps a running balance (+1 per JSON row, -1 per CSV row)
+    and is dropped as soon as it balances, so memory tracks the rows one
+    side has seen and the other has not yet, rather than the export size.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._open: Dict[bytes, List[Any]] = {}
+        self._rows = [0, 0]
+        self._aggregates = [0, 0]
+
+    def _add(self, side: int, index: int, record: Any) -> None:
+        digest = row_digest(record)
+        ref = (index, record.get("batch_id") if isinstance(record, dict) else None)
+        with self._lock:
+            self._rows[side] += 1
+            self._aggregates[side] = (self._aggregates[side] + int.from_bytes(digest, "big")) % _DIGEST_MODULUS
+            entry = self._open.get(digest)
+            if entry is None:
+                entry = self._open[digest] = [0, None, None]
+            entry[0] += 1 if side == 0 else -1
+            if entry[0] == 0:
+                del self._open[digest]
+            elif entry[1 + side] is None:
+                entry[1 + side] = ref
+
+    def add_json(self, index: int, record: Any) -> None:
+        self._add(0, index, record)
+
+    def add_csv(self, index: int, record: Any) -> None:
+        self._add(1, index, record)
+
+    def report(self) -> ParityReport:
+        report = ParityReport(
+            json_rows=self._rows[0],
+            csv_rows=self._rows[1],
+            json_aggregate=f"{self._aggregates[0]:064x}",
+            csv_aggregate=f"{self._aggregates[1]:064x}",
+        )
+        for balance, json_ref, csv_ref in self._open.values():
+            report.mismatch_count += abs(balance)
+            if len(report.mismatches) >= REPORTED_FAILURES:
+                continue
+            if balance > 0:
+                index, batch_id = json_ref
+                report.mismatches.append(f"Record {index} (batch_id {batch_id}) has no matching CSV row")
+            else:
+                index, batch_id = csv_ref
+                report.mismatches.append(f"CSV row {index} (batch_id {batch_id}) has no matching JSON record")
+        return report
+
+
+class _FailureGate:
+    """Shared failure counter for the concurrent JSON and CSV streams.
+
+    Forwards the first ``report_limit`` failures to ``on_failure`` as they
+    happen and trips ``stopped`` once ``max_failures`` is reached.
+    """
+
+    def __init__(
+        self,
+        max_failures: Optional[int],
+        on_failure: Optional[Callable[[str], None]],
+        report_limit: int = REPORTED_FAILURES,
+    ) -> None:
+        self.max_failures = max_failures
+        self.on_failure = on_failure
+        self.report_limit = report_limit
+        self.stopped = threading.Event()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def failed(self, reason: str) -> None:
+        with self._lock:
+            self._count += 1
+            count = self._count
+            if self.on_failure is not None and count <= self.report_limit:
+                self.on_failure(reason)
+        if self.max_failures and count >= self.max_failures:
+            self.stopped.set()
 
 
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
@@ -68,9 +227,29 @@ def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
         "--csv",
         dest="csv_export",
         type=Path,
-        help="Optional path to composite_export.csv for header validation",
+        help="Optional path to composite_export.csv (header and rows are validated alongside the JSON export)",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--max-failures",
+        type=int,
+        default=0,
+        help="Stop validating once this many failures have been found (0 = check every record)",
+    )
+    parser.add_argument(
+        "--report-failures",
+        type=int,
+        default=REPORTED_FAILURES,
+        help=f"Print up to this many failures as soon as they are found (default {REPORTED_FAILURES})",
+    )
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="Also prove the JSON and CSV exports contain the same rows (requires --csv)",
+    )
+    args = parser.parse_args(argv)
+    if args.parity and not args.csv_export:
+        parser.error("--parity requires --csv")
+    return args
 
 
 def load_json_exports(path: Path) -> List[Dict[str, object]]:
@@ -87,37 +266,129 @@ def load_json_exports(path: Path) -> List[Dict[str, object]]:
     return data
 
 
-def validate_record(index: int, record: Dict[str, object]) -> Tuple[bool, str | None]:
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def iter_json_records(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[object]:
+    """Yield records from a JSON array or NDJSON export without loading it whole.
+
+    The format is detected from the first non-whitespace character: ``[``
+    starts a JSON array, anything else is treated as one record per line.
+    Only the unconsumed tail of the current chunk is kept in memory.
+    """
+    if not path.exists():
+        raise ValidationIssue(f"JSON export not found: {path}")
+    decoder = json.JSONDecoder()
+    with path.open(encoding="utf-8") as handle:
+        buffer = handle.read(chunk_size)
+        eof = not buffer
+        pos = _skip_whitespace(buffer, 0)
+        while pos == len(buffer) and not eof:
+            chunk = handle.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            pos = _skip_whitespace(buffer, pos)
+        if pos == len(buffer):
+            raise ValidationIssue("JSON export is empty")
+        if buffer[pos] != "[":
+            handle.seek(0)
+            yield from _iter_ndjson(handle)
+            return
+
+        pos += 1
+        count = 0
+        expect_value = True
+        while True:
+            pos = _skip_whitespace(buffer, pos)
+            if pos < len(buffer) and buffer[pos] == "]" and (count == 0 or not expect_value):
+                break
+            if pos < len(buffer) and not expect_value:
+                if buffer[pos] != ",":
+                    raise ValidationIssue(f"Malformed JSON export: expected ',' after record {count - 1}")
+                pos, expect_value = pos + 1, True
+                continue
+            if pos < len(buffer):
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if eof:
+                        raise ValidationIssue(f"Malformed JSON export: {exc}") from exc
+                else:
+                    # Only a bare number can be cut short by the chunk boundary ("3" of "3.5").
+                    after = _skip_whitespace(buffer, end)
+                    complete = not isinstance(record, (int, float)) or (after < len(buffer) and buffer[after] in ",]")
+                    if complete or eof:
+                        yield record
+                        count += 1
+                        pos, expect_value = end, False
+                        continue
+            if eof:
+                raise ValidationIssue("Malformed JSON export: unterminated array")
+            chunk = handle.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        if count == 0:
+            raise ValidationIssue("JSON export is empty")
+
+
+def _iter_ndjson(handle) -> Iterator[object]:
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            if line_number == 1:
+                raise ValidationIssue("Expected JSON export to be a list of records") from exc
+            raise ValidationIssue(f"Malformed NDJSON export at line {line_number}: {exc}") from exc
+
+
+def validate_record(index: int, record: Dict[str, object], label: str = "Record") -> Tuple[bool, str | None]:
+    prefix = f"{label} {index}"
     for field, field_type in REQUIRED_FIELDS.items():
         if field not in record:
-            return False, f"Record {index}: missing field '{field}'"
+            return False, f"{prefix}: missing field '{field}'"
         value = record[field]
         if field_type is int:
-            if not isinstance(value, int):
-                return False, f"Record {index}: field '{field}' must be an integer"
+            if not isinstance(value, int) or isinstance(value, bool):
+                return False, f"{prefix}: field '{field}' must be an integer"
         elif field_type is str:
             if not isinstance(value, str):
-                return False, f"Record {index}: field '{field}' must be a string"
+                return False, f"{prefix}: field '{field}' must be a string"
 
     if record["schema_version"] != SCHEMA_VERSION:
-        return False, f"Record {index}: schema_version '{record['schema_version']}' != '{SCHEMA_VERSION}'"
+        return False, f"{prefix}: schema_version '{record['schema_version']}' != '{SCHEMA_VERSION}'"
     if record["ritual"] not in ALLOWED_RITUALS:
-        return False, f"Record {index}: ritual '{record['ritual']}' not in {sorted(ALLOWED_RITUALS)}"
+        return False, f"{prefix}: ritual '{record['ritual']}' not in {sorted(ALLOWED_RITUALS)}"
     if record["status"] not in ALLOWED_STATUS:
-        return False, f"Record {index}: status '{record['status']}' not in {sorted(ALLOWED_STATUS)}"
+        return False, f"{prefix}: status '{record['status']}' not in {sorted(ALLOWED_STATUS)}"
 
     units = record["units_processed"]
     if units <= 0:
-        return False, f"Record {index}: units_processed {units} must be > 0"
+        return False, f"{prefix}: units_processed {units} must be > 0"
 
     duration = record["duration_ms"]
     low, high = DURATION_RANGE
     if not (low <= duration <= high):
-        return False, f"Record {index}: duration_ms {duration} outside [{low}, {high}]"
+        return False, f"{prefix}: duration_ms {duration} outside [{low}, {high}]"
 
     return True, None
 
 
+def _check_csv_header(header: List[str]) -> None:
+    expected_order = list(REQUIRED_FIELDS.keys())
+    if header != expected_order:
+        raise ValidationIssue(
+            "CSV header mismatch: expected "
+            + ",".join(expected_order)
+            + " but found "
+            + ",".join(header)
+        )
+
+
 def validate_csv_headers(path: Path) -> None:
     if not path:
         return
@@ -129,45 +400,142 @@ def validate_csv_headers(path: Path) -> None:
             header = next(reader)
         except StopIteration:
             raise ValidationIssue("CSV export is empty") from None
-    expected_order = list(REQUIRED_FIELDS.keys())
-    if header != expected_order:
-        raise ValidationIssue(
-            "CSV header mismatch: expected "
-            + ",".join(expected_order)
-            + " but found "
-            + ",".join(header)
-        )
+    _check_csv_header(header)
+
+
+def iter_csv_records(path: Path) -> Iterator[Dict[str, object]]:
+    """Yield CSV rows with integer columns converted, after checking the header."""
+    if not path.exists():
+        raise ValidationIssue(f"CSV export not found: {path}")
+    int_fields = [field for field, field_type in REQUIRED_FIELDS.items() if field_type is int]
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        if reader.fieldnames is None:
+            raise ValidationIssue("CSV export is empty")
+        _check_csv_header(list(reader.fieldnames))
+        for row in reader:
+            record: Dict[str, object] = dict(row)
+            for field in int_fields:
+                try:
+                    record[field] = int(row[field])
+                except (TypeError, ValueError):
+                    pass  # left as text so validate_record reports the type error
+            yield record
 
 
-def run_validation(json_path: Path, csv_path: Path | None) -> ValidationSummary:
-    records = load_json_exports(json_path)
+def _validate_stream(
+    records: Iterable[object],
+    gate: _FailureGate,
+    label: str = "Record",
+    on_record: Optional[Callable[[int, object], None]] = None,
+) -> ValidationSummary:
     summary = ValidationSummary()
     for index, record in enumerate(records):
+        if gate.stopped.is_set():
+            break
+        if on_record is not None:
+            on_record(index, record)
         if not isinstance(record, dict):
-            summary.add_failure(f"Record {index}: expected object, found {type(record).__name__}")
-            continue
-        ok, reason = validate_record(index, record)
+            ok, reason = False, f"{label} {index}: expected object, found {type(record).__name__}"
+        else:
+            ok, reason = validate_record(index, record, label)
         if ok:
             summary.add_success()
         else:
-            summary.add_failure(reason or f"Record {index}: unknown validation error")
+            reason = reason or f"{label} {index}: unknown validation error"
+            summary.add_failure(reason)
+            gate.failed(reason)
+    return summary
+
+
+def run_validation(
+    json_path: Path,
+    csv_path: Path | None,
+    *,
+    max_failures: Optional[int] = None,
+    on_failure: Optional[Callable[[str], None]] = None,
+    report_limit: int = REPORTED_FAILURES,
+    parity: bool = False,
+) -> ValidationSummary:
+    """Stream-validate the JSON export and, concurrently, the CSV export.
+
+    ``on_failure`` receives the first ``report_limit`` failure reasons as
+    they are found; when given, the raised ``ValidationIssue`` carries only
+    the headline so those reasons are not repeated. ``max_failures`` stops
+    both streams early. With ``parity`` (and a CSV export) the same pass
+    feeds a ``RowParity`` and unmatched rows count as failures.
+    """
+    gate = _FailureGate(max_failures, on_failure, report_limit)
+    tracker = RowParity() if parity and csv_path else None
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="order021") as pool:
+        json_future = pool.submit(
+            _validate_stream, iter_json_records(json_path), gate, "Record", tracker.add_json if tracker else None
+        )
+        csv_future = None
+        if csv_path:
+            csv_future = pool.submit(
+                _validate_stream, iter_csv_records(csv_path), gate, "CSV row", tracker.add_csv if tracker else None
+            )
+        try:
+            summary = json_future.result()
+        except ValidationIssue:
+            gate.stopped.set()
+            raise
+        if csv_future is not None:
+            summary.merge(csv_future.result())
+    # A fail-fast stop leaves the streams unevenly consumed, so parity would be meaningless.
+    if tracker is not None and not gate.stopped.is_set():
+        report = tracker.report()
+        for mismatch in report.mismatches:
+            gate.failed(mismatch)
+        summary.merge_parity(report)
     if summary.has_failures():
-        raise ValidationIssue(str(summary))
-    validate_csv_headers(csv_path)  # raises if problems; no-op if csv_path is None
+        raise ValidationIssue(summary.headline() if on_failure else str(summary))
     return summary
 
 
+def _feed(records: Iterable[object], add: Callable[[int, object], None]) -> None:
+    for index, record in enumerate(records):
+        add(index, record)
+
+
+def check_parity(json_path: Path, csv_path: Path) -> ParityReport:
+    """Stream both exports concurrently and compare their rows (no field validation)."""
+    tracker = RowParity()
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="order021-parity") as pool:
+        futures = [
+            pool.submit(_feed, iter_json_records(json_path), tracker.add_json),
+            pool.submit(_feed, iter_csv_records(csv_path), tracker.add_csv),
+        ]
+        for future in futures:
+            future.result()
+    return tracker.report()
+
+
 def main(argv: Iterable[str] | None = None) -> int:
     args = parse_args(argv)
+
+    def _report(reason: str) -> None:
+        print(f"  - {reason}", file=sys.stderr, flush=True)
+
     try:
-        summary = run_validation(args.json_export, args.csv_export)
+        summary = run_validation(
+            args.json_export,
+            args.csv_export,
+            max_failures=args.max_failures or None,
+            on_failure=_report if args.report_failures > 0 else None,
+            report_limit=args.report_failures,
+            parity=args.parity,
+        )
     except ValidationIssue as exc:
         print(f"Order 021 validation FAILED: {exc}", file=sys.stderr)
         return 1
     else:
         print(f"Order 021 validation PASSED: {summary.records} records validated.")
         if args.csv_export:
-            print("CSV header validation passed.")
+            print(f"CSV validation passed: header and {summary.csv_rows} rows.")
+        if summary.parity is not None:
+            print(f"CSV parity passed: {summary.parity.json_rows} rows match (aggregate {summary.parity.json_aggregate[:16]}).")
         return 0
 
 